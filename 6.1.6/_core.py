@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数值核心模块 - 环形缓冲区更新、Z-score计算与TOP-K选择内核
+可选依赖Numba：装有numba时内核被@njit编译为机器码（cache=True缓存到
+磁盘，避免每次启动的JIT延迟）；未安装时退化为纯Python/NumPy实现，
+接口与语义完全一致
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """numba缺失时的空操作装饰器"""
+        if args and callable(args[0]):
+            return args[0]
+
+        def _wrap(func):
+            return func
+        return _wrap
+
+
+# 每个交易对的状态由三个定型数组组成，便于内核直接操作：
+#   buf     float64[W]  环形缓冲区
+#   meta_i  int64[3]    [head写入位置, count有效样本数, tick累计写入次数]
+#   meta_f  float64[2]  [sum_x窗口和, sum_x2窗口平方和]
+
+
+@njit(cache=True)
+def update_and_zscore(buf, meta_i, meta_f, new_rate, refresh_ticks):
+    """
+    向环形缓冲区追加一个样本并返回 (z_score, mean, std)
+
+    滑动维护sum_x/sum_x2，每refresh_ticks次写入对窗口全量重算一次，
+    抑制增量加减的浮点误差累积。历史样本不足或std无效时z_score为NaN
+    """
+    window = buf.shape[0]
+    head = meta_i[0]
+    count = meta_i[1]
+
+    if count == window:
+        evicted = buf[head]
+        meta_f[0] -= evicted
+        meta_f[1] -= evicted * evicted
+    else:
+        count += 1
+        meta_i[1] = count
+    buf[head] = new_rate
+    meta_i[0] = (head + 1) % window
+    meta_f[0] += new_rate
+    meta_f[1] += new_rate * new_rate
+    meta_i[2] += 1
+
+    if meta_i[2] % refresh_ticks == 0:
+        s = 0.0
+        s2 = 0.0
+        for i in range(count):
+            v = buf[i]
+            s += v
+            s2 += v * v
+        meta_f[0] = s
+        meta_f[1] = s2
+
+    if count < 3:
+        return np.nan, np.nan, np.nan
+
+    n = count - 1
+    mean = (meta_f[0] - new_rate) / n
+    var = (meta_f[1] - new_rate * new_rate - n * mean * mean) / (n - 1)
+    std = var ** 0.5 if var > 0 else 0.0
+    if std < 1e-10:
+        return np.nan, mean, std
+    return (new_rate - mean) / std, mean, std
+
+
+@njit(cache=True)
+def current_zscore(buf, meta_i, meta_f):
+    """不写入缓冲区，计算最新样本相对历史窗口的|Z-score|"""
+    count = meta_i[1]
+    if count < 3:
+        return 0.0
+    window = buf.shape[0]
+    latest = buf[(meta_i[0] - 1) % window]
+    n = count - 1
+    mean = (meta_f[0] - latest) / n
+    var = (meta_f[1] - latest * latest - n * mean * mean) / (n - 1)
+    if var <= 0:
+        return 0.0
+    std = var ** 0.5
+    if std < 1e-10:
+        return 0.0
+    return abs((latest - mean) / std)
+
+
+@njit(cache=True)
+def update_batch(buffers, meta_i, meta_f, sids, rates, refresh_ticks):
+    """
+    按到达顺序批量追加样本，返回全体 (z, mean, std) 数组
+
+    整个批次一次内核调用完成，把每条消息的Python分发开销摊薄为
+    单次循环迭代；numba下该循环被编译为机器码
+    """
+    m = sids.shape[0]
+    out_z = np.empty(m, dtype=np.float64)
+    out_mean = np.empty(m, dtype=np.float64)
+    out_std = np.empty(m, dtype=np.float64)
+    for i in range(m):
+        sid = sids[i]
+        z, mean, std = update_and_zscore(
+            buffers[sid], meta_i[sid], meta_f[sid], rates[i], refresh_ticks
+        )
+        out_z[i] = z
+        out_mean[i] = mean
+        out_std[i] = std
+    return out_z, out_mean, out_std
+
+
+def make_batch_kernel(window):
+    """
+    为固定窗口长度特化的批量更新内核工厂
+
+    窗口长度在启动时由配置确定，作为闭包常量参与numba编译后，
+    LLVM可对 %window 取模和方差公式里的常量做折叠，fastmath进一步
+    允许对滑动和更新做SIMD重结合。批次内可能出现重复交易对（必须
+    保持顺序语义），因此保持串行循环而不使用parallel=True。
+    numba缺失时直接返回通用的update_batch
+    """
+    if not HAS_NUMBA:
+        return update_batch
+
+    W = window
+
+    @njit(cache=False, fastmath=True)
+    def specialized_batch(buffers, meta_i, meta_f, sids, rates, refresh_ticks):
+        m = sids.shape[0]
+        out_z = np.empty(m, dtype=np.float64)
+        out_mean = np.empty(m, dtype=np.float64)
+        out_std = np.empty(m, dtype=np.float64)
+        for i in range(m):
+            sid = sids[i]
+            buf = buffers[sid]
+            mi = meta_i[sid]
+            mf = meta_f[sid]
+            new_rate = rates[i]
+            head = mi[0]
+            count = mi[1]
+            if count == W:
+                evicted = buf[head]
+                mf[0] -= evicted
+                mf[1] -= evicted * evicted
+            else:
+                count += 1
+                mi[1] = count
+            buf[head] = new_rate
+            mi[0] = (head + 1) % W
+            mf[0] += new_rate
+            mf[1] += new_rate * new_rate
+            mi[2] += 1
+            if mi[2] % refresh_ticks == 0:
+                s = 0.0
+                s2 = 0.0
+                for j in range(count):
+                    v = buf[j]
+                    s += v
+                    s2 += v * v
+                mf[0] = s
+                mf[1] = s2
+            if count < 3:
+                out_z[i] = np.nan
+                out_mean[i] = np.nan
+                out_std[i] = np.nan
+                continue
+            n = count - 1
+            mean = (mf[0] - new_rate) / n
+            var = (mf[1] - new_rate * new_rate - n * mean * mean) / (n - 1)
+            std = var ** 0.5 if var > 0 else 0.0
+            out_mean[i] = mean
+            out_std[i] = std
+            out_z[i] = (new_rate - mean) / std if std >= 1e-10 else np.nan
+        return out_z, out_mean, out_std
+
+    return specialized_batch
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def rank_top5(scores, k):
+        """返回得分最高的k个下标（按得分降序）- 单遍插入选择，O(N·k)"""
+        n = scores.shape[0]
+        if k > n:
+            k = n
+        idx = np.full(k, -1, dtype=np.int64)
+        vals = np.full(k, -np.inf, dtype=np.float64)
+        for i in range(n):
+            s = scores[i]
+            if s > vals[k - 1]:
+                j = k - 1
+                while j > 0 and vals[j - 1] < s:
+                    vals[j] = vals[j - 1]
+                    idx[j] = idx[j - 1]
+                    j -= 1
+                vals[j] = s
+                idx[j] = i
+        return idx[idx >= 0]
+else:
+    def rank_top5(scores, k):
+        """返回得分最高的k个下标（按得分降序）- argpartition实现"""
+        n = scores.shape[0]
+        if k > n:
+            k = n
+        part = np.argpartition(scores, -k)[-k:]
+        return part[np.argsort(-scores[part])]
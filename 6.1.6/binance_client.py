@@ -1,280 +1,557 @@
-"""
-币安WebSocket客户端 - 整洁优雅版
-专注于稳定连接币安WebSocket API，代码规范整洁
-"""
-
-import asyncio
-import websockets
-import json
-import time
-from typing import Optional, Callable, Any, Dict
-from logger import get_logger
-
-
-class BinanceWebSocketClient:
-    """币安WebSocket客户端 - 整洁优雅，专注稳定性"""
-    
-    # 连接配置常量 - 经过精心调优的默认值
-    BASE_URL = "wss://fstream.binance.com"
-    PING_INTERVAL = 20
-    PING_TIMEOUT = 10
-    CLOSE_TIMEOUT = 10
-    MAX_CONNECTION_HOURS = 23.9
-    
-    # 备用服务器
-    BACKUP_HOSTS = [
-        "fstream.binance.com",
-        "fstream1.binance.com", 
-        "fstream2.binance.com"
-    ]
-    
-    # 重连间隔（指数退避）
-    RECONNECT_INTERVALS = [1, 2, 5, 10, 20, 30, 60]
-    
-    def __init__(self, 
-                 stream_path: str = "/ws/!markPrice@arr@1s", 
-                 data_handler: Optional[Callable] = None):
-        """
-        初始化币安WebSocket客户端
-        
-        Args:
-            stream_path: WebSocket流路径，默认为全市场标记价格流
-            data_handler: 数据处理回调函数
-        """
-        self.logger = get_logger(__name__)
-        
-        # 核心配置
-        self.stream_path = stream_path
-        self.data_handler = data_handler
-        
-        # 连接状态
-        self.websocket: Optional[websockets.WebSocketServerProtocol] = None
-        self.is_connected = False
-        self.is_running = False
-        self.connection_task: Optional[asyncio.Task] = None
-        
-        # 并发安全锁 - 保护启停操作
-        self._control_lock = asyncio.Lock()
-        
-        # 统计信息
-        self.connection_start_time = 0
-        self.message_count = 0
-        self.reconnect_count = 0
-        self.current_host_index = 0
-        
-        self.logger.info("币安WebSocket客户端初始化完成")
-    
-    async def start(self) -> None:
-        """启动WebSocket客户端 - 并发安全版本"""
-        async with self._control_lock:
-            if self.is_running:
-                self.logger.warning("客户端已在运行中")
-                return
-            
-            self.is_running = True
-            self.connection_task = asyncio.create_task(self._connection_loop())
-            self.logger.info("WebSocket客户端已启动")
-    
-    async def stop(self) -> None:
-        """停止WebSocket客户端 - 优雅关闭版本"""
-        async with self._control_lock:
-            if not self.is_running:
-                self.logger.info("客户端已经停止")
-                return
-            
-            self.logger.info("正在停止WebSocket客户端...")
-            
-            # 第一步：通知后台任务停止
-            self.is_running = False
-            
-            # 第二步：优雅关闭WebSocket连接
-            if self.websocket:
-                try:
-                    await self.websocket.close()
-                except Exception as e:
-                    self.logger.warning(f"关闭WebSocket连接时出现异常: {e}")
-                finally:
-                    self.websocket = None
-            
-            # 第三步：优雅等待后台任务结束
-            if self.connection_task:
-                try:
-                    # 给任务3秒时间自行退出
-                    await asyncio.wait_for(self.connection_task, timeout=3.0)
-                    self.logger.info("后台任务已优雅退出")
-                except asyncio.TimeoutError:
-                    # 超时则强制取消
-                    self.logger.warning("后台任务未能及时退出，执行强制取消")
-                    self.connection_task.cancel()
-                    try:
-                        await self.connection_task
-                    except asyncio.CancelledError:
-                        pass
-                except Exception as e:
-                    self.logger.error(f"等待后台任务退出时出现异常: {e}")
-                finally:
-                    self.connection_task = None
-            
-            self.is_connected = False
-            self.logger.info("WebSocket客户端已完全停止")
-    
-    async def _connection_loop(self) -> None:
-        """主连接循环 - 外循环负责建立连接"""
-        reconnect_attempt = 0
-        
-        while self.is_running:
-            try:
-                current_url = self._get_current_url()
-                self.logger.info(f"尝试连接: {current_url}")
-                
-                async with websockets.connect(
-                    current_url,
-                    ping_interval=self.PING_INTERVAL,
-                    ping_timeout=self.PING_TIMEOUT,
-                    close_timeout=self.CLOSE_TIMEOUT,
-                    max_size=2**20,
-                    compression=None
-                ) as websocket:
-                    self.websocket = websocket
-                    self.is_connected = True
-                    self.connection_start_time = time.time()
-                    self.reconnect_count += 1
-                    reconnect_attempt = 0
-                    
-                    self.logger.info(f"✓ 连接成功 (第{self.reconnect_count}次)")
-                    
-                    # 内循环：消息接收和24小时主动重连
-                    await self._message_loop()
-                        
-            except Exception as e:
-                self._handle_connection_error(e, reconnect_attempt)
-                self._switch_to_next_host()
-                reconnect_attempt += 1
-                
-                wait_time = self._get_reconnect_interval(reconnect_attempt)
-                await asyncio.sleep(wait_time)
-        
-        self.logger.info("连接循环已退出")
-    
-    async def _message_loop(self) -> None:
-        """消息接收循环 - 内循环负责接收消息和生命周期管理"""
-        while self.is_connected and self.is_running:
-            try:
-                # 检查24小时连接限制
-                if self._should_reconnect():
-                    self.logger.info("主动重连：接近24小时限制，建立新连接")
-                    break
-                
-                # 非阻塞接收消息
-                try:
-                    message = await asyncio.wait_for(self.websocket.recv(), timeout=1.0)
-                    await self._process_message(message)
-                except asyncio.TimeoutError:
-                    continue
-                    
-            except websockets.exceptions.ConnectionClosed:
-                self.logger.warning("连接已关闭")
-                break
-            except Exception as e:
-                self.logger.error(f"消息循环异常: {e}")
-                break
-        
-        self.is_connected = False
-        self.websocket = None
-    
-    async def _process_message(self, message: str) -> None:
-        """处理接收到的消息"""
-        try:
-            self.message_count += 1
-            data = json.loads(message)
-            
-            if self.data_handler:
-                await self._call_handler_safely(data)
-                
-        except json.JSONDecodeError as e:
-            self.logger.error(f"JSON解析失败: {e}")
-        except Exception as e:
-            self.logger.error(f"消息处理失败: {e}")
-    
-    async def _call_handler_safely(self, data: Any) -> None:
-        """安全调用外部数据处理器 - 无阻塞版本"""
-        try:
-            if asyncio.iscoroutinefunction(self.data_handler):
-                # 异步处理器：直接调用
-                await self.data_handler(data)
-            else:
-                # 同步处理器：使用线程池执行，避免阻塞事件循环
-                loop = asyncio.get_running_loop()
-                await loop.run_in_executor(None, self.data_handler, data)
-        except Exception as e:
-            self.logger.error(f"数据处理器异常: {e}", exc_info=True)
-    
-    def _should_reconnect(self) -> bool:
-        """检查是否应该主动重连"""
-        connection_duration = time.time() - self.connection_start_time
-        max_seconds = self.MAX_CONNECTION_HOURS * 3600
-        return connection_duration > max_seconds
-    
-    def _get_current_url(self) -> str:
-        """获取当前WebSocket URL"""
-        host = self.BACKUP_HOSTS[self.current_host_index]
-        return f"wss://{host}{self.stream_path}"
-    
-    def _switch_to_next_host(self) -> None:
-        """切换到下一个备用服务器"""
-        self.current_host_index = (self.current_host_index + 1) % len(self.BACKUP_HOSTS)
-        next_host = self.BACKUP_HOSTS[self.current_host_index]
-        self.logger.info(f"切换到备用服务器: {next_host}")
-    
-    def _handle_connection_error(self, error: Exception, attempt: int) -> None:
-        """处理连接错误"""
-        self.is_connected = False
-        self.websocket = None
-        
-        if not self.is_running:
-            return
-        
-        error_type = self._classify_error(str(error))
-        wait_time = self._get_reconnect_interval(attempt)
-        
-        self.logger.warning(
-            f"连接失败: {error_type} - "
-            f"将在 {wait_time} 秒后重试 (第{attempt + 1}次)"
-        )
-    
-    def _classify_error(self, error_str: str) -> str:
-        """分类错误类型"""
-        error_lower = error_str.lower()
-        
-        if 'timeout' in error_lower:
-            return "连接超时"
-        elif 'refused' in error_lower:
-            return "连接被拒绝"
-        elif 'dns' in error_lower or 'name resolution' in error_lower:
-            return "DNS解析失败"
-        elif 'unreachable' in error_lower:
-            return "网络不可达"
-        else:
-            return f"未知错误: {error_str[:50]}"
-    
-    def _get_reconnect_interval(self, attempt: int) -> int:
-        """获取重连间隔（指数退避）"""
-        if attempt < len(self.RECONNECT_INTERVALS):
-            return self.RECONNECT_INTERVALS[attempt]
-        return self.RECONNECT_INTERVALS[-1]
-    
-    def get_status(self) -> Dict[str, Any]:
-        """获取客户端状态"""
-        connection_duration = 0
-        if self.connection_start_time > 0:
-            connection_duration = time.time() - self.connection_start_time
-        
-        return {
-            'is_connected': self.is_connected,
-            'is_running': self.is_running,
-            'current_host': self.BACKUP_HOSTS[self.current_host_index],
-            'connection_count': self.reconnect_count,
-            'message_count': self.message_count,
-            'connection_duration_hours': connection_duration / 3600,
-            'current_url': self._get_current_url()
-        }
\ No newline at end of file
+"""
+币安WebSocket客户端 - 整洁优雅版
+专注于稳定连接币安WebSocket API，代码规范整洁
+"""
+
+import asyncio
+import concurrent.futures
+import errno
+import inspect
+import itertools
+import socket
+import sys
+import websockets
+import time
+from enum import IntEnum
+from typing import Optional, Callable, Any, Dict
+from logger import get_logger
+
+# JSON解析器选择 - 优先使用orjson（C实现，数值密集型JSON解析快2-10倍）
+# 回退到标准库json，保证无orjson环境下正常运行
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps  # 直接产出bytes，省去str中转和二次编码
+except ImportError:
+    import json
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+# 可选的simdjson惰性解析 - 对!markPrice@arr这种数组套记录的载荷，
+# 惰性Document可以跳过未访问字段的物化，进一步快于orjson
+try:
+    import simdjson as _simdjson
+except ImportError:
+    _simdjson = None
+
+# 事件循环加速 - Linux/macOS上可用uvloop（libuv实现），每个await的
+# 回调开销显著低于标准库selector循环；Windows回退到默认事件循环
+if not sys.platform.startswith('win'):
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+
+class ClientState(IntEnum):
+    """客户端生命周期状态 - 单一状态源，热路径只需一次整型比较"""
+    STOPPED = 0
+    CONNECTING = 1
+    CONNECTED = 2
+    STOPPING = 3
+
+
+class BinanceWebSocketClient:
+    """币安WebSocket客户端 - 整洁优雅，专注稳定性"""
+
+    # __slots__消除每实例__dict__：省内存且属性访问更快
+    __slots__ = (
+        'logger', 'stream_path', 'data_handler', 'batch_handler',
+        '_handler_is_async', '_batch_handler_is_async', '_dispatch',
+        '_simd_parser', '_dns_cache', '_dns_task',
+        '_urls', '_host_cycle', '_recv_raw', '_executor', '_control_lock',
+        'websocket', '_state', '_status', 'connection_task', 'connected_event',
+        'connection_start_time', '_reconnect_deadline',
+        'message_count', 'reconnect_count', 'current_host_index',
+        '_error_cache',
+    )
+
+    # 连接配置常量 - 经过精心调优的默认值
+    BASE_URL = "wss://fstream.binance.com"
+    PING_INTERVAL = 20
+    PING_TIMEOUT = 10
+    CLOSE_TIMEOUT = 10
+    OPEN_TIMEOUT = 5  # TCP/TLS握手超时 - 快速跳过黑洞主机，加速故障转移
+    MAX_CONNECTION_HOURS = 23.9
+    
+    # 备用服务器
+    BACKUP_HOSTS = [
+        "fstream.binance.com",
+        "fstream1.binance.com", 
+        "fstream2.binance.com"
+    ]
+    
+    # 重连间隔（指数退避）
+    RECONNECT_INTERVALS = [1, 2, 5, 10, 20, 30, 60]
+
+    # DNS预解析刷新周期（秒）
+    DNS_REFRESH_INTERVAL = 300
+    
+    def __init__(self,
+                 stream_path: str = "/ws/!markPrice@arr@1s",
+                 data_handler: Optional[Callable] = None,
+                 batch_handler: Optional[Callable] = None,
+                 lazy_parse: bool = False):
+        """
+        初始化币安WebSocket客户端
+
+        Args:
+            stream_path: WebSocket流路径，默认为全市场标记价格流
+            data_handler: 数据处理回调函数（逐条消息调用）
+            batch_handler: 可选的批量处理回调。设置后，突发到达的多个帧
+                           会被一次性解析并以列表形式交给该回调，
+                           摊薄每帧的事件循环和分发开销
+            lazy_parse: 启用pysimdjson惰性解析（需安装pysimdjson）。
+                        处理器收到的是simdjson Document而非list/dict，
+                        只物化实际访问的字段；该对象仅在下一次parse()前
+                        有效，处理器不得保留引用
+        """
+        self.logger = get_logger(__name__)
+        
+        # 核心配置
+        self.stream_path = stream_path
+        self.data_handler = data_handler
+
+        # 构造时一次性判定处理器类型，热路径上不再重复调用iscoroutinefunction
+        self._handler_is_async = asyncio.iscoroutinefunction(data_handler)
+        self._dispatch = self._dispatch_async if self._handler_is_async else self._dispatch_sync
+        self.batch_handler = batch_handler
+        self._batch_handler_is_async = asyncio.iscoroutinefunction(batch_handler)
+
+        # simdjson解析器每客户端一个（内部缓冲区跨消息复用，减少分配）
+        self._simd_parser = _simdjson.Parser() if (lazy_parse and _simdjson) else None
+
+        # DNS预解析缓存 {host: (monotonic时间戳, getaddrinfo结果)}
+        self._dns_cache: Dict[str, Any] = {}
+        self._dns_task: Optional[asyncio.Task] = None
+
+        # 预构建所有候选URL，重连/状态轮询时不再做f-string格式化
+        self._urls = tuple(f"wss://{host}{stream_path}" for host in self.BACKUP_HOSTS)
+        self._host_cycle = itertools.cycle(range(len(self.BACKUP_HOSTS)))
+        next(self._host_cycle)  # 与current_host_index=0对齐，下一次next返回1
+        
+        # 预分配的状态快照模板 - get_status原地更新后浅拷贝返回
+        self._status: Dict[str, Any] = {
+            'is_connected': False,
+            'is_running': False,
+            'current_host': self.BACKUP_HOSTS[0],
+            'connection_count': 0,
+            'message_count': 0,
+            'connection_duration_hours': 0.0,
+            'current_url': self._urls[0],
+        }
+
+        # 连接状态 - 单一枚举取代is_connected/is_running双布尔
+        self.websocket: Optional[websockets.WebSocketServerProtocol] = None
+        self._state = ClientState.STOPPED
+        self.connection_task: Optional[asyncio.Task] = None
+        # 连接建立事件 - 打开时set、断开时clear，关心连接状态的协程
+        # 直接await，无需定时器轮询
+        self.connected_event = asyncio.Event()
+        self._recv_raw = False  # 当前连接是否支持recv(decode=False)
+
+        # 同步处理器专用线程池 - 默认executor会创建cpu_count()*5个线程，
+        # 这里限定2个工作线程，避免大机器上的内存浪费和关闭阻塞
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        
+        # 并发安全锁 - 保护启停操作
+        self._control_lock = asyncio.Lock()
+        
+        # 统计信息
+        self.connection_start_time = 0  # monotonic时钟，仅用于时长计算
+        self._reconnect_deadline = 0.0  # 24小时重连的绝对截止时刻（monotonic）
+        self.message_count = 0
+        self.reconnect_count = 0
+        self.current_host_index = 0
+
+        # 错误分类缓存 {异常类型: 标签} - 断网风暴中同类异常反复出现，
+        # 缓存命中后分类退化为一次dict查找
+        self._error_cache: Dict[type, str] = {}
+        
+        self.logger.info("币安WebSocket客户端初始化完成")
+
+    @property
+    def is_connected(self) -> bool:
+        """是否已建立连接（由状态枚举派生）"""
+        return self._state is ClientState.CONNECTED
+
+    @property
+    def is_running(self) -> bool:
+        """客户端是否在运行（由状态枚举派生）"""
+        return self._state in (ClientState.CONNECTING, ClientState.CONNECTED)
+
+    async def start(self) -> None:
+        """启动WebSocket客户端 - 并发安全版本"""
+        async with self._control_lock:
+            if self._state is not ClientState.STOPPED:
+                self.logger.warning("客户端已在运行中")
+                return
+
+            self._state = ClientState.CONNECTING
+            needs_executor = (
+                (self.data_handler and not self._handler_is_async)
+                or (self.batch_handler and not self._batch_handler_is_async)
+            )
+            if needs_executor:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix='binance-handler'
+                )
+            self.connection_task = asyncio.create_task(self._connection_loop())
+            # 并发预解析所有备用主机的DNS，把解析耗时移出重连关键路径
+            self._dns_task = asyncio.create_task(self._dns_refresh_loop())
+            self.logger.info("WebSocket客户端已启动")
+    
+    async def stop(self) -> None:
+        """停止WebSocket客户端 - 优雅关闭版本"""
+        async with self._control_lock:
+            if self._state is ClientState.STOPPED:
+                self.logger.info("客户端已经停止")
+                return
+
+            self.logger.info("正在停止WebSocket客户端...")
+
+            # 第一步：通知后台任务停止
+            self._state = ClientState.STOPPING
+            
+            # 第二步：优雅关闭WebSocket连接
+            if self.websocket:
+                try:
+                    await self.websocket.close()
+                except Exception as e:
+                    self.logger.warning("关闭WebSocket连接时出现异常: %s", e)
+                finally:
+                    self.websocket = None
+            
+            # 第三步：优雅等待后台任务结束
+            if self.connection_task:
+                try:
+                    # 给任务3秒时间自行退出
+                    await asyncio.wait_for(self.connection_task, timeout=3.0)
+                    self.logger.info("后台任务已优雅退出")
+                except asyncio.TimeoutError:
+                    # 超时则强制取消
+                    self.logger.warning("后台任务未能及时退出，执行强制取消")
+                    self.connection_task.cancel()
+                    try:
+                        await self.connection_task
+                    except asyncio.CancelledError:
+                        pass
+                except Exception as e:
+                    self.logger.error("等待后台任务退出时出现异常: %s", e)
+                finally:
+                    self.connection_task = None
+            
+            # 第四步：停止DNS预解析任务
+            if self._dns_task:
+                self._dns_task.cancel()
+                self._dns_task = None
+
+            # 第五步：释放同步处理器线程池
+            if self._executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+            self._state = ClientState.STOPPED
+            self.logger.info("WebSocket客户端已完全停止")
+    
+    async def _dns_refresh_loop(self) -> None:
+        """
+        周期性并发预解析所有备用主机
+
+        预热操作系统解析器缓存并提前发现失效主机；连接仍使用主机名URL
+        以保证TLS SNI正确，缓存结果供状态诊断使用
+        """
+        loop = asyncio.get_running_loop()
+        while self.is_running:
+            results = await asyncio.gather(
+                *[loop.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+                  for host in self.BACKUP_HOSTS],
+                return_exceptions=True
+            )
+            now = time.monotonic()
+            for host, result in zip(self.BACKUP_HOSTS, results):
+                if isinstance(result, Exception):
+                    self.logger.warning("DNS预解析失败: %s: %s", host, result)
+                else:
+                    self._dns_cache[host] = (now, result)
+
+            try:
+                await asyncio.sleep(self.DNS_REFRESH_INTERVAL)
+            except asyncio.CancelledError:
+                break
+
+    async def _connection_loop(self) -> None:
+        """主连接循环 - 外循环负责建立连接"""
+        reconnect_attempt = 0
+        
+        while self.is_running:
+            try:
+                current_url = self._get_current_url()
+                self.logger.info("尝试连接: %s", current_url)
+                
+                async with websockets.connect(
+                    current_url,
+                    open_timeout=self.OPEN_TIMEOUT,
+                    ping_interval=self.PING_INTERVAL,
+                    ping_timeout=self.PING_TIMEOUT,
+                    close_timeout=self.CLOSE_TIMEOUT,
+                    max_size=2**20,
+                    compression=None
+                ) as websocket:
+                    self.websocket = websocket
+                    # 特性探测：websockets新版本支持recv(decode=False)直接返回bytes，
+                    # 跳过文本帧的UTF-8解码（解析器可直接消费bytes）
+                    self._recv_raw = 'decode' in inspect.signature(websocket.recv).parameters
+                    self._state = ClientState.CONNECTED
+                    self.connected_event.set()
+                    # monotonic时钟：不受系统时间跳变影响，且比time.time()更便宜
+                    self.connection_start_time = time.monotonic()
+                    self._reconnect_deadline = (
+                        self.connection_start_time + self.MAX_CONNECTION_HOURS * 3600
+                    )
+                    self.reconnect_count += 1
+                    reconnect_attempt = 0
+                    
+                    self.logger.info("✓ 连接成功 (第%d次)", self.reconnect_count)
+                    
+                    # 内循环：消息接收和24小时主动重连
+                    await self._message_loop()
+                        
+            except Exception as e:
+                self._handle_connection_error(e, reconnect_attempt)
+                self._switch_to_next_host()
+                reconnect_attempt += 1
+                
+                wait_time = self._get_reconnect_interval(reconnect_attempt)
+                await asyncio.sleep(wait_time)
+        
+        self.logger.info("连接循环已退出")
+    
+    async def _message_loop(self) -> None:
+        """
+        消息接收循环 - 内循环负责接收消息和生命周期管理
+
+        直接await recv()，不再用wait_for(timeout=1.0)每秒轮询：
+        - 24小时重连通过一次性call_later定时器触发，到期主动关闭连接
+        - stop()关闭连接后recv()抛出ConnectionClosed，循环干净退出
+        避免了每条消息一次Task+定时器句柄的分配开销
+        """
+        loop = asyncio.get_running_loop()
+        remaining = self._reconnect_deadline - time.monotonic()
+        reconnect_handle = loop.call_later(max(remaining, 0.0), self._trigger_reconnect)
+
+        # websockets内部已就绪帧队列（不同版本属性名不同，取不到则退化为逐条处理）
+        buffered = getattr(self.websocket, 'messages', None)
+
+        # 热路径局部化：每帧省去对self的重复属性解析
+        ws_recv = self.websocket.recv
+        recv_raw = self._recv_raw
+        process = self._process_message
+        process_batch = self._process_batch
+        batch_mode = self.batch_handler is not None and buffered is not None
+
+        # 消息计数在局部变量中累积，每64帧才回写一次实例属性，
+        # 避免每帧一对LOAD_ATTR/STORE_ATTR（get_status读数最多滞后64帧）
+        pending_count = 0
+
+        try:
+            # 单一枚举比较取代两个布尔属性的加载与判断
+            while self._state is ClientState.CONNECTED:
+                try:
+                    if recv_raw:
+                        message = await ws_recv(decode=False)
+                    else:
+                        message = await ws_recv()
+
+                    if batch_mode and buffered:
+                        # 突发场景：队列里还有已就绪的帧，排空后批量分发一次
+                        await process_batch(message, buffered)
+                    else:
+                        pending_count += 1
+                        if pending_count >= 64:
+                            self.message_count += pending_count
+                            pending_count = 0
+                        await process(message)
+
+                except websockets.exceptions.ConnectionClosed:
+                    self.logger.warning("连接已关闭")
+                    break
+                except Exception as e:
+                    self.logger.error("消息循环异常: %s", e)
+                    break
+        finally:
+            reconnect_handle.cancel()
+            self.message_count += pending_count
+            self.connected_event.clear()
+            # 连接断开但客户端未被stop()：回到CONNECTING，外循环负责重连
+            if self._state is ClientState.CONNECTED:
+                self._state = ClientState.CONNECTING
+            self.websocket = None
+
+    def _trigger_reconnect(self) -> None:
+        """24小时连接上限到期：关闭当前连接，外循环会自动重建"""
+        if self.websocket is not None and self.is_running:
+            self.logger.info("主动重连：接近24小时限制，建立新连接")
+            asyncio.ensure_future(self.websocket.close())
+    
+    async def _process_message(self, message) -> None:
+        """
+        处理接收到的消息
+
+        Args:
+            message: 原始WebSocket帧（str或bytes）。bytes帧直接交给解析器，
+                     省去一次冗余的UTF-8解码（orjson/json均原生支持bytes输入）
+        """
+        # 未注册处理器时直接丢弃帧，不花钱解析JSON
+        # （仅监控连接健康的部署模式下省掉全部解码成本）
+        if self.data_handler is None:
+            return
+
+        try:
+            if self._simd_parser is not None:
+                # 惰性解析：未访问的字段不物化；Document在下一次parse()前有效
+                data = self._simd_parser.parse(message)
+            else:
+                data = _loads(message)
+            await self._call_handler_safely(data)
+
+        except ValueError as e:
+            # orjson.JSONDecodeError 和 json.JSONDecodeError 都是 ValueError 的子类
+            self.logger.error("JSON解析失败: %s", e)
+        except Exception as e:
+            self.logger.error("消息处理失败: %s", e)
+
+    async def _process_batch(self, first_message, buffered) -> None:
+        """排空接收队列并批量分发 - 摊薄突发帧的逐条处理开销"""
+        try:
+            batch = [_loads(first_message)]
+            while buffered:
+                batch.append(_loads(await self.websocket.recv()))
+            self.message_count += len(batch)
+
+            if self._batch_handler_is_async:
+                await self.batch_handler(batch)
+            else:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self._executor, self.batch_handler, batch)
+
+        except ValueError as e:
+            self.logger.error("JSON解析失败: %s", e)
+        except Exception as e:
+            self.logger.error("批量消息处理失败: %s", e, exc_info=True)
+    
+    async def _call_handler_safely(self, data: Any) -> None:
+        """安全调用外部数据处理器 - 分发变体在构造时已绑定"""
+        try:
+            await self._dispatch(data)
+        except Exception as e:
+            self.logger.error("数据处理器异常: %s", e, exc_info=True)
+
+    async def _dispatch_async(self, data: Any) -> None:
+        """异步处理器：直接调用"""
+        await self.data_handler(data)
+
+    async def _dispatch_sync(self, data: Any) -> None:
+        """同步处理器：使用自有的有界线程池执行，避免阻塞事件循环"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.data_handler, data)
+    
+    async def send_json(self, obj: Any) -> None:
+        """
+        序列化并发送JSON消息
+
+        使用orjson.dumps直接产出bytes（以二进制帧发送，跳过str中转）；
+        无orjson时回退到标准库json并显式编码。处理器需要回传确认或
+        指标时应经由本方法，保持出站序列化路径统一
+        """
+        websocket = self.websocket
+        if websocket is None:
+            raise ConnectionError("WebSocket未连接，无法发送消息")
+        await websocket.send(_dumps(obj))
+
+    def _get_current_url(self) -> str:
+        """获取当前WebSocket URL（预构建，无字符串格式化）"""
+        return self._urls[self.current_host_index]
+
+    def _switch_to_next_host(self) -> None:
+        """切换到下一个备用服务器"""
+        self.current_host_index = next(self._host_cycle)
+        next_host = self.BACKUP_HOSTS[self.current_host_index]
+        self.logger.info("切换到备用服务器: %s", next_host)
+    
+    def _handle_connection_error(self, error: Exception, attempt: int) -> None:
+        """处理连接错误"""
+        if self._state is ClientState.CONNECTED:
+            self._state = ClientState.CONNECTING
+        self.websocket = None
+
+        if not self.is_running:
+            return
+        
+        # 先按异常类型查缓存，未命中再走isinstance分类
+        etype = type(error)
+        error_type = self._error_cache.get(etype)
+        if error_type is None:
+            error_type = self._classify_error(error)
+        wait_time = self._get_reconnect_interval(attempt)
+        
+        self.logger.warning(
+            "连接失败: %s - 将在 %d 秒后重试 (第%d次)",
+            error_type, wait_time, attempt + 1
+        )
+    
+    # 按异常类型分类 - 类型安全且避免对异常消息做lower()扫描
+    _ERROR_TYPE_LABELS = (
+        ((asyncio.TimeoutError, TimeoutError), "连接超时"),
+        (ConnectionRefusedError, "连接被拒绝"),
+        (socket.gaierror, "DNS解析失败"),
+    )
+
+    # 错误分类缓存上限 - 超出后按插入顺序淘汰最旧条目
+    _ERROR_CACHE_SIZE = 16
+
+    def _classify_error(self, error: Exception) -> str:
+        """分类错误类型 - 基于异常类型分发，稳定结果按类型缓存"""
+        for exc_types, label in self._ERROR_TYPE_LABELS:
+            if isinstance(error, exc_types):
+                # 仅缓存与实例内容无关的标签（errno/消息相关的不缓存）
+                cache = self._error_cache
+                if len(cache) >= self._ERROR_CACHE_SIZE:
+                    cache.pop(next(iter(cache)))
+                cache[type(error)] = label
+                return label
+
+        if isinstance(error, OSError) and error.errno in (errno.ENETUNREACH, errno.EHOSTUNREACH):
+            return "网络不可达"
+
+        return f"未知错误: {str(error)[:50]}"
+    
+    def _get_reconnect_interval(self, attempt: int) -> int:
+        """获取重连间隔（指数退避）"""
+        if attempt < len(self.RECONNECT_INTERVALS):
+            return self.RECONNECT_INTERVALS[attempt]
+        return self.RECONNECT_INTERVALS[-1]
+    
+    def get_status(self) -> Dict[str, Any]:
+        """
+        获取客户端状态
+
+        复用预分配的状态模板字典：键只在构造时哈希一次，每次调用
+        仅做原地赋值 + 浅拷贝，适合被监控端点高频轮询
+        """
+        connection_duration = 0
+        if self.connection_start_time > 0:
+            connection_duration = time.monotonic() - self.connection_start_time
+
+        status = self._status
+        status['is_connected'] = self.is_connected
+        status['is_running'] = self.is_running
+        status['current_host'] = self.BACKUP_HOSTS[self.current_host_index]
+        status['connection_count'] = self.reconnect_count
+        status['message_count'] = self.message_count
+        status['connection_duration_hours'] = connection_duration / 3600
+        status['current_url'] = self._urls[self.current_host_index]
+        return status.copy()
\ No newline at end of file
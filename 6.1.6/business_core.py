@@ -1,550 +1,754 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-业务核心模块 - 资金费率分析和波动率计算
-使用 Pandas 和 NumPy 优化的高性能版本
-负责处理币安WebSocket数据，计算波动率，生成TOP5排行
-"""
-
-import time
-import threading
-import numpy as np
-import pandas as pd
-from collections import defaultdict
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timezone, timedelta
-from config import config
-from logger import get_logger
-
-class BusinessCore:
-    """业务核心 - 基于 Pandas/NumPy 的高性能核心业务逻辑处理器"""
-    
-    def __init__(self):
-        """初始化业务核心"""
-        self.logger = get_logger(__name__)
-        
-        # 核心数据存储 - 使用 Pandas Series 替代原始列表
-        self.current_rates: Dict[str, float] = {}
-        self.rate_history: Dict[str, pd.Series] = {}  # 每个交易对的历史费率时间序列
-        self.volatility_data: Dict[str, Dict] = {}
-        
-        # TOP5排行数据 - 冠军保持机制
-        self.top5_symbols: List[str] = []
-        self.champion_records: Dict[str, Dict] = {}  # 保存历史最高波动率记录
-        
-        # 统计信息
-        self.total_symbols: int = 0
-        self.data_update_count: int = 0
-        self.last_update_time: Optional[float] = None
-        
-        # 线程安全
-        self.data_lock = threading.RLock()
-        
-        # 内存管理
-        self.symbol_last_seen: Dict[str, float] = {}
-        
-        # 独立的排名更新线程
-        self.ranking_thread: Optional[threading.Thread] = None
-        self.stop_event = threading.Event()
-        self.ranking_update_interval = 0.2
-        
-        # 配置参数
-        self.window_size = getattr(config, 'MOVING_AVERAGE_WINDOW', 20)
-        self.champion_ttl = 15 * 60  # 15分钟冠军TTL
-        
-        self.logger.info("业务核心初始化完成 (Pandas/NumPy 优化版本)")
-
-    def start(self):
-        """启动后台排名更新线程"""
-        if self.ranking_thread is None:
-            self.stop_event.clear()
-            self.ranking_thread = threading.Thread(target=self._ranking_loop, daemon=True)
-            self.ranking_thread.start()
-            self.logger.info(f"独立的排名更新线程已启动，刷新间隔: {self.ranking_update_interval}秒")
-
-    def stop(self):
-        """停止后台排名更新线程"""
-        self.logger.info("正在停止排名更新线程...")
-        self.stop_event.set()
-        if self.ranking_thread and self.ranking_thread.is_alive():
-            self.ranking_thread.join()
-        self.logger.info("排名更新线程已停止")
-
-    def _ranking_loop(self):
-        """排名更新的循环，由后台线程执行"""
-        while not self.stop_event.is_set():
-            try:
-                with self.data_lock:
-                    self._update_top5_ranking()
-            except Exception as e:
-                self.logger.error(f"排名更新循环中发生错误: {e}", exc_info=True)
-            self.stop_event.wait(self.ranking_update_interval)
-    
-    def update_data(self, data: Any) -> None:
-        """处理资金费率数据的主要入口方法"""
-        try:
-            with self.data_lock:
-                items_to_process = []
-                if isinstance(data, list):
-                    items_to_process = data
-                elif isinstance(data, dict):
-                    items_to_process = [data]
-
-                processed_count = 0
-                for item in items_to_process:
-                    if self._process_single_item(item):
-                        processed_count += 1
-                
-                if processed_count > 0:
-                    self._update_statistics(processed_count)
-                    if self.data_update_count % 100 == 0:
-                        self._cleanup_caches()
-                
-        except Exception as e:
-            self.logger.error(f"处理资金费率数据时发生错误: {e}", exc_info=True)
-
-    def _process_single_item(self, item: Dict) -> bool:
-        """处理单个数据项"""
-        try:
-            if not self._validate_item(item):
-                return False
-            
-            symbol, new_rate = self._extract_rate(item)
-            if symbol is None or new_rate is None:
-                return False
-
-            if not self._should_process_symbol(symbol):
-                return False
-            
-            old_rate = self.current_rates.get(symbol, new_rate)
-            
-            # 更新当前费率
-            self.current_rates[symbol] = new_rate
-            
-            # 更新历史记录 - 使用 Pandas Series
-            current_time = pd.Timestamp.now()
-            if symbol not in self.rate_history:
-                # 创建新的 Series，包含第一个数据点
-                self.rate_history[symbol] = pd.Series([new_rate], index=[current_time], name=symbol)
-            else:
-                # 添加新的费率数据点到现有 Series
-                new_data = pd.Series([new_rate], index=[current_time])
-                self.rate_history[symbol] = pd.concat([self.rate_history[symbol], new_data])
-            
-            # 维护窗口大小 - 使用 Pandas 的高效切片
-            if len(self.rate_history[symbol]) > self.window_size:
-                self.rate_history[symbol] = self.rate_history[symbol].iloc[-self.window_size:]
-            
-            self.symbol_last_seen[symbol] = time.time()
-
-            # 仅在费率实际变化时才计算波动率
-            rate_diff = abs(new_rate - old_rate)
-            if rate_diff > 1e-9:
-                self._calculate_volatility(symbol, old_rate, new_rate)
-            
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"处理单个数据项 {item.get('s', item.get('symbol', ''))} 时出错: {e}")
-            return False
-
-    def _extract_rate(self, item: Dict) -> tuple[Optional[str], Optional[float]]:
-        """从数据项中提取交易对和费率"""
-        try:
-            if 's' in item and 'r' in item:
-                return item['s'], float(item['r']) * 100
-            if 'symbol' in item and 'fundingRate' in item:
-                return item['symbol'], float(item['fundingRate']) * 100
-            if 'symbol' in item and 'funding_rate' in item:
-                return item['symbol'], float(item['funding_rate'])
-        except (ValueError, TypeError) as e:
-            self.logger.warning(f"费率提取失败: {e}")
-        return None, None
-
-    def _validate_item(self, item: Dict) -> bool:
-        """验证数据项格式和值的合理性"""
-        try:
-            if not isinstance(item, dict): 
-                return False
-            
-            symbol, rate = self._extract_rate(item)
-            if symbol is None or rate is None: 
-                return False
-                
-            if not isinstance(symbol, str) or not (-1000 < rate < 1000):
-                self.logger.warning(f"无效的费率数据: {symbol}, {rate}")
-                return False
-                
-            return True
-        except Exception:
-            return False
-
-    def _should_process_symbol(self, symbol: str) -> bool:
-        """判断是否应该处理该交易对"""
-        if not symbol.endswith(config.SYMBOL_SUFFIX_FILTER):
-            return False
-        if any(keyword in symbol for keyword in config.SYMBOL_EXCLUDE_KEYWORDS):
-            return False
-        return True
-
-    def _calculate_volatility(self, symbol: str, old_rate: float, new_rate: float) -> None:
-        """
-        计算并存储波动率 - 使用 Pandas/NumPy 优化的 Z-score 算法
-        + 15分钟TTL冠军机制
-        """
-        try:
-            history_series = self.rate_history.get(symbol)
-            if history_series is None or len(history_series) < 3:
-                return  # 历史数据不足
-            
-            # 使用 Pandas 的高效统计方法 - 排除最新的数据点进行统计计算
-            historical_data = history_series.iloc[:-1]  # 排除最新添加的数据点
-            
-            if len(historical_data) < 2:
-                return
-            
-            # 使用 Pandas 内置的高效统计函数
-            moving_average = historical_data.mean()
-            std_dev = historical_data.std()
-            
-            # 检查标准差是否有效
-            if pd.isna(std_dev) or std_dev < 1e-10:
-                return
-            
-            # 计算 Z-score
-            z_score = (new_rate - moving_average) / std_dev
-            current_volatility = abs(z_score)
-            
-            current_time = time.time()
-            
-            # 检查并清理过期的冠军记录
-            if symbol in self.champion_records:
-                champion_age = current_time - self.champion_records[symbol]['champion_timestamp']
-                if champion_age > self.champion_ttl:
-                    del self.champion_records[symbol]
-                    self.logger.debug(f"⏰ {symbol} 冠军记录已过期，清除")
-            
-            # 检查是否创造新纪录
-            is_new_champion = (
-                symbol not in self.champion_records or 
-                current_volatility > self.champion_records[symbol]['max_volatility']
-            )
-            
-            if is_new_champion:
-                self.champion_records[symbol] = {
-                    'max_volatility': current_volatility,
-                    'z_score': z_score,
-                    'moving_average': float(moving_average),  # 转换为 Python float
-                    'std_dev': float(std_dev),
-                    'champion_old_rate': old_rate,
-                    'champion_new_rate': new_rate,
-                    'champion_timestamp': current_time,
-                    'champion_age_hours': 0.0
-                }
-                self.logger.info(f"🏆 {symbol} 创造新的Z-score纪录: {z_score:.4f}")
-            
-            # 更新波动率数据
-            if symbol in self.champion_records:
-                champion_info = self.champion_records[symbol]
-                champion_age_hours = (current_time - champion_info['champion_timestamp']) / 3600
-                champion_info['champion_age_hours'] = champion_age_hours
-                
-                self.volatility_data[symbol] = {
-                    'combined': champion_info['max_volatility'],
-                    'z_score': champion_info['z_score'],
-                    'moving_average': champion_info['moving_average'],
-                    'std_dev': champion_info['std_dev'],
-                    'rate_change': champion_info['champion_new_rate'] - champion_info['champion_old_rate'],
-                    'champion_info': champion_info,
-                    'timestamp': current_time
-                }
-            
-        except Exception as e:
-            self.logger.error(f"计算 {symbol} 波动率时出错: {e}", exc_info=True)
-
-    def _update_statistics(self, processed_count: int) -> None:
-        """更新统计信息"""
-        self.total_symbols = len(self.current_rates)
-        self.data_update_count += 1
-        self.last_update_time = time.time()
-        
-        if self.data_update_count % config.STATS_PRINT_INTERVAL == 0:
-            self.logger.info(f"已处理 {self.data_update_count} 次更新, 当前监控 {self.total_symbols} 个交易对")
-
-    def _update_top5_ranking(self) -> None:
-        """更新TOP5排行 - 智能动态排名系统（冠军TTL + 实时Z-score）"""
-        try:
-            current_time = time.time()
-            
-            ranking_data = []
-            for symbol in self.current_rates.keys():
-                score = 0.0
-                champion_info = self.champion_records.get(symbol)
-                
-                if champion_info and current_time - champion_info.get('champion_timestamp', 0) <= self.champion_ttl:
-                    # 冠军记录仍有效
-                    score = champion_info.get('max_volatility', 0)
-                else:
-                    # 实时计算当前 Z-score
-                    score = self._calculate_current_zscore(symbol)
-                
-                if score > 0:
-                    ranking_data.append({'symbol': symbol, 'score': score})
-            
-            # 使用 NumPy 进行高效排序
-            if ranking_data:
-                scores = np.array([item['score'] for item in ranking_data])
-                symbols = np.array([item['symbol'] for item in ranking_data])
-                
-                # 获取排序索引（降序）
-                sorted_indices = np.argsort(scores)[::-1]
-                
-                # 获取 TOP5
-                top_count = min(config.TOP_RANKING_COUNT, len(sorted_indices))
-                new_top5 = symbols[sorted_indices[:top_count]].tolist()
-                
-                if new_top5 != self.top5_symbols:
-                    self.top5_symbols = new_top5
-                    self.logger.info(f"🏆 TOP5 排名更新: {self.top5_symbols}")
-
-        except Exception as e:
-            self.logger.error(f"更新TOP5排行时出错: {e}", exc_info=True)
-    
-    def _calculate_current_zscore(self, symbol: str) -> float:
-        """使用 Pandas 为指定交易对实时计算当前的Z-score"""
-        try:
-            history_series = self.rate_history.get(symbol)
-            if history_series is None or len(history_series) < 3:
-                return 0.0
-            
-            # 使用 Pandas 的高效统计方法
-            historical_data = history_series.iloc[:-1]  # 排除最新数据点
-            current_rate = history_series.iloc[-1]  # 最新数据点
-            
-            if len(historical_data) < 2:
-                return 0.0
-            
-            moving_average = historical_data.mean()
-            std_dev = historical_data.std()
-            
-            if pd.isna(std_dev) or std_dev < 1e-10:
-                return 0.0
-            
-            z_score = (current_rate - moving_average) / std_dev
-            return abs(z_score)
-                
-        except Exception as e:
-            self.logger.error(f"计算 {symbol} 实时Z-score时出错: {e}")
-            return 0.0
-    
-    def _cleanup_caches(self) -> None:
-        """定期清理不活跃的交易对以防止内存泄漏"""
-        try:
-            current_time = time.time()
-            inactive_threshold = 72 * 3600  # 72小时
-            
-            inactive_symbols = [
-                symbol for symbol, last_seen in self.symbol_last_seen.items() 
-                if current_time - last_seen > inactive_threshold
-            ]
-            
-            if inactive_symbols:
-                self.logger.info(f"清理 {len(inactive_symbols)} 个不活跃交易对...")
-                for symbol in inactive_symbols:
-                    # 清理所有相关数据
-                    self.current_rates.pop(symbol, None)
-                    self.volatility_data.pop(symbol, None)
-                    self.rate_history.pop(symbol, None)
-                    self.champion_records.pop(symbol, None)
-                    self.symbol_last_seen.pop(symbol, None)
-                
-                self.logger.info(f"成功清理 {len(inactive_symbols)} 个不活跃交易对")
-            
-        except Exception as e:
-            self.logger.error(f"清理缓存时出错: {e}")
-    
-    def get_top5_data(self) -> List[Dict]:
-        """获取TOP5数据用于前端展示"""
-        try:
-            with self.data_lock:
-                top5_data = []
-                
-                for symbol in self.top5_symbols:
-                    volatility_info = self.volatility_data.get(symbol)
-                    if not volatility_info:
-                        continue
-
-                    champion_info = volatility_info.get('champion_info', {})
-                    rate_change = volatility_info.get('rate_change', 0.0)
-                    
-                    # 确定颜色类别
-                    if rate_change > 0: 
-                        color_class = 'text-red-400'
-                    elif rate_change < 0: 
-                        color_class = 'text-green-400'
-                    else: 
-                        color_class = 'text-gray-400'
-                    
-                    # 判断是否为近期冠军（15分钟内）
-                    is_recent = champion_info.get('champion_age_hours', 1) < 0.25
-                    
-                    top5_data.append({
-                        'symbol': symbol,
-                        'current_rate': champion_info.get('champion_new_rate', 0.0),
-                        'rate_change': rate_change,
-                        'volatility': volatility_info['combined'],
-                        'z_score': champion_info.get('z_score', 0.0),
-                        'moving_average': champion_info.get('moving_average', 0.0),
-                        'std_dev': champion_info.get('std_dev', 0.0),
-                        'champion_badge': '',
-                        'champion_time_display': self._format_champion_time(
-                            champion_info.get('champion_timestamp', 0)
-                        ),
-                        'trend': 'unknown',  # 可以后续扩展趋势分析
-                        'color_class': color_class,
-                        'timestamp': volatility_info['timestamp'],
-                    })
-                
-                return top5_data
-                
-        except Exception as e:
-            self.logger.error(f"获取TOP5数据时出错: {e}", exc_info=True)
-            return []
-    
-    def get_statistics(self) -> Dict:
-        """获取统计信息"""
-        with self.data_lock:
-            try:
-                # 计算历史数据点总数 - 使用 Pandas 的高效方法
-                total_history_points = sum(len(series) for series in self.rate_history.values())
-                
-                return {
-                    'total_symbols': len(self.current_rates),
-                    'data_updates': self.data_update_count,
-                    'last_update': self.last_update_time,
-                    'top5_count': len(self.top5_symbols),
-                    'has_data': len(self.current_rates) > 0,
-                    'volatility_data_count': len(self.volatility_data),
-                    'history_total_points': total_history_points,
-                    'champion_records_count': len(self.champion_records),
-                    'cache_statistics': {
-                        'pandas_series_count': len(self.rate_history),
-                        'avg_series_length': total_history_points / max(len(self.rate_history), 1)
-                    },
-                    'quality_statistics': {
-                        'active_symbols': len(self.symbol_last_seen),
-                        'champion_coverage': len(self.champion_records) / max(len(self.current_rates), 1)
-                    },
-                }
-            except Exception as e:
-                self.logger.error(f"获取统计信息时出错: {e}")
-                return {'has_data': False, 'total_symbols': 0}
-
-    def get_last_update_age(self) -> Optional[float]:
-        """获取最后更新时间距离现在的秒数"""
-        if self.last_update_time is None:
-            return None
-        return time.time() - self.last_update_time
-
-    def get_champion_summary(self) -> Dict:
-        """获取冠军记录摘要"""
-        try:
-            with self.data_lock:
-                if not self.champion_records:
-                    return {'total_champions': 0, 'recent_champions': 0}
-                
-                current_time = time.time()
-                
-                # 使用 NumPy 进行高效的数组操作
-                volatilities = np.array([
-                    info.get('max_volatility', 0) 
-                    for info in self.champion_records.values()
-                ])
-                
-                timestamps = np.array([
-                    info.get('champion_timestamp', 0) 
-                    for info in self.champion_records.values()
-                ])
-                
-                symbols = np.array(list(self.champion_records.keys()))
-                
-                # 找到最高波动率的冠军
-                max_idx = np.argmax(volatilities)
-                
-                # 计算近期冠军数量（15分钟内）
-                recent_mask = (current_time - timestamps) < 900  # 15分钟
-                recent_champions = np.sum(recent_mask)
-                
-                return {
-                    'total_champions': len(self.champion_records),
-                    'recent_champions': int(recent_champions),
-                    'max_volatility_champion': {
-                        'symbol': symbols[max_idx],
-                        'volatility': float(volatilities[max_idx]),
-                        'age_hours': (current_time - timestamps[max_idx]) / 3600
-                    }
-                }
-                
-        except Exception as e:
-            self.logger.error(f"获取冠军摘要时出错: {e}", exc_info=True)
-            return {'total_champions': 0, 'recent_champions': 0}
-    
-    def _format_champion_time(self, timestamp: float) -> str:
-        """格式化时间显示"""
-        if timestamp == 0: 
-            return "未知"
-        
-        try:
-            time_diff = time.time() - timestamp
-            china_tz = timezone(timedelta(hours=8))
-            absolute_time = datetime.fromtimestamp(timestamp, tz=china_tz).strftime("%H:%M:%S")
-            
-            if time_diff < 1: 
-                return f"刚刚 ({absolute_time})"
-            elif time_diff < 60: 
-                return f"{int(time_diff)}秒前 ({absolute_time})"
-            elif time_diff < 3600: 
-                return f"{int(time_diff / 60)}分钟前 ({absolute_time})"
-            else:
-                return f"{int(time_diff / 3600)}小时前 ({absolute_time})"
-                
-        except Exception as e:
-            self.logger.error(f"格式化时间时出错: {e}")
-            return "时间错误"
-
-    def get_symbol_analysis(self, symbol: str) -> Optional[Dict]:
-        """获取指定交易对的详细分析数据（新增功能）"""
-        try:
-            with self.data_lock:
-                if symbol not in self.rate_history:
-                    return None
-                
-                history_series = self.rate_history[symbol]
-                if len(history_series) < 2:
-                    return None
-                
-                # 使用 Pandas 的强大统计功能
-                analysis = {
-                    'symbol': symbol,
-                    'current_rate': self.current_rates.get(symbol, 0.0),
-                    'data_points': len(history_series),
-                    'statistics': {
-                        'mean': float(history_series.mean()),
-                        'std': float(history_series.std()),
-                        'min': float(history_series.min()),
-                        'max': float(history_series.max()),
-                        'median': float(history_series.median()),
-                    },
-                    'recent_trend': {
-                        'last_5_mean': float(history_series.tail(5).mean()) if len(history_series) >= 5 else None,
-                        'last_10_mean': float(history_series.tail(10).mean()) if len(history_series) >= 10 else None,
-                    },
-                    'champion_info': self.champion_records.get(symbol, {}),
-                    'last_update': self.symbol_last_seen.get(symbol, 0)
-                }
-                
-                return analysis
-                
-        except Exception as e:
-            self.logger.error(f"获取 {symbol} 分析数据时出错: {e}")
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+业务核心模块 - 资金费率分析和波动率计算
+使用 Pandas 和 NumPy 优化的高性能版本
+负责处理币安WebSocket数据，计算波动率，生成TOP5排行
+"""
+
+import re
+import time
+import threading
+import numpy as np
+from typing import Dict, List, Optional, Any
+from datetime import datetime, timezone, timedelta
+from config import config
+from logger import get_logger
+from _core import current_zscore, rank_top5, make_batch_kernel
+
+# 展示用时区常量 - 避免每次格式化时间都重新构造tzinfo对象
+_CHINA_TZ = timezone(timedelta(hours=8))
+
+class BusinessCore:
+    """业务核心 - 基于 Pandas/NumPy 的高性能核心业务逻辑处理器"""
+
+    # __slots__消除每实例__dict__：省内存且属性访问更快
+    __slots__ = (
+        'logger', 'symbol_ids', 'symbol_names', '_capacity', '_num_symbols',
+        '_buffers', '_meta_i', '_meta_f',
+        '_champion_vol', '_champion_ts', '_champion_z', '_champion_mean',
+        '_champion_std', '_champion_old_rate', '_champion_new_rate',
+        '_vol_ts', '_last_seen',
+        '_ids_range', '_int_work', '_f_work', '_batch_kernel',
+        'top5_symbols', '_snapshot', 'version', '_listeners',
+        'total_symbols', 'data_update_count', 'last_update_time',
+        '_total_history_points',
+        'data_lock', '_update_cv', '_dirty',
+        'ranking_thread', 'stop_event', 'ranking_update_interval',
+        'window_size', 'champion_ttl', '_sensitivity',
+        '_exclude_re', '_suffix', '_admit_cache', '_time_fmt_cache',
+    )
+
+    # 滑动和全量重算周期（按每交易对写入次数），抑制浮点误差累积
+    SUM_REFRESH_TICKS = 1024
+
+    # SoA数组扩容步长（交易对数）
+    GROW_CHUNK = 256
+
+    def __init__(self):
+        """初始化业务核心"""
+        self.logger = get_logger(__name__)
+        
+        # 核心数据存储 - SoA布局：所有交易对状态存放在按整型id索引的
+        # 连续数组中（布局见_core模块），排名阶段一次向量化扫描全部交易对
+        self.symbol_ids: Dict[str, int] = {}   # 交易对 -> 整型id 驻留表
+        self.symbol_names: List[Optional[str]] = []  # id -> 交易对（清理后置None）
+        self._capacity = self.GROW_CHUNK
+        self._num_symbols = 0
+        window = getattr(config, 'MOVING_AVERAGE_WINDOW', 20)
+        self._buffers = np.empty((self._capacity, window), dtype=np.float64)
+        self._meta_i = np.zeros((self._capacity, 3), dtype=np.int64)
+        self._meta_f = np.zeros((self._capacity, 2), dtype=np.float64)
+        # 批量更新内核 - 按当前配置的窗口长度特化编译（numba可用时）
+        self._batch_kernel = make_batch_kernel(window)
+        # 冠军状态 - 全部展平为按id索引的float64数组，每tick访问
+        # 从多次dict哈希退化为若干次数组取址
+        self._champion_vol = np.zeros(self._capacity, dtype=np.float64)
+        self._champion_ts = np.full(self._capacity, -np.inf, dtype=np.float64)
+        self._champion_z = np.zeros(self._capacity, dtype=np.float64)
+        self._champion_mean = np.zeros(self._capacity, dtype=np.float64)
+        self._champion_std = np.zeros(self._capacity, dtype=np.float64)
+        self._champion_old_rate = np.zeros(self._capacity, dtype=np.float64)
+        self._champion_new_rate = np.zeros(self._capacity, dtype=np.float64)
+        self._vol_ts = np.zeros(self._capacity, dtype=np.float64)   # 最近一次波动率更新时刻
+        self._last_seen = np.zeros(self._capacity, dtype=np.float64)  # 最近一次见到该交易对
+        # 排名阶段复用的工作区：打分5Hz运行，避免每趟重新分配中间数组
+        self._ids_range = np.arange(self._capacity, dtype=np.int64)
+        self._int_work = np.empty((2, self._capacity), dtype=np.int64)
+        self._f_work = np.empty((4, self._capacity), dtype=np.float64)
+
+        # TOP5排行数据 - 冠军保持机制
+        self.top5_symbols: List[str] = []
+
+        # 读侧无锁快照 (top5_data, statistics) - 排名线程在锁内构建、
+        # 锁外整体发布（CPython指针赋值为原子操作），UI轮询读取时
+        # 不与写入路径争锁
+        self._snapshot: tuple = ([], {'has_data': False, 'total_symbols': 0})
+        # 数据版本号 - TOP5展示数据发生实际变化时单调递增，UI侧据此
+        # 跳过内容未变的整轮重绘
+        self.version: int = 0
+        # 数据变化监听器 - 版本号递增后在排名线程上依次回调，
+        # 用于推送驱动的UI刷新（回调方自行保证线程安全）
+        self._listeners: List = []
+        
+        # 统计信息
+        self.total_symbols: int = 0
+        self._total_history_points: int = 0  # 全体环形缓冲区有效样本数（增量维护）
+        self.data_update_count: int = 0
+        self.last_update_time: Optional[float] = None
+        
+        # 线程安全
+        self.data_lock = threading.RLock()
+        # 写入方通过条件变量唤醒排名线程：有新数据时排名延迟从最多
+        # 200ms降到亚毫秒；无数据时排名线程按原间隔兜底轮询（冠军TTL
+        # 衰减与时间相关，不能只靠数据驱动）
+        self._update_cv = threading.Condition(self.data_lock)
+        self._dirty = False
+        
+        # 独立的排名更新线程
+        self.ranking_thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+        self.ranking_update_interval = 0.2
+        
+        # 配置参数
+        self.window_size = getattr(config, 'MOVING_AVERAGE_WINDOW', 20)
+        self.champion_ttl = 15 * 60  # 15分钟冠军TTL
+        # 相对变化低于该阈值的tick不触发冠军/波动率维护
+        self._sensitivity = getattr(config, 'DEVIATION_SENSITIVITY_THRESHOLD', 0.01)
+
+        # 交易对准入判定 - 排除关键词预编译为单个正则，判定结果按
+        # symbol记忆（symbol集合有界，缓存命中率接近100%）
+        keywords = config.SYMBOL_EXCLUDE_KEYWORDS
+        self._exclude_re = re.compile('|'.join(map(re.escape, keywords))) if keywords else None
+        self._suffix = config.SYMBOL_SUFFIX_FILTER
+        self._admit_cache: Dict[str, bool] = {}
+
+        # 冠军时间展示缓存 {int(timestamp): (渲染时刻秒, 文本)} -
+        # 同一秒内对同一时间戳的重复格式化直接返回缓存文本
+        self._time_fmt_cache: Dict[int, tuple] = {}
+        
+        self.logger.info("业务核心初始化完成 (Pandas/NumPy 优化版本)")
+
+    def start(self):
+        """启动后台排名更新线程"""
+        if self.ranking_thread is None:
+            self.stop_event.clear()
+            self.ranking_thread = threading.Thread(target=self._ranking_loop, daemon=True)
+            self.ranking_thread.start()
+            self.logger.info(f"独立的排名更新线程已启动，刷新间隔: {self.ranking_update_interval}秒")
+
+    def stop(self):
+        """停止后台排名更新线程"""
+        self.logger.info("正在停止排名更新线程...")
+        self.stop_event.set()
+        with self._update_cv:
+            self._update_cv.notify_all()
+        if self.ranking_thread and self.ranking_thread.is_alive():
+            self.ranking_thread.join()
+        self.logger.info("排名更新线程已停止")
+
+    def _ranking_loop(self):
+        """排名更新的循环，由后台线程执行（数据驱动 + 定时兜底）"""
+        cv = self._update_cv
+        stop_event = self.stop_event
+        while not stop_event.is_set():
+            try:
+                with cv:
+                    cv.wait_for(
+                        lambda: self._dirty or stop_event.is_set(),
+                        timeout=self.ranking_update_interval
+                    )
+                    if stop_event.is_set():
+                        break
+                    self._dirty = False
+                    self._update_top5_ranking()
+                    snapshot = (self._build_top5_data(), self._build_statistics())
+                top5_changed = snapshot[0] != self._snapshot[0]
+                self._snapshot = snapshot
+                # 先发布快照再递增版本号：UI读到新版本号时快照必然已就绪
+                if top5_changed:
+                    self.version += 1
+                    for callback in self._listeners:
+                        try:
+                            callback()
+                        except Exception as e:
+                            self.logger.error(f"数据变化监听器执行失败: {e}")
+            except Exception as e:
+                self.logger.error(f"排名更新循环中发生错误: {e}", exc_info=True)
+                stop_event.wait(self.ranking_update_interval)
+    
+    def update_data(self, data: Any) -> None:
+        """
+        处理资金费率数据的主要入口方法
+
+        两阶段批量处理：先在锁外把整批消息解析/过滤成数组，再在锁内
+        用一次update_batch内核调用完成全部环形缓冲区写入和Z-score
+        计算——锁持有时间和每条消息的Python开销都随批量摊薄
+        """
+        try:
+            if isinstance(data, dict):
+                data = [data]
+            elif not isinstance(data, list):
+                return
+
+            # 第一阶段（锁外）：解析、校验、准入过滤
+            symbols: List[str] = []
+            rates: List[float] = []
+            extract = self._extract_rate
+            admit = self._should_process_symbol
+            for item in data:
+                if not isinstance(item, dict):
+                    continue
+                symbol, rate = extract(item)
+                if symbol is None or rate is None:
+                    continue
+                if not isinstance(symbol, str) or not (-1000 < rate < 1000):
+                    self.logger.warning(f"无效的费率数据: {symbol}, {rate}")
+                    continue
+                if not admit(symbol):
+                    continue
+                symbols.append(symbol)
+                rates.append(rate)
+
+            if not symbols:
+                return
+
+            # 第二阶段（锁内）：向量化应用整批更新并唤醒排名线程
+            with self._update_cv:
+                self._apply_batch(symbols, rates)
+                self._update_statistics(len(symbols))
+                if self.data_update_count % 100 == 0:
+                    self._cleanup_caches()
+                self._dirty = True
+                self._update_cv.notify()
+
+        except Exception as e:
+            self.logger.error(f"处理资金费率数据时发生错误: {e}", exc_info=True)
+
+    def _apply_batch(self, symbols: List[str], rates: List[float]) -> None:
+        """把解析好的一批 (symbol, rate) 应用到SoA状态 - 须持有data_lock"""
+        sids = np.fromiter((self._sid(s) for s in symbols), dtype=np.int64, count=len(symbols))
+        rates_arr = np.asarray(rates, dtype=np.float64)
+
+        # 旧费率直接取环形缓冲区末端（内核写入前采样；首见交易对用新值，
+        # 与旧current_rates.get(s, r)语义一致）——不再维护独立的费率dict
+        heads = self._meta_i[sids, 0]
+        prior_counts = self._meta_i[sids, 1]
+        old_rates = self._buffers[sids, (heads - 1) % self._buffers.shape[1]]
+        np.copyto(old_rates, rates_arr, where=prior_counts == 0)
+
+        counts_before = int(self._meta_i[sids, 1].sum())
+        z, mean, std = self._batch_kernel(
+            self._buffers, self._meta_i, self._meta_f,
+            sids, rates_arr, self.SUM_REFRESH_TICKS
+        )
+        self._total_history_points += int(self._meta_i[sids, 1].sum()) - counts_before
+
+        self._last_seen[sids] = time.time()
+
+        # 仅对相对变化超过灵敏度阈值且Z-score有效的条目维护冠军记录。
+        # 币安每秒推送全量数组，绝大多数tick费率未实质移动，这里把
+        # 它们整体跳过（历史写入与新鲜度标记已在上面完成）
+        moved = np.abs(rates_arr - old_rates) > self._sensitivity * np.maximum(np.abs(old_rates), 1e-6)
+        changed = np.nonzero(moved & (z == z))[0]
+        for i in changed:
+            self._update_champion(
+                int(sids[i]), symbols[i], float(old_rates[i]), float(rates_arr[i]),
+                float(z[i]), float(mean[i]), float(std[i])
+            )
+
+    def _extract_rate(self, item: Dict) -> tuple[Optional[str], Optional[float]]:
+        """
+        从数据项中提取交易对和费率
+
+        针对币安WebSocket固定的s/r键型做EAFP特化：正常路径只有两次
+        取键加一次float转换；其余键型（REST/测试数据）走慢速回退
+        """
+        try:
+            return item['s'], float(item['r']) * 100
+        except KeyError:
+            return self._extract_rate_slow(item)
+        except (ValueError, TypeError) as e:
+            self.logger.warning(f"费率提取失败: {e}")
+            return None, None
+
+    def _extract_rate_slow(self, item: Dict) -> tuple[Optional[str], Optional[float]]:
+        """备用键型的提取回退路径"""
+        try:
+            if 'symbol' in item and 'fundingRate' in item:
+                return item['symbol'], float(item['fundingRate']) * 100
+            if 'symbol' in item and 'funding_rate' in item:
+                return item['symbol'], float(item['funding_rate'])
+        except (ValueError, TypeError) as e:
+            self.logger.warning(f"费率提取失败: {e}")
+        return None, None
+
+    def _should_process_symbol(self, symbol: str) -> bool:
+        """判断是否应该处理该交易对（结果记忆化，热路径仅一次dict查找）"""
+        admitted = self._admit_cache.get(symbol)
+        if admitted is None:
+            admitted = symbol.endswith(self._suffix) and not (
+                self._exclude_re is not None and self._exclude_re.search(symbol)
+            )
+            self._admit_cache[symbol] = admitted
+        return admitted
+
+    def _sid(self, symbol: str) -> int:
+        """获取交易对的整型id，首次出现时驻留并按需扩容SoA数组"""
+        sid = self.symbol_ids.get(symbol)
+        if sid is not None:
+            return sid
+        sid = self._num_symbols
+        if sid >= self._capacity:
+            self._grow()
+        self.symbol_ids[symbol] = sid
+        self.symbol_names.append(symbol)
+        self._num_symbols = sid + 1
+        return sid
+
+    def _grow(self) -> None:
+        """按GROW_CHUNK步长扩容所有SoA数组（拷贝一次，此后继续零分配）"""
+        new_cap = self._capacity + self.GROW_CHUNK
+        window = self._buffers.shape[1]
+
+        buffers = np.empty((new_cap, window), dtype=np.float64)
+        buffers[:self._capacity] = self._buffers
+        meta_i = np.zeros((new_cap, 3), dtype=np.int64)
+        meta_i[:self._capacity] = self._meta_i
+        meta_f = np.zeros((new_cap, 2), dtype=np.float64)
+        meta_f[:self._capacity] = self._meta_f
+        champion_vol = np.zeros(new_cap, dtype=np.float64)
+        champion_vol[:self._capacity] = self._champion_vol
+        champion_ts = np.full(new_cap, -np.inf, dtype=np.float64)
+        champion_ts[:self._capacity] = self._champion_ts
+
+        self._buffers = buffers
+        self._meta_i = meta_i
+        self._meta_f = meta_f
+        self._champion_vol = champion_vol
+        self._champion_ts = champion_ts
+        # 其余零初始化的每交易对一维列统一扩容拷贝（遗漏任何一列都会
+        # 在第257个交易对入场时因IndexError废弃整批数据）
+        for name in ('_champion_z', '_champion_mean', '_champion_std',
+                     '_champion_old_rate', '_champion_new_rate',
+                     '_vol_ts', '_last_seen'):
+            column = np.zeros(new_cap, dtype=np.float64)
+            column[:self._capacity] = getattr(self, name)
+            setattr(self, name, column)
+        self._ids_range = np.arange(new_cap, dtype=np.int64)
+        self._int_work = np.empty((2, new_cap), dtype=np.int64)
+        self._f_work = np.empty((4, new_cap), dtype=np.float64)
+        self._capacity = new_cap
+        self.logger.debug(f"SoA数组扩容至 {new_cap} 个交易对")
+
+    def _update_champion(self, sid: int, symbol: str, old_rate: float, new_rate: float,
+                         z_score: float, moving_average: float, std_dev: float) -> None:
+        """
+        维护冠军记录与波动率数据 - 15分钟TTL冠军机制
+        Z-score及统计量由内核在写入时一并算出，这里只做记录维护；
+        max_volatility/timestamp同时写入镜像数组供排名向量化读取
+        """
+        try:
+            current_volatility = abs(z_score)
+
+            current_time = time.time()
+
+            # 过期（含从未加冕，ts=-inf）或打破纪录即成为新冠军；
+            # 过期后未被打破的旧值保留在数组中供展示，与排名的TTL判定解耦
+            expired = current_time - self._champion_ts[sid] > self.champion_ttl
+            if expired or current_volatility > self._champion_vol[sid]:
+                self._champion_vol[sid] = current_volatility
+                self._champion_z[sid] = z_score
+                self._champion_mean[sid] = moving_average
+                self._champion_std[sid] = std_dev
+                self._champion_old_rate[sid] = old_rate
+                self._champion_new_rate[sid] = new_rate
+                self._champion_ts[sid] = current_time
+                self.logger.info(f"🏆 {symbol} 创造新的Z-score纪录: {z_score:.4f}")
+
+            # 记录最近一次波动率更新时刻（供前端展示时间戳）
+            self._vol_ts[sid] = current_time
+
+        except Exception as e:
+            self.logger.error(f"更新 {symbol} 冠军记录时出错: {e}", exc_info=True)
+
+    def _update_statistics(self, processed_count: int) -> None:
+        """更新统计信息"""
+        self.total_symbols = len(self.symbol_ids)
+        self.data_update_count += 1
+        self.last_update_time = time.time()
+        
+        if self.data_update_count % config.STATS_PRINT_INTERVAL == 0:
+            self.logger.info(f"已处理 {self.data_update_count} 次更新, 当前监控 {self.total_symbols} 个交易对")
+
+    def _update_top5_ranking(self) -> None:
+        """
+        更新TOP5排行 - 智能动态排名系统（冠军TTL + 实时Z-score）
+
+        整个打分过程在SoA数组上一次向量化完成：所有交易对的实时Z-score
+        由滑动和批量导出，冠军TTL判定折叠为一次np.where掩码，不再逐
+        symbol做Python调用和dict查找
+        """
+        try:
+            n = self._num_symbols
+            if n == 0:
+                return
+
+            current_time = time.time()
+            window = self._buffers.shape[1]
+            meta_i = self._meta_i[:n]
+            meta_f = self._meta_f[:n]
+            counts = meta_i[:, 1]
+
+            # 工作区切片 - 所有中间量写入预分配缓冲，整趟打分零大块分配
+            cols = self._int_work[0, :n]
+            flat = self._int_work[1, :n]
+            latest = self._f_work[0, :n]
+            mean = self._f_work[1, :n]
+            std = self._f_work[2, :n]
+            scores = self._f_work[3, :n]
+
+            # 最新样本：扁平下标 sid*W + (head-1)%W 后一次np.take收集
+            np.subtract(meta_i[:, 0], 1, out=cols)
+            np.mod(cols, window, out=cols)
+            np.multiply(self._ids_range[:n], window, out=flat)
+            flat += cols
+            np.take(self._buffers.reshape(-1), flat, out=latest)
+
+            # 实时|Z-score|（scores槽先作临时量，最终即为得分向量）
+            hist_n = cols  # 复用整型工作区
+            np.subtract(counts, 1, out=hist_n)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                np.subtract(meta_f[:, 0], latest, out=mean)
+                np.divide(mean, hist_n, out=mean)
+                np.multiply(latest, latest, out=scores)
+                np.subtract(meta_f[:, 1], scores, out=scores)
+                np.multiply(mean, mean, out=std)
+                std *= hist_n
+                np.subtract(scores, std, out=scores)
+                hist_n -= 1
+                np.divide(scores, hist_n, out=scores)
+                np.maximum(scores, 0.0, out=scores)
+                np.sqrt(scores, out=std)
+                np.subtract(latest, mean, out=scores)
+                np.divide(scores, std, out=scores)
+                np.abs(scores, out=scores)
+            scores[(counts < 3) | (std < 1e-10)] = 0.0
+            np.nan_to_num(scores, copy=False)
+
+            # 冠军TTL仍有效则覆盖为冠军波动率，否则保留实时Z-score
+            champion_valid = (current_time - self._champion_ts[:n]) <= self.champion_ttl
+            np.copyto(scores, self._champion_vol[:n], where=champion_valid)
+
+            # TOP-K选择 - 部分选择代替全量argsort，O(N)+O(k·log k)
+            k = min(config.TOP_RANKING_COUNT, n)
+            top_idx = rank_top5(scores, k)
+
+            # 获取 TOP5（得分为0的不入榜）
+            names = self.symbol_names
+            new_top5 = []
+            for idx in top_idx:
+                if scores[idx] <= 0:
+                    break
+                new_top5.append(names[idx])
+
+            if new_top5 != self.top5_symbols:
+                self.top5_symbols = new_top5
+                self.logger.info(f"🏆 TOP5 排名更新: {self.top5_symbols}")
+
+        except Exception as e:
+            self.logger.error(f"更新TOP5排行时出错: {e}", exc_info=True)
+
+    def _calculate_current_zscore(self, symbol: str) -> float:
+        """为指定交易对实时计算当前的|Z-score|（委托_core内核）"""
+        sid = self.symbol_ids.get(symbol)
+        if sid is None:
+            return 0.0
+        return float(current_zscore(self._buffers[sid], self._meta_i[sid], self._meta_f[sid]))
+
+    def _champion_info_dict(self, sid: int) -> Dict:
+        """把指定id的冠军SoA字段物化为dict（仅供冷路径展示）"""
+        ts = float(self._champion_ts[sid])
+        if ts <= 0:
+            return {}
+        return {
+            'max_volatility': float(self._champion_vol[sid]),
+            'z_score': float(self._champion_z[sid]),
+            'moving_average': float(self._champion_mean[sid]),
+            'std_dev': float(self._champion_std[sid]),
+            'champion_old_rate': float(self._champion_old_rate[sid]),
+            'champion_new_rate': float(self._champion_new_rate[sid]),
+            'champion_timestamp': ts,
+            'champion_age_hours': (time.time() - ts) / 3600,
+        }
+
+    def _latest(self, sid: int) -> float:
+        """返回指定id最近一次写入的费率（环形缓冲区末端槽位）"""
+        meta = self._meta_i[sid]
+        if meta[1] == 0:
+            return 0.0
+        return float(self._buffers[sid, (int(meta[0]) - 1) % self._buffers.shape[1]])
+
+    def _history_array(self, sid: int) -> np.ndarray:
+        """按时间顺序导出环形缓冲区的有效样本（拷贝，仅供冷路径使用）"""
+        buf = self._buffers[sid]
+        head, count = int(self._meta_i[sid, 0]), int(self._meta_i[sid, 1])
+        if count < self.window_size:
+            return buf[:count].copy()
+        return np.concatenate((buf[head:], buf[:head]))
+    
+    def _cleanup_caches(self) -> None:
+        """定期清理不活跃的交易对以防止内存泄漏"""
+        try:
+            current_time = time.time()
+            inactive_threshold = 72 * 3600  # 72小时
+            
+            n = self._num_symbols
+            last_seen = self._last_seen[:n]
+            inactive_mask = (last_seen > 0) & (current_time - last_seen > inactive_threshold)
+            inactive_ids = np.nonzero(inactive_mask)[0]
+
+            if len(inactive_ids):
+                self.logger.info(f"清理 {len(inactive_ids)} 个不活跃交易对...")
+                for sid in inactive_ids:
+                    # 清理所有相关数据；SoA槽位清零后退役（不复用）
+                    symbol = self.symbol_names[sid]
+                    self.symbol_names[sid] = None
+                    self.symbol_ids.pop(symbol, None)
+                    self._total_history_points -= int(self._meta_i[sid, 1])
+                    self._meta_i[sid] = 0
+                    self._meta_f[sid] = 0.0
+                    self._champion_vol[sid] = 0.0
+                    self._champion_ts[sid] = -np.inf
+                    self._champion_z[sid] = 0.0
+                    self._champion_mean[sid] = 0.0
+                    self._champion_std[sid] = 0.0
+                    self._champion_old_rate[sid] = 0.0
+                    self._champion_new_rate[sid] = 0.0
+                    self._vol_ts[sid] = 0.0
+                    self._last_seen[sid] = 0.0
+
+                self.logger.info(f"成功清理 {len(inactive_ids)} 个不活跃交易对")
+            
+        except Exception as e:
+            self.logger.error(f"清理缓存时出错: {e}")
+    
+    def add_listener(self, callback) -> None:
+        """
+        注册TOP5数据变化监听器
+
+        Args:
+            callback: 无参回调，在排名线程上于版本号递增后调用，
+                回调方需自行保证线程安全
+        """
+        self._listeners.append(callback)
+
+    def get_top5_data(self) -> List[Dict]:
+        """获取TOP5数据用于前端展示（读取无锁快照，不阻塞写入路径）"""
+        return self._snapshot[0]
+
+    def _build_top5_data(self) -> List[Dict]:
+        """构建TOP5展示数据 - 仅由排名线程在锁内调用"""
+        top5_data = []
+
+        for symbol in self.top5_symbols:
+            sid = self.symbol_ids.get(symbol)
+            if sid is None or self._vol_ts[sid] <= 0:
+                continue
+
+            rate_change = float(
+                self._champion_new_rate[sid] - self._champion_old_rate[sid]
+            )
+
+            # 确定颜色类别与方向符号 - color_idx是与UI约定的稳定
+            # 小整数编码（0=涨红 1=跌绿 2=中性），UI侧凭下标查表取
+            # 样式，无需字符串比较；color_class保留给旧消费方
+            if rate_change > 0:
+                color_class = 'text-red-400'
+                color_idx = 0
+                sign_char = '+'
+            elif rate_change < 0:
+                color_class = 'text-green-400'
+                color_idx = 1
+                sign_char = '-'
+            else:
+                color_class = 'text-gray-400'
+                color_idx = 2
+                sign_char = ''
+
+            z_score = float(self._champion_z[sid])
+
+            top5_data.append({
+                'symbol': symbol,
+                # 展示字段在此一次性算好（每次排名仅5行），UI热路径
+                # 只做dict→label的纯拷贝，不再承担任何格式化运算
+                'display_symbol': symbol[:-4] if symbol.endswith('USDT') else symbol,
+                'volatility_text': f"{sign_char}{abs(z_score):.2f}",
+                'current_rate': float(self._champion_new_rate[sid]),
+                'rate_change': rate_change,
+                'volatility': float(self._champion_vol[sid]),
+                'z_score': z_score,
+                'moving_average': float(self._champion_mean[sid]),
+                'std_dev': float(self._champion_std[sid]),
+                'champion_badge': '',
+                'champion_time_display': self._format_champion_time(
+                    float(self._champion_ts[sid])
+                ),
+                'trend': 'unknown',  # 可以后续扩展趋势分析
+                'color_class': color_class,
+                'color_idx': color_idx,
+                'timestamp': float(self._vol_ts[sid]),
+            })
+
+        return top5_data
+
+    def get_statistics(self) -> Dict:
+        """获取统计信息（读取无锁快照，不阻塞写入路径）"""
+        return self._snapshot[1]
+
+    def _build_statistics(self) -> Dict:
+        """构建统计信息 - 仅由排名线程在锁内调用"""
+        try:
+            # 统计量全部由SoA数组向量化导出
+            n = self._num_symbols
+            active_series = len(self.symbol_ids)
+            total_history_points = self._total_history_points  # O(1)增量计数器
+            champion_count = int(np.count_nonzero(self._champion_ts[:n] > 0))
+            volatility_count = int(np.count_nonzero(self._vol_ts[:n] > 0))
+
+            return {
+                'total_symbols': active_series,
+                'data_updates': self.data_update_count,
+                'last_update': self.last_update_time,
+                'top5_count': len(self.top5_symbols),
+                'has_data': active_series > 0,
+                'volatility_data_count': volatility_count,
+                'history_total_points': total_history_points,
+                'champion_records_count': champion_count,
+                'cache_statistics': {
+                    'pandas_series_count': active_series,
+                    'avg_series_length': total_history_points / max(active_series, 1)
+                },
+                'quality_statistics': {
+                    'active_symbols': active_series,
+                    'champion_coverage': champion_count / max(active_series, 1)
+                },
+            }
+        except Exception as e:
+            self.logger.error(f"获取统计信息时出错: {e}")
+            return {'has_data': False, 'total_symbols': 0}
+
+    def get_last_update_age(self) -> Optional[float]:
+        """获取最后更新时间距离现在的秒数"""
+        if self.last_update_time is None:
+            return None
+        return time.time() - self.last_update_time
+
+    def get_champion_summary(self) -> Dict:
+        """获取冠军记录摘要"""
+        try:
+            with self.data_lock:
+                n = self._num_symbols
+                champion_ids = np.nonzero(self._champion_ts[:n] > 0)[0]
+                if len(champion_ids) == 0:
+                    return {'total_champions': 0, 'recent_champions': 0}
+
+                current_time = time.time()
+
+                # 直接在SoA数组上做掩码/归约，无需先物化中间列表
+                volatilities = self._champion_vol[champion_ids]
+                timestamps = self._champion_ts[champion_ids]
+
+                # 找到最高波动率的冠军
+                max_idx = np.argmax(volatilities)
+
+                # 计算近期冠军数量（15分钟内）
+                recent_mask = (current_time - timestamps) < 900  # 15分钟
+                recent_champions = np.sum(recent_mask)
+
+                return {
+                    'total_champions': len(champion_ids),
+                    'recent_champions': int(recent_champions),
+                    'max_volatility_champion': {
+                        'symbol': self.symbol_names[champion_ids[max_idx]],
+                        'volatility': float(volatilities[max_idx]),
+                        'age_hours': (current_time - timestamps[max_idx]) / 3600
+                    }
+                }
+                
+        except Exception as e:
+            self.logger.error(f"获取冠军摘要时出错: {e}", exc_info=True)
+            return {'total_champions': 0, 'recent_champions': 0}
+    
+    def _format_champion_time(self, timestamp: float) -> str:
+        """格式化时间显示（按秒记忆化，避免重复的datetime构造）"""
+        if timestamp <= 0:
+            return "未知"
+
+        try:
+            now = time.time()
+            now_s = int(now)
+            key = int(timestamp)
+            cached = self._time_fmt_cache.get(key)
+            if cached is not None and cached[0] == now_s:
+                return cached[1]
+
+            time_diff = now - timestamp
+            absolute_time = datetime.fromtimestamp(timestamp, tz=_CHINA_TZ).strftime("%H:%M:%S")
+
+            if time_diff < 1:
+                display = f"刚刚 ({absolute_time})"
+            elif time_diff < 60:
+                display = f"{int(time_diff)}秒前 ({absolute_time})"
+            elif time_diff < 3600:
+                display = f"{int(time_diff / 60)}分钟前 ({absolute_time})"
+            else:
+                display = f"{int(time_diff / 3600)}小时前 ({absolute_time})"
+
+            if len(self._time_fmt_cache) > 64:
+                self._time_fmt_cache.clear()
+            self._time_fmt_cache[key] = (now_s, display)
+            return display
+
+        except Exception as e:
+            self.logger.error(f"格式化时间时出错: {e}")
+            return "时间错误"
+
+    def get_symbol_analysis(self, symbol: str) -> Optional[Dict]:
+        """获取指定交易对的详细分析数据（新增功能）"""
+        try:
+            with self.data_lock:
+                sid = self.symbol_ids.get(symbol)
+                if sid is None or int(self._meta_i[sid, 1]) < 2:
+                    return None
+
+                # 冷路径：按需导入pandas（热路径已不依赖，启动也不再
+                # 支付pandas的数百毫秒初始化），构建临时Series复用其统计功能
+                import pandas as pd
+                history_series = pd.Series(self._history_array(sid), name=symbol)
+
+                # 使用 Pandas 的强大统计功能
+                analysis = {
+                    'symbol': symbol,
+                    'current_rate': self._latest(sid),
+                    'data_points': len(history_series),
+                    'statistics': {
+                        'mean': float(history_series.mean()),
+                        'std': float(history_series.std()),
+                        'min': float(history_series.min()),
+                        'max': float(history_series.max()),
+                        'median': float(history_series.median()),
+                    },
+                    'recent_trend': {
+                        'last_5_mean': float(history_series.tail(5).mean()) if len(history_series) >= 5 else None,
+                        'last_10_mean': float(history_series.tail(10).mean()) if len(history_series) >= 10 else None,
+                    },
+                    'champion_info': self._champion_info_dict(sid),
+                    'last_update': float(self._last_seen[sid])
+                }
+                
+                return analysis
+                
+        except Exception as e:
+            self.logger.error(f"获取 {symbol} 分析数据时出错: {e}")
             return None
\ No newline at end of file
@@ -79,6 +79,7 @@ class Config:
     LOG_FILE_PATH = "logs/app.log"  # 日志文件路径
     LOG_FILE_MAX_BYTES = 10 * 1024 * 1024  # 单个日志文件最大大小（10MB）
     LOG_FILE_BACKUP_COUNT = 5  # 保留的日志文件备份数量
+    LOG_ROTATION_MODE = "size"  # 轮转方式: "size"=按大小自轮转, "external"=交给logrotate等外部工具
     
     # ==================== 开发调试配置 ====================
     DEBUG_MODE = os.getenv("DEBUG", "False").lower() == "true"
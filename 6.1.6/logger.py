@@ -5,160 +5,399 @@
 提供统一的日志配置和管理功能，支持可配置的文件日志和全局异常捕获
 """
 
+import atexit
+import functools
 import logging
 import logging.handlers
+import queue
+import re
 import sys
 import os
+import threading
 from typing import Optional
 from config import config
 
+# 初始化完成后由Logger._setup_logging一次性填充的热路径状态。
+# 放在模块全局而非类属性上：LOAD_GLOBAL比LOAD_ATTR省去MRO解析，
+# get_logger及配置路径读取它们的成本更低
+_LEVEL = logging.INFO  # 解析后的日志级别
+_CONSOLE_HANDLER: Optional[logging.Handler] = None  # 共享控制台handler
+_FILE_HANDLER: Optional[logging.Handler] = None  # 共享文件侧handler
+
+
+# 模板中无修饰的%(field)s / %(field)d占位符
+_FMT_FIELD_RE = re.compile(r'%\((\w+)\)([sd])')
+
+
+def _specialize_formatter(formatter: logging.Formatter) -> None:
+    """
+    为固定模板生成专用的format方法
+
+    logging.Formatter.format每条记录都要走exc_info/stack_info/usesTime
+    的分支判断并经PercentStyle做%替换；格式串在启动后不再变化，据此
+    在初始化时生成一个直出f-string的函数绑定到该formatter实例上。
+    模板含未识别的%指令时保持原实现不变；带异常/堆栈信息的记录仍
+    回落到完整的Formatter.format
+    """
+    fmt = formatter._fmt or ''
+    parts = []
+    pos = 0
+    for match in _FMT_FIELD_RE.finditer(fmt):
+        literal = fmt[pos:match.start()]
+        if '%' in literal:
+            return
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        field = match.group(1)
+        if field == 'message':
+            parts.append('{record.getMessage()}')
+        elif field == 'asctime':
+            parts.append('{_format_time(record)}')
+        else:
+            parts.append('{record.%s}' % field)
+        pos = match.end()
+    tail = fmt[pos:]
+    if '%' in tail:
+        return
+    parts.append(tail.replace('{', '{{').replace('}', '}}'))
+
+    source = (
+        'def _fast_format(record):\n'
+        '    if record.exc_info or record.exc_text or record.stack_info:\n'
+        '        return _fallback(record)\n'
+        '    return f"""%s"""\n' % ''.join(parts)
+    )
+    namespace = {
+        '_fallback': lambda record: logging.Formatter.format(formatter, record),
+        '_format_time': lambda record: formatter.formatTime(
+            record, formatter.datefmt),
+    }
+    exec(compile(source, '<logger._specialize_formatter>', 'exec'), namespace)
+    formatter.format = namespace['_fast_format']
+
+
+class _FastCallerLogger(logging.Logger):
+    """
+    按需采集调用方信息的logger子类
+
+    findCaller需要逐帧回溯调用栈，是日志热路径上的主要开销之一；
+    只有当生效的格式串确实引用%(filename)/%(lineno)等字段时才执行，
+    否则直接返回占位值
+    """
+
+    _needs_caller = True  # 由Logger._setup_logging根据格式串设置
+
+    def findCaller(self, stack_info=False, stacklevel=1):
+        if self._needs_caller:
+            # +1跳过本方法自身的栈帧：它不在logging的_srcfile里，
+            # 否则逐帧回溯会停在这里、所有记录都归因到logger.py
+            return super().findCaller(stack_info, stacklevel + 1)
+        return "(unknown file)", 0, "(unknown function)", None
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """
+    按秒缓存asctime的格式化器
+
+    formatTime内部的localtime+strftime是单条记录格式化的主要成本，
+    而配置的日期格式精确到秒，同一秒内到达的记录可直接复用上次
+    结果。未显式给出datefmt时默认格式带毫秒，此时退回原始实现
+    """
+
+    def __init__(self, fmt=None, datefmt=None):
+        super().__init__(fmt, datefmt)
+        self._cacheable = bool(datefmt)
+        self._last_second = -1
+        self._last_asctime = ''
+
+    def formatTime(self, record, datefmt=None):
+        if not self._cacheable:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        if second != self._last_second:
+            self._last_asctime = super().formatTime(record, datefmt)
+            self._last_second = second
+        return self._last_asctime
+
+
+class _BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    聚合小写入的轮转文件处理器
+
+    RotatingFileHandler.emit对每条记录都执行一次write+flush，行级小
+    写入各付一次系统调用。这里先把格式化结果累积到内存缓冲，缓冲超过
+    FLUSH_BYTES或FLUSH_INTERVAL定时器到期时一次性写出，把大量小写入
+    合并为少数大块写入。轮转判断计入缓冲中尚未落盘的字节，轮转与关闭
+    前都会先冲刷缓冲；进程退出时通过atexit兜底冲刷
+
+    文件以二进制追加模式打开，在emit阶段直接编码为UTF-8字节，绕过
+    TextIOWrapper逐次write的编码与内部锁开销
+    """
+
+    FLUSH_BYTES = 64 * 1024  # 缓冲超过该字节数立即写出
+    FLUSH_INTERVAL = 0.1  # 定时冲刷间隔（秒）
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._buffer = []
+        self._buffer_len = 0
+        self._flush_timer = None
+        atexit.register(self.flush)
+
+    def _open(self):
+        """以二进制追加模式打开日志文件，编码在emit阶段完成"""
+        return open(self.baseFilename, 'ab')
+
+    def emit(self, record):
+        # Handler.handle已持有本handler的锁，这里无需再加锁
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            msg = (self.format(record) + self.terminator).encode('utf-8')
+            self._buffer.append(msg)
+            self._buffer_len += len(msg)
+            if self._buffer_len >= self.FLUSH_BYTES:
+                self._flush_buffer()
+            elif self._flush_timer is None:
+                timer = threading.Timer(self.FLUSH_INTERVAL, self.flush)
+                timer.daemon = True
+                self._flush_timer = timer
+                timer.start()
+        except Exception:
+            self.handleError(record)
+
+    def shouldRollover(self, record):
+        """轮转判断需把缓冲中待写字节一并计入文件大小"""
+        if self.maxBytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        msg = self.format(record).encode('utf-8')
+        return (self.stream.tell() + self._buffer_len + len(msg) + 1
+                >= self.maxBytes)
+
+    def doRollover(self):
+        self._flush_buffer()
+        super().doRollover()
+
+    def flush(self):
+        self.acquire()
+        try:
+            self._flush_buffer()
+            if self.stream is not None:
+                super().flush()
+        finally:
+            self.release()
+
+    def close(self):
+        self.acquire()
+        try:
+            self._flush_buffer()
+        finally:
+            self.release()
+        super().close()
+
+    def _flush_buffer(self):
+        """把缓冲内容一次写出（调用方需持有handler锁）"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if self._buffer:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(b''.join(self._buffer))
+            self._buffer.clear()
+            self._buffer_len = 0
+
+
 class Logger:
     """生产级日志管理器"""
     
-    _loggers = {}  # 存储已创建的logger实例
+    # 文件日志使用的详细格式
+    _FILE_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
+
     _initialized = False  # 标记是否已初始化
     _exception_hook_installed = False  # 标记是否已安装异常钩子
-    
+    _queue_listener = None  # 后台写盘线程（QueueListener）
+    _config_lock = threading.Lock()  # 保护logger的一次性配置
+
     @classmethod
     def get_logger(cls, name: str) -> logging.Logger:
         """
         获取指定名称的logger实例
-        
+
+        logging.getLogger内部已按名称缓存logger实例，这里不再额外维护
+        缓存字典；handler统一挂在根logger上，按名称的logger无需逐个配置
+
         Args:
             name: logger名称，通常使用模块名
-            
+
         Returns:
             配置好的logger实例
         """
         if not cls._initialized:
-            cls._setup_logging()
-            cls._initialized = True
-            
-        if name not in cls._loggers:
-            cls._loggers[name] = cls._create_logger(name)
-        return cls._loggers[name]
+            with cls._config_lock:
+                if not cls._initialized:
+                    cls._setup_logging()
+                    cls._initialized = True
+                    # 初始化只发生一次，此后把入口原子地换成无检查的
+                    # 快路径，后续调用不再付初始化判断的开销
+                    cls.get_logger = cls._get_logger_fast
+
+        return logging.getLogger(name)
+
+    _get_logger_fast = staticmethod(logging.getLogger)  # 初始化后的快路径
     
     @classmethod
     def _setup_logging(cls):
-        """设置全局日志配置"""
+        """设置全局日志配置：解析级别、构建共享handler并安装异常钩子"""
+        global _LEVEL, _CONSOLE_HANDLER, _FILE_HANDLER
+
+        # LogRecord构造默认每条都采集线程/进程信息；格式串未引用
+        # 这些字段时关闭采集，省去每条记录的三次系统调用
+        used_fields = config.LOG_FORMAT + cls._FILE_LOG_FORMAT
+        if '%(thread' not in used_fields:
+            logging.logThreads = False
+        if '%(process' not in used_fields:
+            logging.logProcesses = False
+            logging.logMultiprocessing = False
+
+        # 只有生效的格式串引用了调用方字段才值得走findCaller的帧遍历；
+        # setLoggerClass必须先于任何getLogger调用
+        active_formats = config.LOG_FORMAT
+        if config.LOG_TO_FILE:
+            active_formats += cls._FILE_LOG_FORMAT
+        _FastCallerLogger._needs_caller = any(
+            field in active_formats
+            for field in ('%(pathname', '%(filename', '%(module',
+                          '%(lineno', '%(funcName')
+        )
+        logging.setLoggerClass(_FastCallerLogger)
+
+        # 级别与格式只和配置字符串有关，解析一次后所有logger共享
+        level_name = config.LOG_LEVEL.upper()
+        try:
+            _LEVEL = logging._nameToLevel[level_name]
+        except (AttributeError, KeyError):
+            _LEVEL = getattr(logging, level_name)
+        formatter = _CachedTimeFormatter(
+            config.LOG_FORMAT,
+            datefmt=config.LOG_DATE_FORMAT
+        )
+
+        # 共享的控制台handler（logging内部锁保证多logger共用是线程安全的）
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(_LEVEL)
+        console_handler.setFormatter(formatter)
+        _specialize_formatter(formatter)
+        _CONSOLE_HANDLER = console_handler
+
+        # 共享的文件handler：调用线程只入队，真正的RotatingFileHandler
+        # 由QueueListener线程持有，磁盘写入不再阻塞业务线程
+        if config.LOG_TO_FILE:
+            rotating_handler = cls._create_file_handler()
+            if rotating_handler is not None:
+                log_queue = queue.SimpleQueue()
+                queue_handler = logging.handlers.QueueHandler(log_queue)
+                queue_handler.setLevel(_LEVEL)
+                _FILE_HANDLER = queue_handler
+                cls._queue_listener = logging.handlers.QueueListener(
+                    log_queue, rotating_handler, respect_handler_level=True
+                )
+                cls._queue_listener.start()
+                atexit.register(cls._stop_queue_listener)
+
+        # 共享handler只挂在根logger上，子logger保持默认的propagate，
+        # 每条记录只经过一次handler分发，而不是N个logger各挂一份
+        root = logging.getLogger()
+        root.setLevel(_LEVEL)
+        root.addHandler(_CONSOLE_HANDLER)
+        if _FILE_HANDLER is not None:
+            root.addHandler(_FILE_HANDLER)
+
         # 安装全局异常钩子（仅安装一次）
         if not cls._exception_hook_installed:
             cls._install_exception_hook()
             cls._exception_hook_installed = True
-    
+
+    @classmethod
+    def _stop_queue_listener(cls):
+        """停止后台写盘线程并冲刷剩余日志（可安全重复调用）"""
+        listener = cls._queue_listener
+        if listener is not None and listener._thread is not None:
+            listener.stop()
+
+    _original_excepthook = None  # 被替换前的sys.excepthook
+
     @classmethod
     def _install_exception_hook(cls):
         """安装全局异常钩子，捕获所有未处理的异常"""
-        original_excepthook = sys.excepthook
-        
-        def exception_handler(exc_type, exc_value, exc_traceback):
-            """全局异常处理器"""
-            # 获取根logger来记录致命错误
-            root_logger = logging.getLogger('FATAL_ERROR')
-            
-            # 确保根logger有基本的控制台处理器
-            if not root_logger.handlers:
-                console_handler = logging.StreamHandler(sys.stderr)
-                console_handler.setLevel(logging.ERROR)
-                formatter = logging.Formatter(
-                    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                    datefmt='%Y-%m-%d %H:%M:%S'
-                )
-                console_handler.setFormatter(formatter)
-                root_logger.addHandler(console_handler)
-                
-                # 如果启用了文件日志，也添加文件处理器
-                if config.LOG_TO_FILE:
-                    file_handler = cls._create_file_handler()
-                    if file_handler:
-                        root_logger.addHandler(file_handler)
-                
-                root_logger.setLevel(logging.ERROR)
-                root_logger.propagate = False
-            
-            # 记录致命错误
-            root_logger.critical(
-                f"未捕获的异常导致程序崩溃: {exc_type.__name__}: {exc_value}",
-                exc_info=(exc_type, exc_value, exc_traceback)
-            )
-            
-            # 调用原始的异常处理器
-            original_excepthook(exc_type, exc_value, exc_traceback)
-        
-        sys.excepthook = exception_handler
-    
+        cls._original_excepthook = sys.excepthook
+        sys.excepthook = cls._exception_handler
+
     @classmethod
-    def _create_logger(cls, name: str) -> logging.Logger:
-        """
-        创建新的logger实例
-        
-        Args:
-            name: logger名称
-            
-        Returns:
-            配置好的logger实例
-        """
-        logger = logging.getLogger(name)
-        logger.setLevel(getattr(logging, config.LOG_LEVEL.upper()))
-        
-        # 避免重复添加handler
-        if not logger.handlers:
-            # 创建控制台handler
-            console_handler = logging.StreamHandler(sys.stdout)
-            console_handler.setLevel(getattr(logging, config.LOG_LEVEL.upper()))
-            
-            # 创建格式化器
-            formatter = logging.Formatter(
-                config.LOG_FORMAT,
-                datefmt=config.LOG_DATE_FORMAT
-            )
-            console_handler.setFormatter(formatter)
-            
-            # 添加控制台handler到logger
-            logger.addHandler(console_handler)
-            
-            # 如果启用了文件日志，添加文件handler
-            if config.LOG_TO_FILE:
-                file_handler = cls._create_file_handler()
-                if file_handler:
-                    logger.addHandler(file_handler)
-            
-            # 防止日志向上传播（避免重复输出）
-            logger.propagate = False
-        
-        return logger
+    def _exception_handler(cls, exc_type, exc_value, exc_traceback):
+        """全局异常处理器（绑定方法，避免闭包自由变量链）"""
+        # 命名logger沿propagate走到根logger的共享handler，
+        # 崩溃路径无需任何handler搭建
+        root_logger = logging.getLogger('FATAL_ERROR')
+
+        # 记录致命错误（%s惰性参数：格式化推迟到handler真正接受记录时，
+        # 文件侧由QueueListener线程完成，崩溃线程只做入队）
+        root_logger.critical(
+            "未捕获的异常导致程序崩溃: %s: %s",
+            exc_type.__name__, exc_value,
+            exc_info=(exc_type, exc_value, exc_traceback)
+        )
+
+        # 调用原始的异常处理器
+        cls._original_excepthook(exc_type, exc_value, exc_traceback)
     
     @classmethod
-    def _create_file_handler(cls) -> Optional[logging.handlers.RotatingFileHandler]:
+    @functools.cache
+    def _create_file_handler(cls) -> Optional[logging.Handler]:
         """
-        创建文件日志处理器
-        
+        创建文件日志处理器（一次性缓存，重复调用返回同一实例）
+
         Returns:
             配置好的RotatingFileHandler实例，如果创建失败则返回None
         """
         try:
-            # 确保日志目录存在
+            # 确保日志目录存在（exist_ok已覆盖"已存在"场景，无需先stat）
             log_dir = os.path.dirname(config.LOG_FILE_PATH)
-            if log_dir and not os.path.exists(log_dir):
+            if log_dir:
                 os.makedirs(log_dir, exist_ok=True)
             
-            # 创建RotatingFileHandler
-            file_handler = logging.handlers.RotatingFileHandler(
-                filename=config.LOG_FILE_PATH,
-                maxBytes=config.LOG_FILE_MAX_BYTES,
-                backupCount=config.LOG_FILE_BACKUP_COUNT,
-                encoding='utf-8'
-            )
+            # "external"模式把轮转交给logrotate等外部工具：
+            # WatchedFileHandler只在inode变化时重开文件，省去每条记录的
+            # 大小检查；默认"size"模式仍由带写入聚合的handler自轮转
+            rotation_mode = getattr(config, 'LOG_ROTATION_MODE', 'size')
+            # delay=True：文件描述符推迟到第一条记录真正落盘时才打开，
+            # 不产生任何日志的运行不碰文件系统
+            if rotation_mode == 'external':
+                file_handler = logging.handlers.WatchedFileHandler(
+                    config.LOG_FILE_PATH,
+                    encoding='utf-8',
+                    delay=True
+                )
+            else:
+                file_handler = _BufferedRotatingFileHandler(
+                    filename=config.LOG_FILE_PATH,
+                    maxBytes=config.LOG_FILE_MAX_BYTES,
+                    backupCount=config.LOG_FILE_BACKUP_COUNT,
+                    encoding='utf-8',
+                    delay=True
+                )
             
-            # 设置文件handler的级别和格式
-            file_handler.setLevel(getattr(logging, config.LOG_LEVEL.upper()))
+            # 设置文件handler的级别和格式（级别已在_setup_logging解析）
+            file_handler.setLevel(_LEVEL)
             
             # 为文件日志使用更详细的格式
-            file_formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
+            file_formatter = _CachedTimeFormatter(
+                cls._FILE_LOG_FORMAT,
                 datefmt=config.LOG_DATE_FORMAT
             )
             file_handler.setFormatter(file_formatter)
+            _specialize_formatter(file_formatter)
             
             return file_handler
             
@@ -167,24 +406,30 @@ class Logger:
             print(f"警告: 无法创建文件日志处理器: {e}", file=sys.stderr)
             return None
 
+# 按名称记忆化的获取路径：lru_cache的C实现查找比手写dict/getLogger
+# 的manager查找都快；首次未命中时由Logger.get_logger完成初始化与配置
+@functools.lru_cache(maxsize=None)
+def _cached_get_logger(name: str) -> logging.Logger:
+    return Logger.get_logger(name)
+
+
 # 便捷函数：获取当前模块的logger
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """
     获取logger实例的便捷函数
-    
+
     Args:
         name: logger名称，如果为None则使用调用者的模块名
-        
+
     Returns:
         logger实例
     """
     if name is None:
-        # 获取调用者的模块名
-        import inspect
-        frame = inspect.currentframe().f_back
-        name = frame.f_globals.get('__name__', 'unknown')
-    
-    return Logger.get_logger(name)
+        # 获取调用者的模块名；sys._getframe只取帧对象本身，
+        # 比inspect.currentframe省去filename/源码行等附属机制
+        name = sys._getframe(1).f_globals.get('__name__', 'unknown')
+
+    return _cached_get_logger(name)
 
 # 测试代码
 if __name__ == "__main__":
@@ -1,893 +1,1228 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-币安资金费率波动TOP5监控工具 - 主程序入口
-整合所有模块，提供统一的程序启动和管理功能
-
-主要功能:
-1. 环境检测和依赖管理
-2. 模块初始化和协调
-3. 程序生命周期管理
-4. 异常处理和资源清理
-"""
-
-import subprocess
-import sys
-import importlib
-import time
-import signal
-import atexit
-import socket
-import asyncio
-from pathlib import Path
-from typing import Optional, List, Tuple
-
-# 导入NiceGUI
-from nicegui import ui
-
-# 设置Windows控制台编码，避免中文乱码
-if sys.platform.startswith('win'):
-    try:
-        # 只设置Python的输出编码，不执行系统命令
-        if hasattr(sys.stdout, 'reconfigure'):
-            sys.stdout.reconfigure(encoding='utf-8', errors='ignore')
-        if hasattr(sys.stderr, 'reconfigure'):
-            sys.stderr.reconfigure(encoding='utf-8', errors='ignore')
-    except:
-        pass  # 如果设置失败，继续运行
-
-
-class PortManager:
-    """
-    智能端口管理器
-    基于Context7 Python socket最佳实践实现
-    
-    主要功能:
-    1. 智能端口可用性检测
-    2. 自动寻找可用端口
-    3. 端口冲突解决
-    4. 端口占用进程识别
-    """
-    
-    def __init__(self):
-        """初始化端口管理器"""
-        self.logger = None
-        try:
-            from logger import get_logger
-            self.logger = get_logger(__name__)
-        except:
-            # 如果logger模块不可用，使用print作为备选
-            pass
-        
-    def _log_info(self, message: str):
-        """内部日志方法"""
-        if self.logger:
-            self.logger.info(message)
-        else:
-            print(f"[INFO] {message}")
-    
-    def _log_debug(self, message: str):
-        """内部调试日志方法"""
-        if self.logger:
-            self.logger.debug(message)
-    
-    def _log_warning(self, message: str):
-        """内部警告日志方法"""
-        if self.logger:
-            self.logger.warning(message)
-        else:
-            print(f"[WARNING] {message}")
-    
-    def _log_error(self, message: str):
-        """内部错误日志方法"""
-        if self.logger:
-            self.logger.error(message)
-        else:
-            print(f"[ERROR] {message}")
-        
-    def is_port_available(self, host: str, port: int) -> bool:
-        """
-        检查指定端口是否可用
-        基于Context7 socket.bind()最佳实践
-        
-        Args:
-            host: 主机地址
-            port: 端口号
-            
-        Returns:
-            bool: 端口是否可用
-        """
-        try:
-            # 基于Context7最佳实践：使用临时socket测试端口可用性
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as test_socket:
-                # 设置SO_REUSEADDR避免TIME_WAIT状态影响
-                test_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-                
-                # 尝试绑定端口
-                test_socket.bind((host, port))
-                return True
-                
-        except OSError as e:
-            # 端口被占用或其他网络错误
-            self._log_debug(f"端口 {host}:{port} 不可用: {e}")
-            return False
-        except Exception as e:
-            self._log_error(f"检查端口可用性时发生错误: {e}")
-            return False
-    
-    def find_available_port(self, host: str, preferred_port: int, 
-                          port_range: int = 100) -> Optional[int]:
-        """
-        智能寻找可用端口
-        基于Context7 find_unused_port最佳实践
-        
-        Args:
-            host: 主机地址
-            preferred_port: 首选端口
-            port_range: 搜索范围
-            
-        Returns:
-            Optional[int]: 可用端口号，如果找不到则返回None
-        """
-        try:
-            # 首先检查首选端口
-            if self.is_port_available(host, preferred_port):
-                self._log_info(f"✅ 首选端口 {preferred_port} 可用")
-                return preferred_port
-            
-            self._log_warning(f"⚠️  端口{preferred_port}被占用，正在寻找替代端口...")
-            
-            # 搜索可用端口
-            for offset in range(1, port_range + 1):
-                candidate_port = preferred_port + offset
-                
-                # 跳过系统保留端口和常用端口
-                if self._is_reserved_port(candidate_port):
-                    continue
-                
-                if self.is_port_available(host, candidate_port):
-                    self._log_info(f"✅ 找到可用端口: {candidate_port}")
-                    return candidate_port
-            
-            # 如果向上搜索失败，尝试向下搜索
-            for offset in range(1, min(preferred_port - 1024, port_range) + 1):
-                candidate_port = preferred_port - offset
-                
-                if candidate_port < 1024:  # 避免系统端口
-                    break
-                    
-                if self._is_reserved_port(candidate_port):
-                    continue
-                
-                if self.is_port_available(host, candidate_port):
-                    self._log_info(f"✅ 找到可用端口: {candidate_port}")
-                    return candidate_port
-            
-            self._log_error(f"❌ 在范围内未找到可用端口 (基准: {preferred_port}, 范围: ±{port_range})")
-            return None
-            
-        except Exception as e:
-            self._log_error(f"寻找可用端口时发生错误: {e}")
-            return None
-    
-    def _is_reserved_port(self, port: int) -> bool:
-        """
-        检查是否为保留端口
-        
-        Args:
-            port: 端口号
-            
-        Returns:
-            bool: 是否为保留端口
-        """
-        # 系统保留端口
-        if port < 1024:
-            return True
-        
-        # 常用服务端口，避免冲突
-        reserved_ports = {
-            3306,   # MySQL
-            5432,   # PostgreSQL
-            6379,   # Redis
-            27017,  # MongoDB
-            9200,   # Elasticsearch
-            5672,   # RabbitMQ
-            8000,   # 常用开发端口
-            8888,   # Jupyter
-            9000,   # 常用开发端口
-        }
-        
-        return port in reserved_ports
-    
-    def get_port_info(self, port: int) -> List[str]:
-        """
-        获取端口占用信息
-        
-        Args:
-            port: 端口号
-            
-        Returns:
-            List[str]: 占用进程信息列表
-        """
-        try:
-            if sys.platform.startswith('win'):
-                return self._get_port_info_windows(port)
-            else:
-                return self._get_port_info_unix(port)
-        except Exception as e:
-            self._log_error(f"获取端口信息时发生错误: {e}")
-            return [f"无法获取端口信息: {e}"]
-    
-    def _get_port_info_windows(self, port: int) -> List[str]:
-        """
-        获取Windows系统端口占用信息
-        
-        Args:
-            port: 端口号
-            
-        Returns:
-            List[str]: 占用进程信息列表
-        """
-        try:
-            # 使用netstat命令查找端口占用
-            result = subprocess.run(
-                ['netstat', '-ano', '-p', 'tcp'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode != 0:
-                return ["无法执行netstat命令"]
-            
-            port_info = []
-            for line in result.stdout.split('\n'):
-                if f':{port}' in line and 'LISTENING' in line:
-                    parts = line.split()
-                    if len(parts) >= 5:
-                        pid = parts[-1]
-                        try:
-                            # 获取进程名称
-                            tasklist_result = subprocess.run(
-                                ['tasklist', '/FI', f'PID eq {pid}', '/FO', 'CSV'],
-                                capture_output=True,
-                                text=True,
-                                timeout=5
-                            )
-                            
-                            if tasklist_result.returncode == 0:
-                                lines = tasklist_result.stdout.strip().split('\n')
-                                if len(lines) > 1:
-                                    # 解析CSV格式的输出
-                                    process_line = lines[1].replace('"', '').split(',')
-                                    if len(process_line) >= 2:
-                                        process_name = process_line[0]
-                                        port_info.append(f"{process_name} (PID: {pid})")
-                                    else:
-                                        port_info.append(f"进程 PID: {pid}")
-                                else:
-                                    port_info.append(f"进程 PID: {pid}")
-                            else:
-                                port_info.append(f"进程 PID: {pid}")
-                                
-                        except subprocess.TimeoutExpired:
-                            port_info.append(f"进程 PID: {pid} (查询超时)")
-                        except Exception:
-                            port_info.append(f"进程 PID: {pid}")
-            
-            return port_info if port_info else ["端口未被占用"]
-            
-        except subprocess.TimeoutExpired:
-            return ["查询端口信息超时"]
-        except Exception as e:
-            return [f"查询失败: {e}"]
-    
-    def _get_port_info_unix(self, port: int) -> List[str]:
-        """
-        获取Unix/Linux系统端口占用信息
-        
-        Args:
-            port: 端口号
-            
-        Returns:
-            List[str]: 占用进程信息列表
-        """
-        try:
-            # 使用lsof命令查找端口占用
-            result = subprocess.run(
-                ['lsof', '-i', f':{port}'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode != 0:
-                return ["端口未被占用或无法查询"]
-            
-            port_info = []
-            for line in result.stdout.split('\n')[1:]:  # 跳过标题行
-                if line.strip():
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        process_name = parts[0]
-                        pid = parts[1]
-                        port_info.append(f"{process_name} (PID: {pid})")
-            
-            return port_info if port_info else ["端口未被占用"]
-            
-        except subprocess.TimeoutExpired:
-            return ["查询端口信息超时"]
-        except FileNotFoundError:
-            # lsof命令不存在，尝试使用netstat
-            try:
-                result = subprocess.run(
-                    ['netstat', '-tlnp'],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                port_info = []
-                for line in result.stdout.split('\n'):
-                    if f':{port}' in line:
-                        port_info.append(line.strip())
-                
-                return port_info if port_info else ["端口未被占用"]
-                
-            except Exception:
-                return ["无法查询端口信息"]
-        except Exception as e:
-            return [f"查询失败: {e}"]
-    
-    def find_unused_port_ephemeral(self, host: str = 'localhost') -> int:
-        """
-        使用系统临时端口机制寻找可用端口
-        基于Context7 find_unused_port最佳实践
-        
-        Args:
-            host: 主机地址
-            
-        Returns:
-            int: 可用的临时端口号
-        """
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                # 绑定到端口0，让系统自动分配可用端口
-                s.bind((host, 0))
-                # 获取系统分配的端口号
-                _, port = s.getsockname()
-                self._log_debug(f"系统分配的临时端口: {port}")
-                return port
-                
-        except Exception as e:
-            self._log_error(f"获取临时端口失败: {e}")
-            # 回退到默认端口范围
-            return self.find_available_port(host, 8080, 100) or 8080
-    
-    def check_port_with_details(self, host: str, port: int) -> Tuple[bool, List[str]]:
-        """
-        详细检查端口状态
-        
-        Args:
-            host: 主机地址
-            port: 端口号
-            
-        Returns:
-            Tuple[bool, List[str]]: (是否可用, 详细信息列表)
-        """
-        is_available = self.is_port_available(host, port)
-        
-        if is_available:
-            return True, [f"✅ 端口 {host}:{port} 可用"]
-        else:
-            port_info = self.get_port_info(port)
-            details = [f"❌ 端口 {host}:{port} 被占用:"]
-            details.extend([f"   - {info}" for info in port_info])
-            return False, details
-
-class ApplicationManager:
-    """
-    应用程序管理器 - 负责整个应用的生命周期管理
-    
-    职责:
-    - 环境检测和依赖安装
-    - 模块初始化和协调
-    - 程序启动和停止
-    - 异常处理和资源清理
-    """
-    
-    def __init__(self):
-        """初始化应用管理器"""
-        # 核心组件实例
-        self.analyzer: Optional[object] = None
-        self.ws_client: Optional[object] = None
-        self.ui_manager: Optional[object] = None
-        
-        # 运行状态
-        self.is_running: bool = False
-        self.start_time: Optional[float] = None
-        
-        # 注册清理函数
-        atexit.register(self.cleanup)
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
-    
-    def check_and_install_dependencies(self) -> bool:
-        """
-        检查并自动安装所需依赖包
-        基于Context7最佳实践，从requirements.txt读取依赖
-        
-        Returns:
-            bool: 依赖检查是否成功
-        """
-        print("正在检查依赖包...")
-        
-        try:
-            # 包名到模块名的映射表 - 解决"身份证名"与"常用名"不一致的问题
-            PACKAGE_TO_MODULE_MAP = {
-                'websocket-client': 'websocket',
-                'Pillow': 'PIL',
-                'beautifulsoup4': 'bs4',
-                'PyYAML': 'yaml',
-                'python-dateutil': 'dateutil',
-            }
-            
-            # 基于Context7最佳实践：从requirements.txt读取依赖
-            requirements_file = Path(__file__).parent / 'requirements.txt'
-            required_packages = self._parse_requirements_file(requirements_file)
-            
-            if not required_packages:
-                print("[警告] 未找到requirements.txt或文件为空，使用默认依赖列表")
-                # 回退到硬编码依赖列表
-                required_packages = {
-                    'nicegui': 'nicegui>=1.4.0',
-                    'websockets': 'websockets>=11.0',
-                }
-            
-            # 内置库（无需安装）
-            builtin_modules = ['asyncio', 'json', 'threading', 'time', 'typing']
-            
-            # 检查并安装第三方包
-            for package, version_spec in required_packages.items():
-                # 使用映射表获取正确的模块名
-                module_name = PACKAGE_TO_MODULE_MAP.get(package, package)
-                
-                try:
-                    importlib.import_module(module_name)
-                    print(f"[✓] {package} 已安装")
-                except ImportError:
-                    print(f"[!] 正在安装 {package}...")
-                    try:
-                        subprocess.check_call([
-                            sys.executable, '-m', 'pip', 'install', 
-                            version_spec, '--quiet'
-                        ])
-                        print(f"[✓] {package} 安装成功")
-                    except subprocess.CalledProcessError as e:
-                        print(f"[✗] {package} 安装失败: {e}")
-                        return False
-            
-            # 检查内置库
-            for module in builtin_modules:
-                try:
-                    importlib.import_module(module)
-                except ImportError as e:
-                    print(f"[✗] 内置模块 {module} 不可用: {e}")
-                    return False
-            
-            print("所有依赖包检查完成！")
-            return True
-            
-        except Exception as e:
-            print(f"依赖检查过程中发生错误: {e}")
-            return False
-    
-    def _parse_requirements_file(self, requirements_path: Path) -> dict:
-        """
-        解析requirements.txt文件
-        基于Context7最佳实践实现
-        
-        Args:
-            requirements_path: requirements.txt文件路径
-            
-        Returns:
-            dict: 包名到版本规范的映射
-        """
-        requirements = {}
-        
-        try:
-            if not requirements_path.exists():
-                return requirements
-            
-            with open(requirements_path, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    # 去除空白字符
-                    line = line.strip()
-                    
-                    # 跳过空行和注释行
-                    if not line or line.startswith('#'):
-                        continue
-                    
-                    # 解析包规范
-                    try:
-                        # 基本格式：package>=version 或 package==version
-                        if '>=' in line:
-                            package, version = line.split('>=', 1)
-                            package = package.strip()
-                            version = version.strip()
-                            requirements[package] = f"{package}>={version}"
-                        elif '==' in line:
-                            package, version = line.split('==', 1)
-                            package = package.strip()
-                            version = version.strip()
-                            requirements[package] = f"{package}=={version}"
-                        elif '>' in line:
-                            package, version = line.split('>', 1)
-                            package = package.strip()
-                            version = version.strip()
-                            requirements[package] = f"{package}>{version}"
-                        else:
-                            # 没有版本规范，使用包名
-                            package = line.strip()
-                            requirements[package] = package
-                            
-                    except ValueError as e:
-                        print(f"[警告] requirements.txt 第{line_num}行格式错误: {line}")
-                        continue
-            
-            return requirements
-            
-        except Exception as e:
-            print(f"[错误] 解析requirements.txt失败: {e}")
-            return {}
-    
-    def initialize_components(self) -> bool:
-        """
-        初始化所有核心组件
-        
-        Returns:
-            bool: 初始化是否成功
-        """
-        try:
-            print("初始化核心组件...")
-            
-            # 导入配置和日志模块
-            from config import config
-            from logger import get_logger
-            
-            # 获取主程序logger
-            logger = get_logger(__name__)
-            logger.info("开始初始化应用组件")
-            
-            # 1. 初始化业务核心分析器
-            print("创建资金费率分析器...")
-            from business_core import BusinessCore
-            self.analyzer = BusinessCore()
-            logger.info("资金费率分析器初始化完成")
-            
-            # 2. 初始化WebSocket客户端
-            print("创建WebSocket客户端...")
-            from binance_client import BinanceWebSocketClient
-            # 传入正确的数据处理方法而不是整个对象
-            # 创建WebSocket客户端，传递正确的参数
-            self.ws_client = BinanceWebSocketClient(
-                stream_path="/ws/!markPrice@arr@1s",
-                data_handler=self.analyzer.update_data
-            )
-            logger.info("WebSocket客户端初始化完成")
-            
-            # 3. 初始化UI管理器
-            print("创建UI管理器...")
-            from ui_manager import UIManager
-            self.ui_manager = UIManager(self.analyzer, self.ws_client)
-            logger.info("UI管理器初始化完成")
-            
-            logger.info("所有核心组件初始化成功")
-            return True
-            
-        except ImportError as e:
-            print(f"[✗] 导入模块失败: {e}")
-            print("请确保所有必需的模块文件存在：config.py, logger.py, business_core.py, binance_client.py, ui_manager.py")
-            return False
-        except Exception as e:
-            print(f"[✗] 初始化组件时发生错误: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
-    
-    def start_services(self) -> bool:
-        """
-        启动所有服务
-        
-        Returns:
-            bool: 启动是否成功
-        """
-        try:
-            from logger import get_logger
-            logger = get_logger(__name__)
-            
-            print("启动应用服务...")
-            
-            # 1. 启动数据分析器（关键修复：启动排名更新线程）
-            print("启动数据分析器...")
-            self.analyzer.start()
-            logger.info("✅ 数据分析器已启动")
-            
-            # 2. 创建Web界面（先启动NiceGUI以建立事件循环）
-            print("创建Web界面...")
-            self.ui_manager.create_interface()
-            logger.info("✅ Web界面创建完成")
-            
-            # 3. 在NiceGUI的事件循环中启动WebSocket连接
-            print("准备连接币安WebSocket...")
-            # WebSocket将在NiceGUI启动后的事件循环中启动
-            
-            self.is_running = True
-            self.start_time = time.time()
-            
-            print("程序启动成功！")
-            print("浏览器将自动打开监控界面")
-            print("如果浏览器未自动打开，请手动访问: http://localhost:8080")
-            print()
-            print("💡 使用提示:")
-            print("   - 保持此窗口打开，关闭窗口将停止程序")
-            print("   - 按 Ctrl+C 可安全退出程序")
-            print("   - 程序会自动连接币安API并实时更新数据")
-            print()
-            
-            return True
-            
-        except Exception as e:
-            print(f"[✗] 启动服务时发生错误: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
-    
-    def run_application(self, port: Optional[int] = None) -> None:
-        """
-        运行主应用程序 - 集成智能端口管理
-        
-        Args:
-            port: 可选的端口号，如果不指定则使用配置文件中的端口
-        """
-        try:
-            from config import config
-            from logger import get_logger
-            
-            logger = get_logger(__name__)
-            
-            # 检测调试模式
-            debug_mode = self._is_debug_mode()
-            if debug_mode:
-                print("🔧 调试模式: 可在编辑器中直接运行和调试")
-                print("💡 提示: 可以在关键代码位置设置断点进行调试")
-                print("-" * 50)
-            
-            # 创建端口管理器实例
-            port_manager = PortManager()
-            
-            # 智能端口管理
-            preferred_port = port if port is not None else config.UI_PORT
-            
-            print(f"🔍 检查端口可用性...")
-            available, details = port_manager.check_port_with_details(config.UI_HOST, preferred_port)
-            
-            if not available:
-                print(f"[警告] ⚠️  端口{preferred_port}可能被占用")
-                for detail in details:
-                    if "占用" in detail:
-                        print(f"[信息] 💡 {detail}")
-                
-                print(f"[信息] 🔍 正在寻找可用端口...")
-                actual_port = port_manager.find_available_port(config.UI_HOST, preferred_port, 50)
-                
-                if actual_port is None:
-                    print(f"[错误] ❌ 无法找到可用端口，尝试使用系统临时端口...")
-                    actual_port = port_manager.find_unused_port_ephemeral(config.UI_HOST)
-                
-                if actual_port != preferred_port:
-                    print(f"[信息] ✅ 已切换到端口: {actual_port}")
-                    print(f"[信息] 🌐 请访问: http://{config.UI_HOST}:{actual_port}")
-            else:
-                actual_port = preferred_port
-                print(f"[信息] ✅ 端口 {preferred_port} 可用")
-            
-            logger.info(f"启动NiceGUI Web应用 - 端口: {actual_port}")
-            
-            # 启动NiceGUI应用
-            ui.run(
-                host=config.UI_HOST,
-                port=actual_port,
-                title=config.UI_TITLE,
-                dark=config.UI_DARK_MODE,
-                show=True,  # 自动打开浏览器，方便小白用户
-                reload=False,  # 禁用自动重载，适合生产环境
-                native=False   # 不使用原生窗口
-            )
-            
-        except KeyboardInterrupt:
-            print("\n程序被用户中断")
-        except Exception as e:
-            print(f"运行应用时发生错误: {e}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            self.cleanup()
-    
-    def run(self, port: Optional[int] = None) -> None:
-        """
-        便捷的运行方法，支持端口参数
-        
-        Args:
-            port: 可选的端口号
-        """
-        try:
-            # 1. 检查并安装依赖
-            if not self.check_and_install_dependencies():
-                print("依赖安装失败，程序退出")
-                return
-            
-            print("正在启动应用...")
-            
-            # 2. 初始化核心组件
-            if not self.initialize_components():
-                print("组件初始化失败，程序退出")
-                return
-            
-            # 3. 启动服务
-            if not self.start_services():
-                print("服务启动失败，程序退出")
-                return
-            
-            # 4. 运行主应用
-            self.run_application(port)
-            
-        except KeyboardInterrupt:
-            print("\n程序被用户中断")
-        except Exception as e:
-            print(f"程序运行出错: {e}")
-            import traceback
-            traceback.print_exc()
-        finally:
-            print("程序已退出")
-    
-    def _is_debug_mode(self) -> bool:
-        """
-        检测是否在调试模式下运行
-        
-        Returns:
-            bool: 是否为调试模式
-        """
-        try:
-            import inspect
-            
-            # 检查调用栈中是否有调试器相关的帧
-            frame = inspect.currentframe()
-            while frame:
-                filename = frame.f_code.co_filename
-                if any(debug_indicator in filename.lower() for debug_indicator in 
-                       ['pdb', 'debugger', 'pydev', 'vscode', 'pycharm']):
-                    return True
-                frame = frame.f_back
-            
-            # 检查是否有调试相关的环境变量
-            import os
-            debug_vars = ['PYTHONDEBUG', 'PYCHARM_HOSTED', 'VSCODE_PID']
-            if any(var in os.environ for var in debug_vars):
-                return True
-            
-            return False
-            
-        except:
-            return False
-    
-    def _signal_handler(self, signum, frame):
-        """
-        信号处理器
-        
-        Args:
-            signum: 信号编号
-            frame: 当前帧
-        """
-        print(f"\n接收到信号 {signum}，正在优雅关闭程序...")
-        self.cleanup()
-        sys.exit(0)
-    
-    def cleanup(self) -> None:
-        """
-        清理资源
-        """
-        try:
-            if not self.is_running:
-                return
-            
-            print("正在清理资源...")
-            
-            # 停止数据分析器（关键修复：停止排名更新线程）
-            if self.analyzer:
-                self.analyzer.stop()
-                print("✅ 数据分析器已停止")
-            
-            # 停止UI更新
-            if self.ui_manager:
-                self.ui_manager.stop_updates()
-                print("✅ UI更新已停止")
-            
-            # 停止WebSocket客户端
-            if self.ws_client:
-                try:
-                    # 获取当前事件循环并执行异步的stop方法
-                    loop = asyncio.get_running_loop()
-                    if loop.is_running():
-                        # 如果事件循环正在运行，创建一个任务来执行stop
-                        loop.create_task(self.ws_client.stop())
-                    else:
-                        # 如果事件循环已停止，使用run_until_complete
-                        loop.run_until_complete(self.ws_client.stop())
-                except RuntimeError:
-                    # 如果没有正在运行的事件循环，创建新的事件循环来执行
-                    try:
-                        asyncio.run(self.ws_client.stop())
-                    except Exception as e:
-                        print(f"⚠️ WebSocket客户端停止时出现异常: {e}")
-                except Exception as e:
-                    print(f"⚠️ WebSocket客户端停止时出现异常: {e}")
-                
-                print("✅ WebSocket客户端已停止")
-            
-            self.is_running = False
-            print("资源清理完成")
-            
-        except Exception as e:
-            print(f"清理资源时发生错误: {e}")
-
-def main():
-    """
-    主程序入口函数
-    """
-    print("=" * 50)
-    print("    币安资金费率波动TOP5监控工具")
-    print("=" * 50)
-    print()
-    
-    # 创建应用管理器
-    global app_manager
-    app_manager = ApplicationManager()
-    
-    try:
-        # 1. 检查并安装依赖
-        if not app_manager.check_and_install_dependencies():
-            print("依赖安装失败，程序退出")
-            return 1
-        
-        print("正在启动应用...")
-        
-        # 2. 初始化核心组件
-        if not app_manager.initialize_components():
-            print("组件初始化失败，程序退出")
-            return 1
-        
-        # 3. 启动服务
-        if not app_manager.start_services():
-            print("服务启动失败，程序退出")
-            return 1
-        
-        # 4. 运行主应用
-        app_manager.run_application()
-        
-        return 0
-        
-    except KeyboardInterrupt:
-        print("\n程序被用户中断")
-        return 0
-    except Exception as e:
-        print(f"程序运行出错: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
-    finally:
-        print("程序已退出")
-
-# 程序入口点
-if __name__ == "__main__":
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+币安资金费率波动TOP5监控工具 - 主程序入口
+整合所有模块，提供统一的程序启动和管理功能
+
+主要功能:
+1. 环境检测和依赖管理
+2. 模块初始化和协调
+3. 程序生命周期管理
+4. 异常处理和资源清理
+"""
+
+import hashlib
+import re
+import subprocess
+import sys
+import importlib
+import importlib.util
+import time
+import signal
+import atexit
+import socket
+import threading
+import asyncio
+from pathlib import Path
+from typing import Optional, List, Tuple
+
+# 导入NiceGUI
+from nicegui import ui
+
+# 可选依赖psutil：有则直接在进程内读取内核连接表查端口占用，
+# 无则回退到netstat/lsof子进程方案
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    psutil = None
+    HAS_PSUTIL = False
+
+# 可选依赖packaging（pip自带其vendored版本，独立安装也很常见）：
+# 有则用标准的Requirement语法解析requirements.txt，覆盖~=/<=/!=/
+# extras/环境标记等完整语法；无则回退到简易手写解析
+try:
+    from packaging.requirements import Requirement, InvalidRequirement
+    HAS_PACKAGING = True
+except ImportError:
+    Requirement = None
+    InvalidRequirement = None
+    HAS_PACKAGING = False
+
+# 模块级logger单例：logger模块只依赖标准库和config，在导入期解析
+# 一次，各阶段方法不再重复import+查找
+try:
+    from logger import get_logger
+    _logger = get_logger(__name__)
+except Exception:
+    _logger = None
+
+# 设置Windows控制台编码，避免中文乱码
+if sys.platform.startswith('win'):
+    try:
+        # 只设置Python的输出编码，不执行系统命令
+        if hasattr(sys.stdout, 'reconfigure'):
+            sys.stdout.reconfigure(encoding='utf-8', errors='ignore')
+        if hasattr(sys.stderr, 'reconfigure'):
+            sys.stderr.reconfigure(encoding='utf-8', errors='ignore')
+    except:
+        pass  # 如果设置失败，继续运行
+
+
+# netstat -ano输出中的LISTENING行：捕获本地端口与PID，
+# 单次findall扫描整个缓冲区，避免逐行split/子串判断
+_NETSTAT_LISTEN_RE = re.compile(
+    r'^\s*TCP\s+\S+:(\d+)\s+\S+\s+LISTENING\s+(\d+)\s*$',
+    re.MULTILINE
+)
+
+# 子进程探测的argv在导入期定型；Windows上以CREATE_NO_WINDOW启动，
+# 跳过控制台窗口分配——那是netstat/tasklist生成开销的大头
+_NETSTAT_ARGV = ('netstat', '-ano', '-p', 'tcp')
+# ss输出中的进程段形如 users:(("python3",pid=1234,fd=7))，预编译一次
+_SS_USERS_RE = re.compile(r'users:\(\("([^"]+)",pid=(\d+)')
+_SUBPROCESS_FLAGS = 0x08000000 if sys.platform.startswith('win') else 0  # CREATE_NO_WINDOW
+
+# 常用服务端口（MySQL/PostgreSQL/Redis/MongoDB/Elasticsearch/RabbitMQ/
+# Jupyter及常用开发端口），扫描时跳过以免与它们冲突；frozenset在
+# 导入期定型，免去每次调用重建set字面量
+_RESERVED_PORTS = frozenset({3306, 5432, 6379, 27017, 9200, 5672, 8000, 8888, 9000})
+
+
+class PortManager:
+    """
+    智能端口管理器
+    基于Context7 Python socket最佳实践实现
+    
+    主要功能:
+    1. 智能端口可用性检测
+    2. 自动寻找可用端口
+    3. 端口冲突解决
+    4. 端口占用进程识别
+    """
+    
+    # 探测结果缓存有效期（秒）：启动期间同一端口会被check→find→
+    # recheck反复探测，短TTL内直接复用上次的bind结果
+    PROBE_CACHE_TTL = 2.0
+
+    def __init__(self):
+        """初始化端口管理器"""
+        # 复用模块级logger单例；不可用时_log_*方法回退到print
+        self.logger = _logger
+
+        # (host, port) -> (monotonic时间戳, 是否可用)
+        self._probe_cache = {}
+        
+    def _log_info(self, message: str):
+        """内部日志方法"""
+        if self.logger:
+            self.logger.info(message)
+        else:
+            print(f"[INFO] {message}")
+    
+    def _log_debug(self, message: str):
+        """内部调试日志方法"""
+        if self.logger:
+            self.logger.debug(message)
+    
+    def _log_warning(self, message: str):
+        """内部警告日志方法"""
+        if self.logger:
+            self.logger.warning(message)
+        else:
+            print(f"[WARNING] {message}")
+    
+    def _log_error(self, message: str):
+        """内部错误日志方法"""
+        if self.logger:
+            self.logger.error(message)
+        else:
+            print(f"[ERROR] {message}")
+        
+    def is_port_available(self, host: str, port: int) -> bool:
+        """
+        检查指定端口是否可用
+        基于Context7 socket.bind()最佳实践
+        
+        Args:
+            host: 主机地址
+            port: 端口号
+            
+        Returns:
+            bool: 端口是否可用
+        """
+        # TTL内命中缓存直接返回，避免启动路径上的重复bind探测
+        cached = self._probe_cache.get((host, port))
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < self.PROBE_CACHE_TTL:
+            return cached[1]
+
+        try:
+            # 双栈主机上同一主机名可能解析出IPv6和IPv4多个地址；
+            # 只探测AF_INET会漏掉另一协议族上的真实冲突，
+            # 这里对getaddrinfo的每个结果都做一次bind验证
+            addresses = socket.getaddrinfo(
+                host, port,
+                type=socket.SOCK_STREAM,
+                proto=socket.IPPROTO_TCP
+            )
+
+            result = True
+            for family, socktype, proto, _, sockaddr in addresses:
+                try:
+                    with socket.socket(family, socktype, proto) as test_socket:
+                        # 设置SO_REUSEADDR避免TIME_WAIT状态影响
+                        test_socket.setsockopt(
+                            socket.SOL_SOCKET, socket.SO_REUSEADDR, 1
+                        )
+
+                        # 尝试绑定端口
+                        test_socket.bind(sockaddr)
+                except OSError as e:
+                    # 端口被占用或其他网络错误
+                    self._log_debug(f"端口 {sockaddr[0]}:{port} 不可用: {e}")
+                    result = False
+                    break
+
+        except Exception as e:
+            self._log_error(f"检查端口可用性时发生错误: {e}")
+            return False
+
+        self._probe_cache[(host, port)] = (now, result)
+        return result
+
+    def _try_bind(self, sock: socket.socket, host: str, port: int) -> bool:
+        """
+        在已有socket上尝试绑定端口
+
+        批量探测时复用同一个socket，每个候选端口只付一次bind系统
+        调用，省去逐端口的socket/setsockopt/close三次内核往返
+
+        Args:
+            sock: 已创建并设置好选项的socket
+            host: 主机地址
+            port: 端口号
+
+        Returns:
+            bool: 绑定是否成功
+        """
+        try:
+            sock.bind((host, port))
+            return True
+        except OSError as e:
+            self._log_debug(f"端口 {host}:{port} 不可用: {e}")
+            return False
+
+    def find_available_port(self, host: str, preferred_port: int,
+                          port_range: int = 100,
+                          strict: bool = False) -> Optional[int]:
+        """
+        智能寻找可用端口
+        基于Context7 find_unused_port最佳实践
+
+        默认策略：首选端口被占用时直接让内核分配临时端口（O(1)，
+        一次bind系统调用），不再逐端口线性扫描；只有strict=True
+        （调用方确实需要靠近首选端口的号段）时才走范围扫描。
+        整个扫描过程共用一个探测socket，绑定成功即关闭并返回端口
+
+        Args:
+            host: 主机地址
+            preferred_port: 首选端口
+            port_range: 搜索范围（仅strict=True时使用）
+            strict: 是否坚持在首选端口附近扫描
+
+        Returns:
+            Optional[int]: 可用端口号，如果找不到则返回None
+        """
+        try:
+            probe_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            probe_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                # 首先检查首选端口
+                if self._try_bind(probe_sock, host, preferred_port):
+                    self._log_info(f"✅ 首选端口 {preferred_port} 可用")
+                    return preferred_port
+
+                self._log_warning(f"⚠️  端口{preferred_port}被占用，正在寻找替代端口...")
+
+                # 快路径：让内核的临时端口分配器直接给出空闲端口，
+                # 内核天然排除在用端口，无需保留端口过滤
+                if not strict:
+                    return self.find_unused_port_ephemeral(host)
+
+                # 搜索可用端口
+                for offset in range(1, port_range + 1):
+                    candidate_port = preferred_port + offset
+
+                    # 跳过系统保留端口和常用端口
+                    if self._is_reserved_port(candidate_port):
+                        continue
+
+                    if self._try_bind(probe_sock, host, candidate_port):
+                        self._log_info(f"✅ 找到可用端口: {candidate_port}")
+                        return candidate_port
+
+                # 如果向上搜索失败，尝试向下搜索
+                for offset in range(1, min(preferred_port - 1024, port_range) + 1):
+                    candidate_port = preferred_port - offset
+
+                    if candidate_port < 1024:  # 避免系统端口
+                        break
+
+                    if self._is_reserved_port(candidate_port):
+                        continue
+
+                    if self._try_bind(probe_sock, host, candidate_port):
+                        self._log_info(f"✅ 找到可用端口: {candidate_port}")
+                        return candidate_port
+            finally:
+                probe_sock.close()
+
+            self._log_error(f"❌ 在范围内未找到可用端口 (基准: {preferred_port}, 范围: ±{port_range})")
+            return None
+
+        except Exception as e:
+            self._log_error(f"寻找可用端口时发生错误: {e}")
+            return None
+    
+    async def _probe_async(self, host: str, port: int) -> bool:
+        """
+        异步探测单个端口（阻塞的bind放入线程池，不卡事件循环）
+
+        Args:
+            host: 主机地址
+            port: 端口号
+
+        Returns:
+            bool: 端口是否可用
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.is_port_available, host, port)
+
+    async def find_available_port_async(self, host: str, preferred_port: int,
+                                        port_range: int = 100) -> Optional[int]:
+        """
+        并发探测候选端口，返回编号最小的可用端口
+
+        串行扫描时每个候选都要等上一次bind返回；这里用asyncio.gather
+        把所有探测同时发出，总耗时约等于最慢的一次探测
+
+        Args:
+            host: 主机地址
+            preferred_port: 首选端口
+            port_range: 搜索范围
+
+        Returns:
+            Optional[int]: 可用端口号，如果找不到则返回None
+        """
+        candidates = [preferred_port]
+        candidates.extend(
+            port for port in range(preferred_port + 1,
+                                   preferred_port + port_range + 1)
+            if not self._is_reserved_port(port)
+        )
+
+        results = await asyncio.gather(
+            *(self._probe_async(host, port) for port in candidates)
+        )
+
+        for port, available in zip(candidates, results):
+            if available:
+                if port != preferred_port:
+                    self._log_info(f"✅ 找到可用端口: {port}")
+                return port
+
+        self._log_error(f"❌ 在范围内未找到可用端口 (基准: {preferred_port}, 范围: +{port_range})")
+        return None
+
+    def _is_reserved_port(self, port: int) -> bool:
+        """
+        检查是否为保留端口
+        
+        Args:
+            port: 端口号
+            
+        Returns:
+            bool: 是否为保留端口
+        """
+        # 系统保留端口（<1024）或常用服务端口
+        return port < 1024 or port in _RESERVED_PORTS
+    
+    def get_port_info(self, port: int) -> List[str]:
+        """
+        获取端口占用信息
+        
+        Args:
+            port: 端口号
+            
+        Returns:
+            List[str]: 占用进程信息列表
+        """
+        try:
+            # psutil路径不派生子进程，直接经系统调用读取连接表
+            if HAS_PSUTIL:
+                try:
+                    return self._get_port_info_psutil(port)
+                except Exception as e:
+                    self._log_debug(f"psutil查询端口信息失败，回退子进程方案: {e}")
+
+            if sys.platform.startswith('win'):
+                return self._get_port_info_windows(port)
+            else:
+                return self._get_port_info_unix(port)
+        except Exception as e:
+            self._log_error(f"获取端口信息时发生错误: {e}")
+            return [f"无法获取端口信息: {e}"]
+
+    def _get_port_info_psutil(self, port: int) -> List[str]:
+        """
+        通过psutil获取端口占用信息（免fork/exec）
+
+        Args:
+            port: 端口号
+
+        Returns:
+            List[str]: 占用进程信息列表
+        """
+        port_info = []
+        seen_pids = set()
+        for conn in psutil.net_connections(kind='tcp'):
+            if (conn.laddr and conn.laddr.port == port
+                    and conn.status == psutil.CONN_LISTEN):
+                pid = conn.pid
+                if pid is None or pid in seen_pids:
+                    continue
+                seen_pids.add(pid)
+                try:
+                    process_name = psutil.Process(pid).name()
+                    port_info.append(f"{process_name} (PID: {pid})")
+                except psutil.Error:
+                    port_info.append(f"进程 PID: {pid}")
+
+        return port_info if port_info else ["端口未被占用"]
+    
+    def _get_port_info_windows(self, port: int) -> List[str]:
+        """
+        获取Windows系统端口占用信息
+        
+        Args:
+            port: 端口号
+            
+        Returns:
+            List[str]: 占用进程信息列表
+        """
+        try:
+            # 使用netstat命令查找端口占用
+            result = subprocess.run(
+                _NETSTAT_ARGV,
+                capture_output=True,
+                text=True,
+                timeout=10,
+                creationflags=_SUBPROCESS_FLAGS
+            )
+            
+            if result.returncode != 0:
+                return ["无法执行netstat命令"]
+
+            # 单次正则扫描整个输出并按端口过滤，再对PID去重，
+            # 每个唯一PID只查询一次tasklist
+            port_str = str(port)
+            pids = dict.fromkeys(
+                pid for local_port, pid
+                in _NETSTAT_LISTEN_RE.findall(result.stdout)
+                if local_port == port_str
+            )
+
+            port_info = []
+            for pid in pids:
+                try:
+                    # 获取进程名称
+                    tasklist_result = subprocess.run(
+                        ('tasklist', '/FI', f'PID eq {pid}', '/FO', 'CSV'),
+                        capture_output=True,
+                        text=True,
+                        timeout=5,
+                        creationflags=_SUBPROCESS_FLAGS
+                    )
+
+                    if tasklist_result.returncode == 0:
+                        lines = tasklist_result.stdout.strip().split('\n')
+                        if len(lines) > 1:
+                            # 解析CSV格式的输出
+                            process_line = lines[1].replace('"', '').split(',')
+                            if len(process_line) >= 2:
+                                process_name = process_line[0]
+                                port_info.append(f"{process_name} (PID: {pid})")
+                            else:
+                                port_info.append(f"进程 PID: {pid}")
+                        else:
+                            port_info.append(f"进程 PID: {pid}")
+                    else:
+                        port_info.append(f"进程 PID: {pid}")
+
+                except subprocess.TimeoutExpired:
+                    port_info.append(f"进程 PID: {pid} (查询超时)")
+                except Exception:
+                    port_info.append(f"进程 PID: {pid}")
+
+            return port_info if port_info else ["端口未被占用"]
+            
+        except subprocess.TimeoutExpired:
+            return ["查询端口信息超时"]
+        except Exception as e:
+            return [f"查询失败: {e}"]
+    
+    def _get_port_info_unix(self, port: int) -> List[str]:
+        """
+        获取Unix/Linux系统端口占用信息
+        
+        Args:
+            port: 端口号
+            
+        Returns:
+            List[str]: 占用进程信息列表
+        """
+        try:
+            # 优先使用ss：只查询监听态TCP套接字且内核侧按端口过滤
+            # （sport = :port），比lsof遍历全部进程fd快一个量级；
+            # -H省掉标题行，无需跳行解析
+            result = subprocess.run(
+                ['ss', '-tlnpH', f'sport = :{port}'],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+
+            if result.returncode != 0:
+                return ["端口未被占用或无法查询"]
+
+            port_info = [
+                f"{process_name} (PID: {pid})"
+                for process_name, pid in _SS_USERS_RE.findall(result.stdout)
+            ]
+
+            return port_info if port_info else ["端口未被占用"]
+
+        except subprocess.TimeoutExpired:
+            return ["查询端口信息超时"]
+        except FileNotFoundError:
+            # ss命令不存在（老系统/macOS），回退到lsof
+            return self._get_port_info_lsof(port)
+        except Exception as e:
+            return [f"查询失败: {e}"]
+
+    def _get_port_info_lsof(self, port: int) -> List[str]:
+        """
+        lsof回退路径：ss不可用时查询端口占用信息
+
+        Args:
+            port: 端口号
+
+        Returns:
+            List[str]: 占用进程信息列表
+        """
+        try:
+            # 使用lsof命令查找端口占用
+            result = subprocess.run(
+                ['lsof', '-i', f':{port}'],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+            
+            if result.returncode != 0:
+                return ["端口未被占用或无法查询"]
+            
+            port_info = []
+            for line in result.stdout.split('\n')[1:]:  # 跳过标题行
+                if line.strip():
+                    parts = line.split()
+                    if len(parts) >= 2:
+                        process_name = parts[0]
+                        pid = parts[1]
+                        port_info.append(f"{process_name} (PID: {pid})")
+            
+            return port_info if port_info else ["端口未被占用"]
+            
+        except subprocess.TimeoutExpired:
+            return ["查询端口信息超时"]
+        except FileNotFoundError:
+            # lsof命令不存在，尝试使用netstat
+            try:
+                result = subprocess.run(
+                    ['netstat', '-tlnp'],
+                    capture_output=True,
+                    text=True,
+                    timeout=10
+                )
+                
+                port_info = []
+                for line in result.stdout.split('\n'):
+                    if f':{port}' in line:
+                        port_info.append(line.strip())
+                
+                return port_info if port_info else ["端口未被占用"]
+                
+            except Exception:
+                return ["无法查询端口信息"]
+        except Exception as e:
+            return [f"查询失败: {e}"]
+    
+    def find_unused_port_ephemeral(self, host: str = 'localhost') -> int:
+        """
+        使用系统临时端口机制寻找可用端口
+        基于Context7 find_unused_port最佳实践
+        
+        Args:
+            host: 主机地址
+            
+        Returns:
+            int: 可用的临时端口号
+
+        Raises:
+            OSError: 主机地址无效或绑定失败（内核临时端口分配器实际
+                     不会耗尽，失败说明是配置错误，应当显式暴露而非
+                     回退到慢速扫描掩盖问题）
+        """
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            # 绑定到端口0，让系统自动分配可用端口
+            s.bind((host, 0))
+            # 获取系统分配的端口号
+            _, port = s.getsockname()
+            self._log_debug(f"系统分配的临时端口: {port}")
+            return port
+    
+    def check_port_with_details(self, host: str, port: int) -> Tuple[bool, List[str]]:
+        """
+        详细检查端口状态
+        
+        Args:
+            host: 主机地址
+            port: 端口号
+            
+        Returns:
+            Tuple[bool, List[str]]: (是否可用, 详细信息列表)
+        """
+        is_available = self.is_port_available(host, port)
+        
+        if is_available:
+            return True, [f"✅ 端口 {host}:{port} 可用"]
+        else:
+            port_info = self.get_port_info(port)
+            details = [f"❌ 端口 {host}:{port} 被占用:"]
+            details.extend([f"   - {info}" for info in port_info])
+            return False, details
+
+class ApplicationManager:
+    """
+    应用程序管理器 - 负责整个应用的生命周期管理
+    
+    职责:
+    - 环境检测和依赖安装
+    - 模块初始化和协调
+    - 程序启动和停止
+    - 异常处理和资源清理
+    """
+    
+    def __init__(self):
+        """初始化应用管理器"""
+        # 核心组件实例
+        self.analyzer: Optional[object] = None
+        self.ws_client: Optional[object] = None
+        self.ui_manager: Optional[object] = None
+        
+        # 运行状态
+        self.is_running: bool = False
+        self.start_time: Optional[float] = None
+
+        # 启动阶段的提示信息缓冲：逐条print每次都触发行缓冲flush
+        # （Windows控制台还要做编码转换），这里按阶段合并成一次写出
+        self._log_buffer: List[str] = []
+
+        # cleanup幂等标记：atexit与信号处理器都会触发清理
+        self._cleanup_started = threading.Event()
+        
+        # 注册清理函数
+        atexit.register(self.cleanup)
+        signal.signal(signal.SIGINT, self._signal_handler)
+        signal.signal(signal.SIGTERM, self._signal_handler)
+    
+    def _emit(self, message: str) -> None:
+        """暂存一条启动提示，由_flush_output按阶段合并输出"""
+        self._log_buffer.append(message)
+
+    def _flush_output(self) -> None:
+        """把暂存的提示一次性写出（每阶段一次写调用而非逐行flush）"""
+        if self._log_buffer:
+            sys.stdout.write('\n'.join(self._log_buffer) + '\n')
+            sys.stdout.flush()
+            self._log_buffer.clear()
+
+    def check_and_install_dependencies(self) -> bool:
+        """
+        检查并自动安装所需依赖包
+        基于Context7最佳实践，从requirements.txt读取依赖
+        
+        Returns:
+            bool: 依赖检查是否成功
+        """
+        self._emit("正在检查依赖包...")
+        
+        try:
+            # 基于Context7最佳实践：从requirements.txt读取依赖
+            requirements_file = Path(__file__).parent / 'requirements.txt'
+
+            # 哨兵文件记忆化：检查结果是requirements.txt内容的纯函数，
+            # 内容哈希对应的哨兵存在即上次检查已通过，整个扫描直接
+            # 跳过；编辑requirements.txt改变哈希，缓存自动失效
+            stamp_path = None
+            if requirements_file.exists():
+                digest = hashlib.sha1(requirements_file.read_bytes()).hexdigest()
+                stamp_path = requirements_file.parent / f'.deps_ok_{digest}'
+                if stamp_path.exists():
+                    self._emit("[✓] 依赖检查已通过（缓存命中，跳过扫描）")
+                    return True
+
+            required_packages = self._parse_requirements_file(requirements_file)
+            
+            if not required_packages:
+                self._emit("[警告] 未找到requirements.txt或文件为空，使用默认依赖列表")
+                # 回退到硬编码依赖列表
+                required_packages = {
+                    'nicegui': 'nicegui>=1.4.0',
+                    'websockets': 'websockets>=11.0',
+                }
+            
+            # 内置库（无需安装）
+            builtin_modules = ['asyncio', 'json', 'threading', 'time', 'typing']
+
+            # 一次性扫描已安装发行版的元数据构建名称->版本表。
+            # 之前对每个包importlib.import_module，会真正执行包的顶层
+            # 代码（nicegui这类要数百毫秒）；读元数据不触发任何导入
+            installed = {}
+            try:
+                from importlib.metadata import distributions
+                for dist in distributions():
+                    dist_name = dist.metadata['Name']
+                    if dist_name:
+                        installed[dist_name.lower().replace('_', '-')] = dist.version
+            except Exception as e:
+                self._emit(f"[警告] 扫描已安装包元数据失败: {e}")
+
+            # 从安装元数据反查发行版名->顶层模块名（解决websocket-client
+            # 导入名为websocket这类"身份证名"与"常用名"不一致的问题），
+            # 取代只覆盖5个包的手工映射表
+            pkg_to_modules = {}
+            try:
+                from importlib.metadata import packages_distributions
+                for module_name, dist_names in packages_distributions().items():
+                    for dist_name in dist_names:
+                        pkg_to_modules.setdefault(
+                            dist_name.lower().replace('_', '-'), []
+                        ).append(module_name)
+            except Exception as e:
+                self._emit(f"[警告] 构建模块名映射失败: {e}")
+
+            # 检查第三方包，缺失的先收集起来
+            missing_specs = []
+            for package, version_spec in required_packages.items():
+                canonical_name = package.lower().replace('_', '-')
+                installed_version = installed.get(canonical_name)
+
+                satisfied = installed_version is not None
+                if satisfied and HAS_PACKAGING and version_spec != package:
+                    # 有版本约束时用SpecifierSet做标准比较
+                    try:
+                        satisfied = Requirement(version_spec).specifier.contains(
+                            installed_version, prereleases=True
+                        )
+                    except InvalidRequirement:
+                        pass
+
+                if not satisfied and installed_version is None:
+                    # 元数据缺失的兜底（如某些源码安装）：
+                    # find_spec只查找模块位置，不执行模块代码
+                    module_names = pkg_to_modules.get(canonical_name, [package])
+                    satisfied = any(
+                        self._module_importable(module_name)
+                        for module_name in module_names
+                    )
+
+                if satisfied:
+                    self._emit(f"[✓] {package} 已安装")
+                else:
+                    self._emit(f"[!] 缺失依赖: {package}")
+                    missing_specs.append(version_spec)
+
+            # 所有缺失的包合并为一次pip调用：pip自身启动与依赖解析
+            # 都只付一次，而不是每个包各付一次
+            if missing_specs:
+                self._emit(f"[!] 正在安装 {len(missing_specs)} 个缺失依赖...")
+                try:
+                    subprocess.check_call([
+                        sys.executable, '-m', 'pip', 'install',
+                        '--quiet', *missing_specs
+                    ])
+                    self._emit("[✓] 缺失依赖安装成功")
+                except subprocess.CalledProcessError as e:
+                    self._emit(f"[✗] 依赖安装失败: {e}")
+                    return False
+            
+            # 检查内置库
+            for module in builtin_modules:
+                try:
+                    importlib.import_module(module)
+                except ImportError as e:
+                    self._emit(f"[✗] 内置模块 {module} 不可用: {e}")
+                    return False
+            
+            # 检查全部通过，落下哨兵供下次启动直接跳过；同时清掉
+            # 旧哈希的哨兵，避免requirements.txt每次编辑都留下残骸
+            if stamp_path is not None:
+                try:
+                    for stale in stamp_path.parent.glob('.deps_ok_*'):
+                        if stale != stamp_path:
+                            stale.unlink(missing_ok=True)
+                    stamp_path.touch()
+                except OSError:
+                    pass
+
+            self._emit("所有依赖包检查完成！")
+            return True
+            
+        except Exception as e:
+            self._emit(f"依赖检查过程中发生错误: {e}")
+            return False
+        finally:
+            self._flush_output()
+
+    @staticmethod
+    def _module_importable(module_name: str) -> bool:
+        """
+        判断模块是否可导入（只查找，不执行模块代码）
+
+        Args:
+            module_name: 模块名
+
+        Returns:
+            bool: 模块是否可导入
+        """
+        try:
+            return importlib.util.find_spec(module_name) is not None
+        except (ImportError, ValueError):
+            return False
+
+    def _parse_requirements_file(self, requirements_path: Path) -> dict:
+        """
+        解析requirements.txt文件
+        基于Context7最佳实践实现
+        
+        Args:
+            requirements_path: requirements.txt文件路径
+            
+        Returns:
+            dict: 包名到版本规范的映射
+        """
+        requirements = {}
+        
+        try:
+            if not requirements_path.exists():
+                return requirements
+            
+            with open(requirements_path, 'r', encoding='utf-8') as f:
+                for line_num, line in enumerate(f, 1):
+                    # 去除空白字符
+                    line = line.strip()
+                    
+                    # 跳过空行和注释行
+                    if not line or line.startswith('#'):
+                        continue
+
+                    # 优先使用packaging的标准解析（pip同款语法支持）
+                    if HAS_PACKAGING:
+                        try:
+                            req = Requirement(line)
+                            requirements[req.name] = str(req)
+                        except InvalidRequirement:
+                            self._emit(f"[警告] requirements.txt 第{line_num}行格式错误: {line}")
+                        continue
+
+                    # 解析包规范
+                    try:
+                        # 基本格式：package>=version 或 package==version
+                        if '>=' in line:
+                            package, version = line.split('>=', 1)
+                            package = package.strip()
+                            version = version.strip()
+                            requirements[package] = f"{package}>={version}"
+                        elif '==' in line:
+                            package, version = line.split('==', 1)
+                            package = package.strip()
+                            version = version.strip()
+                            requirements[package] = f"{package}=={version}"
+                        elif '>' in line:
+                            package, version = line.split('>', 1)
+                            package = package.strip()
+                            version = version.strip()
+                            requirements[package] = f"{package}>{version}"
+                        else:
+                            # 没有版本规范，使用包名
+                            package = line.strip()
+                            requirements[package] = package
+                            
+                    except ValueError as e:
+                        self._emit(f"[警告] requirements.txt 第{line_num}行格式错误: {line}")
+                        continue
+            
+            return requirements
+            
+        except Exception as e:
+            self._emit(f"[错误] 解析requirements.txt失败: {e}")
+            return {}
+    
+    def initialize_components(self) -> bool:
+        """
+        初始化所有核心组件
+        
+        Returns:
+            bool: 初始化是否成功
+        """
+        try:
+            self._emit("初始化核心组件...")
+            
+            # 导入配置模块
+            from config import config
+
+            # 复用模块级logger单例
+            logger = _logger
+            logger.info("开始初始化应用组件")
+            
+            # 1. 初始化业务核心分析器
+            self._emit("创建资金费率分析器...")
+            from business_core import BusinessCore
+            self.analyzer = BusinessCore()
+            logger.info("资金费率分析器初始化完成")
+            
+            # 2. 初始化WebSocket客户端
+            self._emit("创建WebSocket客户端...")
+            from binance_client import BinanceWebSocketClient
+            # 传入正确的数据处理方法而不是整个对象
+            # 创建WebSocket客户端，传递正确的参数
+            self.ws_client = BinanceWebSocketClient(
+                stream_path="/ws/!markPrice@arr@1s",
+                data_handler=self.analyzer.update_data
+            )
+            logger.info("WebSocket客户端初始化完成")
+            
+            # 3. 初始化UI管理器
+            self._emit("创建UI管理器...")
+            from ui_manager import UIManager
+            self.ui_manager = UIManager(self.analyzer, self.ws_client)
+            logger.info("UI管理器初始化完成")
+            
+            logger.info("所有核心组件初始化成功")
+            return True
+            
+        except ImportError as e:
+            self._emit(f"[✗] 导入模块失败: {e}")
+            self._emit("请确保所有必需的模块文件存在：config.py, logger.py, business_core.py, binance_client.py, ui_manager.py")
+            return False
+        except Exception as e:
+            self._emit(f"[✗] 初始化组件时发生错误: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+        finally:
+            self._flush_output()
+
+    def start_services(self) -> bool:
+        """
+        启动所有服务
+        
+        Returns:
+            bool: 启动是否成功
+        """
+        try:
+            logger = _logger
+
+            print("启动应用服务...")
+            
+            # 1. 启动数据分析器（关键修复：启动排名更新线程）
+            print("启动数据分析器...")
+            self.analyzer.start()
+            logger.info("✅ 数据分析器已启动")
+            
+            # 2. 创建Web界面（先启动NiceGUI以建立事件循环）
+            print("创建Web界面...")
+            self.ui_manager.create_interface()
+            logger.info("✅ Web界面创建完成")
+            
+            # 3. 在NiceGUI的事件循环中启动WebSocket连接
+            print("准备连接币安WebSocket...")
+            # WebSocket将在NiceGUI启动后的事件循环中启动
+            
+            self.is_running = True
+            self.start_time = time.time()
+            
+            print("程序启动成功！")
+            print("浏览器将自动打开监控界面")
+            print("如果浏览器未自动打开，请手动访问: http://localhost:8080")
+            print()
+            print("💡 使用提示:")
+            print("   - 保持此窗口打开，关闭窗口将停止程序")
+            print("   - 按 Ctrl+C 可安全退出程序")
+            print("   - 程序会自动连接币安API并实时更新数据")
+            print()
+            
+            return True
+            
+        except Exception as e:
+            print(f"[✗] 启动服务时发生错误: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+    
+    def run_application(self, port: Optional[int] = None) -> None:
+        """
+        运行主应用程序 - 集成智能端口管理
+        
+        Args:
+            port: 可选的端口号，如果不指定则使用配置文件中的端口
+        """
+        try:
+            from config import config
+
+            logger = _logger
+
+            # 检测调试模式
+            debug_mode = self._is_debug_mode()
+            if debug_mode:
+                print("🔧 调试模式: 可在编辑器中直接运行和调试")
+                print("💡 提示: 可以在关键代码位置设置断点进行调试")
+                print("-" * 50)
+            
+            # 创建端口管理器实例
+            port_manager = PortManager()
+            
+            # 智能端口管理
+            preferred_port = port if port is not None else config.UI_PORT
+            
+            print(f"🔍 检查端口可用性...")
+            available, details = port_manager.check_port_with_details(config.UI_HOST, preferred_port)
+            
+            if not available:
+                print(f"[警告] ⚠️  端口{preferred_port}可能被占用")
+                for detail in details:
+                    if "占用" in detail:
+                        print(f"[信息] 💡 {detail}")
+                
+                print(f"[信息] 🔍 正在寻找可用端口...")
+                actual_port = port_manager.find_available_port(config.UI_HOST, preferred_port, 50)
+                
+                if actual_port is None:
+                    print(f"[错误] ❌ 无法找到可用端口，尝试使用系统临时端口...")
+                    actual_port = port_manager.find_unused_port_ephemeral(config.UI_HOST)
+                
+                if actual_port != preferred_port:
+                    print(f"[信息] ✅ 已切换到端口: {actual_port}")
+                    print(f"[信息] 🌐 请访问: http://{config.UI_HOST}:{actual_port}")
+            else:
+                actual_port = preferred_port
+                print(f"[信息] ✅ 端口 {preferred_port} 可用")
+            
+            logger.info(f"启动NiceGUI Web应用 - 端口: {actual_port}")
+            
+            # 启动NiceGUI应用
+            ui.run(
+                host=config.UI_HOST,
+                port=actual_port,
+                title=config.UI_TITLE,
+                dark=config.UI_DARK_MODE,
+                show=True,  # 自动打开浏览器，方便小白用户
+                reload=False,  # 禁用自动重载，适合生产环境
+                native=False   # 不使用原生窗口
+            )
+            
+        except KeyboardInterrupt:
+            print("\n程序被用户中断")
+        except Exception as e:
+            print(f"运行应用时发生错误: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            self.cleanup()
+    
+    def run(self, port: Optional[int] = None) -> int:
+        """
+        完整的启动流程：依赖检查(含模块预取)→组件初始化→服务启动→主循环
+
+        main()与命令行入口统一委托到这里，启动步骤只维护一份
+
+        Args:
+            port: 可选的端口号
+
+        Returns:
+            int: 进程退出码(0=正常/用户中断, 1=启动失败或异常)
+        """
+        try:
+            # 1. 检查并安装依赖，同时在后台线程预热本项目模块的导入。
+            # 依赖检查大部分时间花在元数据扫描/pip子进程上（释放GIL），
+            # 正好与磁盘读取+编译我们自己的模块重叠；预取的模块进入
+            # sys.modules后，initialize_components的导入全部命中缓存
+            import concurrent.futures
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                prefetch_futures = [
+                    executor.submit(importlib.import_module, module_name)
+                    for module_name in (
+                        'config', 'logger', 'business_core',
+                        'binance_client', 'ui_manager',
+                    )
+                ]
+                deps_ok = self.check_and_install_dependencies()
+                for future in prefetch_futures:
+                    try:
+                        future.result()
+                    except Exception:
+                        # 预取失败不致命，留给正式导入报错
+                        pass
+            if not deps_ok:
+                print("依赖安装失败，程序退出")
+                return 1
+
+            print("正在启动应用...")
+
+            # 2. 初始化核心组件
+            if not self.initialize_components():
+                print("组件初始化失败，程序退出")
+                return 1
+
+            # 3. 启动服务
+            if not self.start_services():
+                print("服务启动失败，程序退出")
+                return 1
+
+            # 4. 运行主应用
+            self.run_application(port)
+            return 0
+
+        except KeyboardInterrupt:
+            print("\n程序被用户中断")
+            return 0
+        except Exception as e:
+            print(f"程序运行出错: {e}")
+            import traceback
+            traceback.print_exc()
+            return 1
+        finally:
+            print("程序已退出")
+    
+    def _is_debug_mode(self) -> bool:
+        """
+        检测是否在调试模式下运行
+        
+        Returns:
+            bool: 是否为调试模式
+        """
+        try:
+            # sys.gettrace检测一切基于trace的调试器（pdb/pydevd/debugpy），
+            # 一次C层读取即可，无需遍历调用栈逐帧匹配文件名
+            import os
+            return (sys.gettrace() is not None
+                    or not os.environ.keys().isdisjoint(
+                        ('PYTHONDEBUG', 'PYCHARM_HOSTED', 'VSCODE_PID')))
+        except:
+            return False
+    
+    def _signal_handler(self, signum, frame):
+        """
+        信号处理器
+        
+        Args:
+            signum: 信号编号
+            frame: 当前帧
+        """
+        print(f"\n接收到信号 {signum}，正在优雅关闭程序...")
+        self.cleanup()
+        sys.exit(0)
+    
+    def cleanup(self) -> None:
+        """
+        清理资源
+        """
+        try:
+            # Ctrl-C时信号处理器和atexit会先后触发本方法，第二次
+            # 调用直接返回，避免对分析器/WebSocket的重复停止与竞争
+            if self._cleanup_started.is_set():
+                return
+            self._cleanup_started.set()
+
+            if not self.is_running:
+                return
+            
+            print("正在清理资源...")
+            
+            # 停止数据分析器（关键修复：停止排名更新线程）
+            if self.analyzer:
+                self.analyzer.stop()
+                print("✅ 数据分析器已停止")
+            
+            # 停止UI更新
+            if self.ui_manager:
+                self.ui_manager.stop_updates()
+                print("✅ UI更新已停止")
+            
+            # 停止WebSocket客户端：客户端的connection_task持有它所在的
+            # 事件循环引用，直接向该循环投递stop协程，无需摸索当前循环
+            # 或临时创建一次性循环
+            if self.ws_client:
+                try:
+                    task = getattr(self.ws_client, 'connection_task', None)
+                    loop = task.get_loop() if task is not None else None
+
+                    if loop is not None and loop.is_running():
+                        try:
+                            on_loop_thread = asyncio.get_running_loop() is loop
+                        except RuntimeError:
+                            on_loop_thread = False
+
+                        if on_loop_thread:
+                            # 与循环同线程（信号处理器场景）：阻塞等待会
+                            # 死锁，入队后由循环自行执行
+                            loop.create_task(self.ws_client.stop())
+                        else:
+                            future = asyncio.run_coroutine_threadsafe(
+                                self.ws_client.stop(), loop
+                            )
+                            future.result(timeout=5)
+                    else:
+                        # 循环已停止或客户端从未启动，同步执行stop
+                        asyncio.run(self.ws_client.stop())
+                except Exception as e:
+                    print(f"⚠️ WebSocket客户端停止时出现异常: {e}")
+
+                print("✅ WebSocket客户端已停止")
+            
+            self.is_running = False
+            print("资源清理完成")
+            
+        except Exception as e:
+            print(f"清理资源时发生错误: {e}")
+
+def main():
+    """
+    主程序入口函数
+    """
+    print("=" * 50)
+    print("    币安资金费率波动TOP5监控工具")
+    print("=" * 50)
+    print()
+    
+    # 创建应用管理器并委托统一的启动流程（此前这里复制了一份
+    # 启动步骤，依赖检查阶段的模块预取等优化只在run()里生效）
+    global app_manager
+    app_manager = ApplicationManager()
+    return app_manager.run()
+
+# 程序入口点
+if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+business_core回归测试
+
+覆盖SoA扩容路径：首批超过GROW_CHUNK(256)个交易对时，_grow()必须把
+全部每交易对列一起扩容——任何一列被遗漏都会触发IndexError，而
+update_data的兜底异常处理会因此整批丢弃数据（生产环境约500个USDT
+交易对，必然跨过初始容量）
+"""
+from business_core import BusinessCore
+
+
+def test_grow_covers_all_per_symbol_columns():
+    """推入300个交易对（跨过一次扩容边界），验证数据无丢失"""
+    core = BusinessCore()
+    n = BusinessCore.GROW_CHUNK + 44
+    batch = [{'s': f"T{i:03d}USDT", 'r': '0.0001'} for i in range(n)]
+    core.update_data(batch)
+
+    # 扩容遗漏时异常会被update_data吞掉，表现为整批交易对缺失
+    assert len(core.symbol_ids) == n
+    assert core._capacity >= n
+
+    # 所有每交易对列都必须跟上新容量
+    for name in ('_buffers', '_meta_i', '_meta_f', '_champion_vol',
+                 '_champion_ts', '_champion_z', '_champion_mean',
+                 '_champion_std', '_champion_old_rate',
+                 '_champion_new_rate', '_vol_ts', '_last_seen'):
+        assert len(getattr(core, name)) == core._capacity, name
+
+    # 扩容后再推一批费率变化，确认后续批次仍正常处理
+    batch2 = [{'s': f"T{i:03d}USDT", 'r': '0.0005'} for i in range(n)]
+    core.update_data(batch2)
+    assert core.data_update_count == 2
+
+
+if __name__ == "__main__":
+    test_grow_covers_all_per_symbol_columns()
+    print("OK: SoA扩容回归测试通过")
@@ -1,847 +1,1198 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-"""
-用户界面管理模块
-负责创建和管理NiceGUI界面，处理数据展示和用户交互
-
-主要功能:
-1. 创建响应式Web界面
-2. 实时更新TOP5数据显示
-3. 管理界面状态和样式
-4. 处理用户交互事件
-"""
-
-import time
-from typing import Dict, List, Optional, Any
-from nicegui import ui, app
-from config import config
-from logger import get_logger
-import asyncio
-
-class UIManager:
-    """
-    用户界面管理器 - 负责界面创建和数据展示
-    
-    职责:
-    - 创建和管理Web界面组件
-    - 实时更新数据显示
-    - 处理界面样式和布局
-    - 管理界面状态和交互
-    """
-    
-    def __init__(self, data_analyzer, ws_client=None):
-        """
-        初始化UI管理器
-        
-        Args:
-            data_analyzer: 数据分析器实例，用于获取显示数据
-            ws_client: WebSocket客户端实例（可选）
-        """
-        # 获取模块专用logger
-        self.logger = get_logger(__name__)
-        
-        # ==================== 核心组件 ====================
-        self.data_analyzer = data_analyzer  # 数据分析器引用
-        self.ws_client = ws_client  # WebSocket客户端引用
-        
-        # ==================== UI组件引用 ====================
-        self.status_elements: Dict[str, Any] = {}  # 状态显示元素
-        self.top5_rows: List[Dict[str, Any]] = []  # TOP5数据行元素
-        self.update_timer: Optional[Any] = None  # 更新定时器
-        
-        # ==================== 界面状态 ====================
-        self.is_initialized: bool = False  # 界面是否已初始化
-        self.last_update_time: Optional[float] = None  # 最后更新时间
-        self.update_count: int = 0  # 更新次数
-        self.start_time: float = time.time()  # 启动时间
-        
-        self.logger.info("UI管理器初始化完成")
-    
-    def create_interface(self) -> None:
-        """
-        创建完整的用户界面
-        
-        界面结构:
-        1. 页面标题和配置
-        2. 系统状态信息栏
-        3. TOP5数据展示区域
-        4. 页面底部说明信息
-        """
-        try:
-            # 设置页面基础配置
-            self._setup_page_config()
-            
-            # 创建主界面布局 - 充分利用屏幕宽度
-            with ui.column().classes('w-full mx-auto px-4 sm:px-6 lg:px-8 xl:px-12 2xl:px-16'):
-                # 创建各个界面区域 - 状态栏已移至底部
-                self._create_header()
-                self._create_top5_section()
-                self._create_footer()
-                self._create_status_section()
-            
-            # 启动数据更新定时器
-            self._start_update_timer()
-            
-            self.is_initialized = True
-            self.logger.info("用户界面创建完成")
-            
-        except Exception as e:
-            self.logger.error(f"创建用户界面时发生错误: {e}", exc_info=True)
-            raise
-    
-    def _setup_page_config(self) -> None:
-        """
-        设置页面基础配置
-        """
-        # 启用深色模式
-        ui.dark_mode().enable()
-        
-        # 设置页面标题
-        ui.page_title(config.UI_TITLE)
-        
-        # 添加最小化必要CSS - 仅包含动画效果
-        ui.add_head_html(self._get_minimal_css())
-    
-    def _get_minimal_css(self) -> str:
-        """
-        获取最小化的必要CSS - 基于Context7最佳实践
-        包含动画效果和全局字体加粗优化，适合金融数据阅读
-        """
-        return """
-        <style>
-        /* 全局提升基础字体粗细度，使其更适合金融数据阅读 */
-        body, html, .nicegui-content, .q-item__label, .q-field__label, .q-btn__content {
-            font-weight: 600 !important; /* 600是'semibold'半粗体 */
-        }
-
-        /* 对于已经标记为'font-bold'的元素，让它们更粗，拉开对比 */
-        .font-bold, b, strong {
-            font-weight: 800 !important; /* 800是'extrabold'特粗体 */
-        }
-
-        /* 状态指示器脉冲动画 - NiceGUI暂无直接替代 */
-        @keyframes status-pulse {
-            0%, 100% { opacity: 1; transform: scale(1); }
-            50% { opacity: 0.8; transform: scale(1.02); }
-        }
-        .status-pulse { animation: status-pulse 2s cubic-bezier(0.4, 0.0, 0.6, 1) infinite; }
-        
-        /* 呼吸动画效果 - 用于费率显示 */
-        @keyframes breathing {
-            0%, 100% { opacity: 1; transform: scale(1); }
-            50% { opacity: 0.6; transform: scale(1.03); }
-        }
-        .breathing { animation: breathing 2.5s ease-in-out infinite; }
-        </style>
-        """
-    
-    def _create_header(self) -> None:
-        """
-        创建页面标题区域 - 简洁设计（无标题）
-        """
-        # 移除所有标题，让界面更简洁专业
-        pass
-    
-    def _create_status_section(self) -> None:
-        """
-        创建系统状态信息区域 - 使用Tailwind CSS毛玻璃效果
-        """
-        with ui.card().classes('w-full mb-8 p-6 backdrop-blur-xl bg-white/5 border border-white/10 shadow-lg rounded-3xl'):
-            ui.label('📊 系统状态').classes('text-2xl font-semibold mb-4 text-green-400')
-            
-            with ui.row().classes('w-full justify-between items-center flex-wrap gap-6'):
-                # 连接状态
-                self.status_elements['connection'] = ui.label('🔗 连接状态: 初始化中...').classes(
-                    'text-lg font-medium status-pulse'
-                )
-                
-                # 数据统计
-                self.status_elements['data_count'] = ui.label('📈 监控交易对: 0').classes(
-                    'text-lg font-medium font-mono'
-                )
-                
-                # 更新时间
-                self.status_elements['last_update'] = ui.label('⏰ 最后更新: --').classes(
-                    'text-lg font-medium'
-                )
-                
-                # 系统运行时间
-                self.status_elements['uptime'] = ui.label('⏱️ 运行时间: 0秒').classes(
-                    'text-lg font-medium font-mono'
-                )
-    
-    def _create_top5_section(self) -> None:
-        """
-        创建TOP5数据展示区域 - 双列布局苹果风格
-        """
-        # 使用响应式双列布局 - 充分拉伸利用空间
-        with ui.row().classes('w-full gap-4 sm:gap-6 lg:gap-8 xl:gap-12 mb-8'):
-            # 左侧：资金费率波动TOP5排行榜 - 自适应宽度
-            with ui.card().classes('flex-1 p-4 sm:p-6 lg:p-8 xl:p-10 backdrop-blur-xl bg-white/5 border border-white/10 shadow-lg rounded-3xl'):
-                # 区域标题
-                ui.label('资金费率波动TOP5排行榜').classes(
-                    'text-2xl md:text-3xl font-bold text-yellow-400 mb-6'
-                )
-                
-                # 创建表格头部
-                self._create_funding_rate_header()
-                
-                # 创建数据行
-                self._create_funding_rate_rows()
-            
-            # 右侧：成交额涨幅排行榜 - 自适应宽度
-            with ui.card().classes('flex-1 p-4 sm:p-6 lg:p-8 xl:p-10 backdrop-blur-xl bg-white/5 border border-white/10 shadow-lg rounded-3xl'):
-                # 区域标题
-                ui.label('📈 成交额涨幅排行榜').classes(
-                    'text-2xl md:text-3xl font-bold text-green-400 mb-6'
-                )
-                
-                # 创建成交额涨幅表格
-                self._create_volume_change_section()
-    
-    def _create_funding_rate_header(self) -> None:
-        """
-        创建资金费率表格头部 - V8版: 合并交易对和费率列
-        """
-        with ui.row().classes('w-full mb-4 pb-3 border-b border-gray-600'):
-            ui.label('排名').classes('w-16 text-center font-semibold text-gray-300 text-base')
-            ui.label('交易对 / 费率').classes('w-48 text-center font-semibold text-gray-300 text-base') # 增加宽度
-            ui.label('波动率').classes('w-28 text-center font-semibold text-gray-300 text-base')
-            ui.label('波动时间').classes('flex-1 text-center font-semibold text-gray-300 text-base')
-    
-    def _create_funding_rate_rows(self) -> None:
-        """
-        创建资金费率TOP5数据行 - V8版: 合并交易对和费率列
-        """
-        for i in range(config.TOP_RANKING_COUNT):
-            with ui.row().classes('w-full py-4 border-b border-gray-700 hover:bg-blue-500/8 hover:-translate-y-0.5 hover:shadow-md transition-all duration-200 items-center'): # 垂直居中
-                # 排名列
-                rank_label = ui.label(f'#{i+1}').classes(
-                    'w-16 text-center text-2xl font-bold text-blue-400'
-                )
-                
-                # 交易对/费率组合列
-                with ui.column().classes('w-48 items-center gap-0'): # 增加宽度，移除间距，水平居中
-                    symbol_label = ui.label('等待数据...').classes('text-white leading-tight') # leading-tight 减少行高
-                    rate_label = ui.label('').classes(
-                        'text-base text-gray-400 font-mono breathing'
-                    )
-
-                # 波动率列
-                volatility_label = ui.label('').classes(
-                    'w-28 text-center'
-                )
-                
-                # 波动时间列
-                time_label = ui.label('').classes(
-                    'flex-1 text-center text-base text-cyan-400 font-medium'
-                )
-                
-                # 保存行元素引用
-                self.top5_rows.append({
-                    'rank': rank_label,
-                    'symbol': symbol_label,
-                    'rate': rate_label,
-                    'volatility': volatility_label,
-                    'time': time_label
-                })
-    
-    def _create_volume_change_section(self) -> None:
-        """
-        创建成交额涨幅排行榜区域 - 苹果风格
-        """
-        # 创建成交额涨幅表格头部
-        with ui.row().classes('w-full mb-4 pb-3 border-b border-gray-600'):
-            ui.label('排名').classes('w-16 text-center font-semibold text-gray-300 text-base')
-            ui.label('交易对').classes('w-28 font-semibold text-gray-300 text-base')
-            ui.label('24h成交额').classes('w-32 font-semibold text-gray-300 text-base')
-            ui.label('涨幅').classes('w-28 font-semibold text-gray-300 text-base')
-            ui.label('更新时间').classes('flex-1 font-semibold text-gray-300 text-base')
-        
-        # 创建成交额涨幅数据行（空状态）
-        for i in range(config.TOP_RANKING_COUNT):
-            with ui.row().classes('w-full py-4 border-b border-gray-700 hover:bg-blue-500/8 hover:-translate-y-0.5 hover:shadow-md transition-all duration-200'):
-                # 排名列
-                ui.label(f'#{i+1}').classes(
-                    'w-16 text-center text-2xl font-bold text-purple-400'
-                )
-                
-                # 交易对列
-                ui.label('待开发...').classes(
-                    'w-28 text-lg font-semibold text-gray-500'
-                )
-                
-                # 24h成交额列
-                ui.label('').classes(
-                    'w-32 text-lg text-gray-500 font-mono'
-                )
-                
-                # 涨幅列
-                ui.label('').classes(
-                    'w-28 text-lg text-gray-500 font-mono'
-                )
-                
-                # 更新时间列
-                ui.label('').classes(
-                    'flex-1 text-base text-gray-500'
-                )
-        
-        # 功能开发提示（移到底部，保持高度一致）
-        with ui.row().classes('w-full mt-6 justify-center'):
-            with ui.row().classes('items-center gap-3 px-4 py-2 backdrop-blur-sm bg-white/10 border border-white/20 hover:bg-white/15 rounded-full transition-all duration-200'):
-                ui.icon('construction', size='sm').classes('text-amber-400')
-                ui.label('功能开发中').classes('text-base text-amber-400 font-medium')
-    
-    def _create_footer(self) -> None:
-        """
-        创建自选池功能区域 - 苹果风格
-        """
-        with ui.card().classes('w-full mt-10 p-4 sm:p-6 lg:p-8 xl:p-10 backdrop-blur-xl bg-white/5 border border-white/10 shadow-lg rounded-3xl'):
-            ui.label('⭐ 自选池').classes('text-2xl font-bold mb-6 text-blue-400')
-            
-            # 自选池功能提示
-            with ui.row().classes('w-full mb-6'):
-                ui.icon('info').classes('text-cyan-400 mr-3')
-                ui.label('自选池功能正在开发中，敬请期待...').classes('text-lg text-gray-300 font-medium')
-            
-            # 预留的功能区域布局
-            with ui.column().classes('w-full gap-6'):
-                # 添加交易对区域
-                with ui.row().classes('w-full items-center gap-4'):
-                    ui.label('添加交易对:').classes('text-lg text-gray-300 w-24 font-medium')
-                    ui.input(placeholder='输入交易对名称，如: BTCUSDT').classes('flex-1 text-lg').props('outlined dense')
-                    ui.button('添加', icon='add').classes('backdrop-blur-sm bg-white/10 border border-white/20 hover:bg-white/15 text-lg px-6 py-2 rounded-lg transition-all duration-200').props('dense')
-                
-                # 自选列表区域
-                with ui.column().classes('w-full'):
-                    ui.label('我的自选:').classes('text-lg text-gray-300 mb-4 font-medium')
-                    
-                    # 空状态提示
-                    with ui.row().classes('w-full justify-center py-12'):
-                        with ui.column().classes('items-center gap-4'):
-                            ui.icon('star_border', size='4em').classes('text-gray-500')
-                            ui.label('暂无自选交易对').classes('text-xl text-gray-500 font-medium')
-                            ui.label('添加您关注的交易对到自选池').classes('text-base text-gray-600')
-                
-                # 快捷操作区域
-                with ui.row().classes('w-full gap-4 mt-6'):
-                    ui.label('快捷添加:').classes('text-lg text-gray-300 font-medium')
-                    ui.button('热门币种', icon='trending_up').classes('backdrop-blur-sm bg-white/10 border border-white/20 hover:bg-white/15 text-base px-4 py-2 rounded-lg transition-all duration-200').props('dense')
-                    ui.button('主流币', icon='currency_bitcoin').classes('backdrop-blur-sm bg-white/10 border border-white/20 hover:bg-white/15 text-base px-4 py-2 rounded-lg transition-all duration-200').props('dense')
-                    ui.button('DeFi', icon='account_balance').classes('backdrop-blur-sm bg-white/10 border border-white/20 hover:bg-white/15 text-base px-4 py-2 rounded-lg transition-all duration-200').props('dense')
-    
-    def _start_update_timer(self) -> None:
-        """
-        启动数据更新定时器 - 优化更新频率
-        """
-        try:
-            # 优化：降低更新频率到2秒，减少性能消耗
-            update_interval = max(config.UI_UPDATE_INTERVAL, 2.0)
-            self.update_timer = ui.timer(
-                interval=update_interval,
-                callback=self.update_display
-            )
-            self.logger.info(f"数据更新定时器已启动 - 间隔: {update_interval}秒")
-            
-            # 注册WebSocket启动钩子 - 基于Context7最佳实践
-            if self.ws_client:
-                app.on_startup(self._startup_websocket_client)
-                self.logger.info("WebSocket启动钩子已注册")
-            
-        except Exception as e:
-            self.logger.error(f"启动更新定时器失败: {e}", exc_info=True)
-    
-    async def _startup_websocket_client(self) -> None:
-        """
-        在NiceGUI启动时异步启动WebSocket客户端
-        基于Context7最佳实践的app.on_startup钩子实现
-        """
-        try:
-            if self.ws_client:
-                self.logger.info("🚀 在NiceGUI事件循环中启动WebSocket客户端...")
-                
-                # 异步启动WebSocket客户端
-                await self.ws_client.start()
-                self.logger.info("✅ WebSocket客户端启动完成")
-                
-                # 启动渐进式状态验证
-                ui.timer(2.0, self._verify_websocket_connection, once=True)
-                
-            else:
-                self.logger.warning("⚠️ WebSocket客户端实例未设置")
-        except Exception as e:
-            self.logger.error(f"❌ 启动WebSocket客户端时发生错误: {e}", exc_info=True)
-    
-    def _verify_websocket_connection(self) -> None:
-        """
-        验证WebSocket连接状态（渐进式检查）
-        基于Context7 websockets最佳实践实现
-        """
-        try:
-            if not self.ws_client:
-                return
-            
-            # 获取详细连接状态
-            connection_status = self._get_websocket_connection_status()
-            
-            if connection_status == "已连接":
-                self.logger.info("✓ WebSocket连接验证成功")
-            elif connection_status == "连接中":
-                self.logger.info("WebSocket正在连接中，继续等待...")
-                # 继续等待，再次检查
-                ui.timer(2.0, self._verify_websocket_connection, once=True)
-            elif connection_status == "已断开":
-                self.logger.warning("WebSocket连接已断开，但可能正在重连...")
-            else:
-                self.logger.info(f"WebSocket状态: {connection_status}")
-                
-        except Exception as e:
-            self.logger.error(f"验证WebSocket连接时发生错误: {e}", exc_info=True)
-    
-    def _get_websocket_connection_status(self) -> str:
-        """
-        获取详细的WebSocket连接状态
-        基于Context7 websockets.connection.Connection API实现
-        
-        Returns:
-            str: 连接状态描述
-        """
-        try:
-            if not self.ws_client:
-                return "未初始化"
-            
-            # 检查WebSocket连接对象
-            if hasattr(self.ws_client, 'websocket') and self.ws_client.websocket:
-                # 检查连接是否关闭
-                if hasattr(self.ws_client.websocket, 'closed'):
-                    if self.ws_client.websocket.closed:
-                        return "已断开"
-                    else:
-                        return "已连接"
-                else:
-                    # 检查连接状态属性
-                    if hasattr(self.ws_client.websocket, 'state'):
-                        state = str(self.ws_client.websocket.state)
-                        if 'OPEN' in state:
-                            return "已连接"
-                        elif 'CONNECTING' in state:
-                            return "连接中"
-                        elif 'CLOSING' in state:
-                            return "断开中"
-                        elif 'CLOSED' in state:
-                            return "已断开"
-                        else:
-                            return f"状态: {state}"
-                    else:
-                        return "已连接"  # 假设连接正常
-            
-            # 检查连接任务状态
-            elif hasattr(self.ws_client, '_connecting') and self.ws_client._connecting:
-                return "连接中"
-            elif hasattr(self.ws_client, '_connection_task'):
-                if self.ws_client._connection_task and not self.ws_client._connection_task.done():
-                    return "连接中"
-                elif self.ws_client._connection_task and self.ws_client._connection_task.done():
-                    if self.ws_client._connection_task.exception():
-                        return "连接失败"
-                    else:
-                        return "已连接"
-            
-            return "未启动"
-            
-        except Exception as e:
-            self.logger.error(f"获取WebSocket状态时出错: {e}", exc_info=True)
-            return "状态未知"
-    
-    def update_display(self) -> None:
-        """
-        更新界面显示数据
-        
-        更新内容:
-        1. 系统状态信息
-        2. TOP5排行数据
-        3. 运行时间统计
-        """
-        try:
-            self.update_count += 1
-            self.last_update_time = time.time()
-            
-            # 更新系统状态
-            self._update_status_display()
-            
-            # 更新TOP5数据
-            self._update_top5_display()
-            
-            # 定期输出更新统计
-            if self.update_count % config.STATS_PRINT_INTERVAL == 0:
-                self.logger.debug(f"界面更新统计 - 更新次数: {self.update_count}")
-                
-        except Exception as e:
-            self.logger.error(f"更新界面显示时发生错误: {e}", exc_info=True)
-    
-    def _update_status_display(self) -> None:
-        """
-        更新系统状态显示
-        """
-        try:
-            # 获取分析器统计信息
-            stats = self.data_analyzer.get_statistics()
-            
-            # 更新连接状态
-            if stats['has_data']:
-                self.status_elements['connection'].text = "🔗 连接状态: ✅ 数据连接正常"
-                self.status_elements['connection'].classes(
-                    replace='text-lg font-medium text-green-400'
-                )
-            else:
-                self.status_elements['connection'].text = "🔗 连接状态: ⚠️ 等待数据连接"
-                self.status_elements['connection'].classes(
-                    replace='text-lg font-medium text-yellow-400 status-pulse'
-                )
-            
-            # 更新数据统计
-            self.status_elements['data_count'].text = f"📈 监控交易对: {stats['total_symbols']}"
-            
-            # 更新最后更新时间
-            if stats['last_update']:
-                update_time = time.strftime('%H:%M:%S', time.localtime(stats['last_update']))
-                self.status_elements['last_update'].text = f"⏰ 最后更新: {update_time}"
-            else:
-                self.status_elements['last_update'].text = "⏰ 最后更新: --"
-            
-            # 更新运行时间
-            uptime = int(time.time() - self.start_time)
-            hours, remainder = divmod(uptime, 3600)
-            minutes, seconds = divmod(remainder, 60)
-            
-            if hours > 0:
-                uptime_text = f"⏱️ 运行时间: {hours}小时{minutes}分{seconds}秒"
-            elif minutes > 0:
-                uptime_text = f"⏱️ 运行时间: {minutes}分{seconds}秒"
-            else:
-                uptime_text = f"⏱️ 运行时间: {seconds}秒"
-            
-            self.status_elements['uptime'].text = uptime_text
-            
-        except Exception as e:
-            self.logger.error(f"更新状态显示时出错: {e}", exc_info=True)
-    
-    def _update_top5_display(self) -> None:
-        """
-        更新TOP5数据显示 - V9版: 增强错误处理和数据验证
-        """
-        try:
-            # 获取TOP5数据
-            top5_data = self.data_analyzer.get_top5_data()
-            
-            # 验证数据有效性
-            if not isinstance(top5_data, list):
-                self.logger.warning(f"TOP5数据格式异常: {type(top5_data)}")
-                top5_data = []
-            
-            # 更新每一行数据
-            for i in range(len(self.top5_rows)):
-                row_elements = self.top5_rows[i]
-                
-                if i < len(top5_data):
-                    # 有数据的行
-                    data = top5_data[i]
-                    # 验证单行数据完整性
-                    if self._validate_row_data(data):
-                        self._update_data_row(row_elements, data, i + 1)
-                    else:
-                        self.logger.warning(f"第{i+1}行数据不完整: {data}")
-                        self._clear_data_row(row_elements, i + 1)
-                else:
-                    # 无数据的行
-                    self._clear_data_row(row_elements, i + 1)
-                    
-        except Exception as e:
-            self.logger.error(f"更新TOP5显示时出错: {e}", exc_info=True)
-            # 发生错误时清空所有行显示
-            for i, row_elements in enumerate(self.top5_rows):
-                self._clear_data_row(row_elements, i + 1)
-    
-    def _format_time_display(self, time_text: str) -> str:
-        """
-        格式化时间显示，去掉秒数部分
-        
-        Args:
-            time_text: 原始时间文本，格式如 "15分钟前 (14:32:05)"
-            
-        Returns:
-            str: 格式化后的时间文本，格式如 "15分钟前 (14:32)"
-        """
-        try:
-            # 使用正则表达式去掉时间中的秒数部分
-            import re
-            # 匹配格式：(HH:MM:SS) 并替换为 (HH:MM)
-            pattern = r'\((\d{2}):(\d{2}):\d{2}\)'
-            replacement = r'(\1:\2)'
-            formatted_text = re.sub(pattern, replacement, time_text)
-            return formatted_text
-        except Exception as e:
-            self.logger.debug(f"格式化时间显示时出错: {e}")
-            # 如果格式化失败，返回原始文本
-            return time_text
-    
-    def _validate_row_data(self, data: Dict[str, Any]) -> bool:
-        """
-        验证单行数据的完整性
-        
-        Args:
-            data: 数据字典
-            
-        Returns:
-            bool: 数据是否有效
-        """
-        required_fields = ['symbol', 'current_rate', 'z_score']
-        
-        if not isinstance(data, dict):
-            return False
-            
-        for field in required_fields:
-            if field not in data:
-                self.logger.debug(f"缺少必需字段: {field}")
-                return False
-                
-        return True
-    
-    def _update_data_row(self, row_elements: Dict[str, Any], data: Dict[str, Any], rank: int) -> None:
-        """
-        更新单行数据显示 - V9版: 适配新的business_core.py数据结构
-        
-        Args:
-            row_elements: 行UI元素字典
-            data: 数据字典
-            rank: 排名
-        """
-        try:
-            # 更新排名
-            row_elements['rank'].text = f"#{rank}"
-            
-            # 更新交易对名称并应用Tailwind样式
-            symbol_display = data['symbol'].replace('USDT', '') if data['symbol'].endswith('USDT') else data['symbol']
-            row_elements['symbol'].text = symbol_display
-            
-            # 根据排名应用不同的Tailwind CSS类
-            if rank == 1:
-                row_elements['symbol'].classes(
-                    replace='text-4xl font-extrabold text-white leading-tight'
-                )
-            elif rank == 2:
-                row_elements['symbol'].classes(
-                    replace='text-3xl font-extrabold text-white leading-tight'
-                )
-            elif rank == 3:
-                row_elements['symbol'].classes(
-                    replace='text-2xl font-extrabold text-white leading-tight'
-                )
-            else:
-                row_elements['symbol'].classes(
-                    replace='text-xl font-bold text-white leading-tight'
-                )
-
-            # 更新当前费率
-            rate_text = f"{data['current_rate']:.6f}%"
-            row_elements['rate'].text = rate_text
-            
-            # 动态生成方向符号 - 适配新的数据结构
-            z_score = data.get('z_score', 0.0)
-            rate_change = data.get('rate_change', 0.0)
-            
-            # 根据rate_change确定+/-符号
-            if rate_change > 0:
-                sign = '+'
-            elif rate_change < 0:
-                sign = '-'
-            else:
-                sign = '' # 无变化时不显示符号
-            
-            # 更新波动率文本 - 使用Z-score的绝对值作为波动率，并防止换行
-            volatility_value = abs(z_score)
-            volatility_text = f"{sign}{volatility_value:.2f}"
-            row_elements['volatility'].text = volatility_text
-            
-            # 应用波动率Tailwind样式 - 根据颜色类别应用相应的Tailwind颜色类，保持宽度和居中对齐
-            color_class = data.get('color_class', 'text-yellow-400')
-            if color_class == 'text-red-400':
-                row_elements['volatility'].classes(
-                    replace='w-28 text-center text-xl font-bold text-red-400'
-                )
-            elif color_class == 'text-green-400':
-                row_elements['volatility'].classes(
-                    replace='w-28 text-center text-xl font-bold text-green-400'
-                )
-            else:
-                row_elements['volatility'].classes(
-                    replace='w-28 text-center text-xl font-bold text-yellow-400'
-                )
-
-            # 更新波动时间，保持宽度和居中对齐
-            time_text = data.get('champion_time_display', '时间未知')
-            # 优化时间显示：去掉秒数，只保留时:分
-            time_text = self._format_time_display(time_text)
-            row_elements['time'].text = time_text
-            row_elements['time'].classes(
-                replace='flex-1 text-center text-base text-cyan-400 font-medium'
-            )
-            
-        except Exception as e:
-            self.logger.error(f"更新数据行时出错: {e}", exc_info=True)
-            # 发生错误时显示调试信息
-            self.logger.debug(f"数据内容: {data}")
-    
-    def _clear_data_row(self, row_elements: Dict[str, Any], rank: int) -> None:
-        """
-        清空数据行显示 - V8版: 适应合并后的UI结构
-        
-        Args:
-            row_elements: 行UI元素字典
-            rank: 排名
-        """
-        try:
-            row_elements['rank'].text = f"#{rank}"
-            row_elements['symbol'].text = "等待数据..."
-            
-            # 应用默认的Tailwind样式
-            row_elements['symbol'].classes(
-                replace='text-xl font-bold text-white leading-tight'
-            )
-            
-            row_elements['rate'].text = ""
-            row_elements['volatility'].text = ""
-            
-            # 应用默认的波动率样式，保持宽度和居中对齐
-            row_elements['volatility'].classes(
-                replace='w-28 text-center text-xl font-bold text-yellow-400'
-            )
-            
-            row_elements['time'].text = ""
-            # 应用默认的时间样式，保持宽度和居中对齐
-            row_elements['time'].classes(
-                replace='flex-1 text-center text-base text-cyan-400 font-medium'
-            )
-            
-        except Exception as e:
-            self.logger.error(f"清空数据行时出错: {e}", exc_info=True)
-    
-    def stop_updates(self) -> None:
-        """
-        停止界面更新
-        """
-        try:
-            if self.update_timer:
-                self.update_timer.cancel()
-                self.update_timer = None
-                self.logger.info("界面更新定时器已停止")
-                
-        except Exception as e:
-            self.logger.error(f"停止界面更新时出错: {e}", exc_info=True)
-    
-    def run(self, host: str = 'localhost', port: int = 8080, show: bool = True) -> None:
-        """
-        启动UI界面
-        
-        Args:
-            host: 服务器主机地址
-            port: 服务器端口
-            show: 是否自动打开浏览器
-        """
-        try:
-            self.logger.info(f"启动UI界面 - {host}:{port}")
-            
-            # 创建界面
-            self.create_interface()
-            
-            # 启动NiceGUI服务器
-            ui.run(
-                host=host,
-                port=port,
-                title=config.UI_TITLE,
-                dark=True,
-                show=show,
-                reload=False
-            )
-            
-        except Exception as e:
-            self.logger.error(f"启动UI界面失败: {e}", exc_info=True)
-            raise
-    
-    def get_status(self) -> Dict[str, Any]:
-        """
-        获取UI管理器状态
-        
-        Returns:
-            Dict: 状态信息
-        """
-        return {
-            'is_initialized': self.is_initialized,
-            'update_count': self.update_count,
-            'last_update_time': self.last_update_time,
-            'uptime': time.time() - self.start_time,
-            'timer_active': self.update_timer is not None,
-            'top5_rows_count': len(self.top5_rows),
-            'status_elements_count': len(self.status_elements)
-        }
-
-# 独立运行测试代码
-if __name__ == "__main__":
-    # 创建模拟数据分析器
-    class MockAnalyzer:
-        def __init__(self):
-            self.start_time = time.time()
-            
-        def get_statistics(self):
-            return {
-                'total_symbols': 498,
-                'data_updates': 100,
-                'last_update': time.time(),
-                'has_data': True
-            }
-        
-        def get_top5_data(self):
-            return [
-                {
-                    'symbol': 'BTCUSDT',
-                    'current_rate': 0.001234,
-                    'volatility': 1.23,
-                    'direction': '上涨',
-                    'direction_symbol': '+',
-                    'color_class': 'text-red-400'    # 红涨
-                },
-                {
-                    'symbol': 'ETHUSDT', 
-                    'current_rate': -0.000567,
-                    'volatility': 0.89,
-                    'direction': '下跌',
-                    'direction_symbol': '-',
-                    'color_class': 'text-green-400'  # 绿跌
-                }
-            ]
-    
-    # 创建UI管理器并测试
-    analyzer = MockAnalyzer()
-    ui_manager = UIManager(analyzer)
-    
-    try:
-        # 创建界面
-        ui_manager.create_interface()
-        
-        print("UI管理器测试启动，访问 http://localhost:8080")
-        print("按 Ctrl+C 停止测试")
-        
-        # 启动NiceGUI
-        ui.run(
-            host='localhost',
-            port=8080,
-            title='UI管理器测试',
-            dark=True,
-            show=True
-        )
-        
-    except KeyboardInterrupt:
-        print("用户中断测试")
-    finally:
-        ui_manager.stop_updates()
-        print("UI管理器测试完成")
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+用户界面管理模块
+负责创建和管理NiceGUI界面，处理数据展示和用户交互
+
+主要功能:
+1. 创建响应式Web界面
+2. 实时更新TOP5数据显示
+3. 管理界面状态和样式
+4. 处理用户交互事件
+"""
+
+import functools
+import re
+import time
+from typing import Dict, List, Optional, Any
+from nicegui import ui, app
+from config import config
+from logger import get_logger
+import asyncio
+
+# 排名→交易对字体样式 / 颜色类别→波动率样式 查找表 - 热路径上
+# 用一次dict探查替代逐条if/elif分支
+_SYMBOL_CLS = {
+    1: 'text-4xl font-extrabold text-white leading-tight',
+    2: 'text-3xl font-extrabold text-white leading-tight',
+    3: 'text-2xl font-extrabold text-white leading-tight',
+}
+_SYMBOL_CLS_DEFAULT = 'text-xl font-bold text-white leading-tight'
+
+_VOL_CLS = {
+    'text-red-400': 'w-28 text-center text-xl font-bold text-red-400',
+    'text-green-400': 'w-28 text-center text-xl font-bold text-green-400',
+}
+_VOL_CLS_DEFAULT = 'w-28 text-center text-xl font-bold text-yellow-400'
+
+# color_idx（0=涨红 1=跌绿 2=中性）→波动率样式 - 与分析器约定的
+# 稳定小整数编码，取下标即得样式，行渲染无需任何字符串比较；
+# 分析器侧保持数值输出，为内核全程走NumPy/Numba留出空间
+_COLOR_IDX_CLS = (
+    _VOL_CLS['text-red-400'],
+    _VOL_CLS['text-green-400'],
+    _VOL_CLS_DEFAULT,
+)
+
+# 时间展示裁剪正则 - (HH:MM:SS)→(HH:MM)，模块加载时编译一次，
+# 免去每行每tick经re缓存重新取用模式
+_TIME_RE = re.compile(r'\((\d{2}):(\d{2}):\d{2}\)')
+
+@functools.lru_cache(maxsize=256)
+def _format_time_cached(time_text: str) -> str:
+    """
+    格式化时间显示，去掉秒数部分 - (HH:MM:SS)→(HH:MM)
+
+    纯函数（str→str），同一冠军行的时间文本跨行跨tick大量重复，
+    LRU记忆后稳态下正则完全不执行，退化为一次dict探查
+    """
+    return _TIME_RE.sub(r'(\1:\2)', time_text)
+
+
+# 单行数据必备字段 - frozenset.issubset在C层一次完成全部键检查
+_REQUIRED_ROW_KEYS = frozenset(('symbol', 'current_rate', 'z_score'))
+
+# TOP5行元组的字段下标 - 行模式固定，用定长元组+常量下标取代
+# 字典键查找（PyTuple_GET_ITEM vs 哈希+探查）
+_ROW_RANK, _ROW_SYMBOL, _ROW_RATE, _ROW_VOL, _ROW_TIME, _ROW_STATE = range(6)
+
+# 排名文案 "#1".."#N" - 排行榜行数固定，导入期生成一次，
+# 热路径取下标即得，免去每行每tick的f-string分配
+_RANK_STRINGS = tuple(f"#{i + 1}" for i in range(config.TOP_RANKING_COUNT))
+
+# 静态CSS与重复出现的Tailwind类串 - 提升到模块级常量，进程内只
+# 分配一次，create_interface每次执行（NiceGUI按客户端建页）直接复用
+_MINIMAL_CSS = """
+        <style>
+        /* 全局提升基础字体粗细度，使其更适合金融数据阅读 */
+        body, html, .nicegui-content, .q-item__label, .q-field__label, .q-btn__content {
+            font-weight: 600 !important; /* 600是'semibold'半粗体 */
+        }
+
+        /* 对于已经标记为'font-bold'的元素，让它们更粗，拉开对比 */
+        .font-bold, b, strong {
+            font-weight: 800 !important; /* 800是'extrabold'特粗体 */
+        }
+
+        /* 状态指示器脉冲动画 - NiceGUI暂无直接替代 */
+        @keyframes status-pulse {
+            0%, 100% { opacity: 1; transform: scale(1); }
+            50% { opacity: 0.8; transform: scale(1.02); }
+        }
+        .status-pulse { animation: status-pulse 2s cubic-bezier(0.4, 0.0, 0.6, 1) infinite; }
+
+        /* 呼吸动画效果 - 用于费率显示 */
+        @keyframes breathing {
+            0%, 100% { opacity: 1; transform: scale(1); }
+            50% { opacity: 0.6; transform: scale(1.03); }
+        }
+        .breathing { animation: breathing 2.5s ease-in-out infinite; }
+        </style>
+        """
+
+# 毛玻璃卡片基础样式及其三种使用场景
+_GLASS_CARD = 'backdrop-blur-xl bg-white/5 border border-white/10 shadow-lg rounded-3xl'
+_STATUS_CARD_CLS = 'w-full mb-8 p-6 ' + _GLASS_CARD
+_PANEL_CARD_CLS = 'flex-1 p-4 sm:p-6 lg:p-8 xl:p-10 ' + _GLASS_CARD
+_FOOTER_CARD_CLS = 'w-full mt-10 p-4 sm:p-6 lg:p-8 xl:p-10 ' + _GLASS_CARD
+
+# 数据行与毛玻璃按钮样式
+_DATA_ROW_CLS = ('w-full py-4 border-b border-gray-700 hover:bg-blue-500/8 '
+                 'hover:-translate-y-0.5 hover:shadow-md transition-all duration-200')
+_GLASS_BTN_CLS = ('backdrop-blur-sm bg-white/10 border border-white/20 '
+                  'hover:bg-white/15 text-base px-4 py-2 rounded-lg '
+                  'transition-all duration-200')
+
+# WebSocket连接状态枚举→展示文案 - O(1)查表替代逐个子串匹配；
+# websockets未安装（或API变动）时置None，回退到字符串匹配路径
+try:
+    from websockets.protocol import State as _WsState
+    _WS_STATE_MAP = {
+        _WsState.OPEN: "已连接",
+        _WsState.CONNECTING: "连接中",
+        _WsState.CLOSING: "断开中",
+        _WsState.CLOSED: "已断开",
+    }
+except ImportError:
+    _WS_STATE_MAP = None
+
+# 连接状态标签的两种形态 - 显式状态机按has_data跳变写入，
+# 99%的tick上连接状态不变，不产生任何classes补丁帧
+_CONN_OK_TEXT = "🔗 连接状态: ✅ 数据连接正常"
+_CONN_OK_CLS = 'text-lg font-medium text-green-400'
+_CONN_WAIT_TEXT = "🔗 连接状态: ⚠️ 等待数据连接"
+_CONN_WAIT_CLS = 'text-lg font-medium text-yellow-400 status-pulse'
+
+# 运行时间文案模板 - 按 (hours>0)*2 + (minutes>0) 两位索引选取，
+# 替代每tick的多分支f-string拼接
+_UPTIME_TEMPLATES = (
+    "⏱️ 运行时间: {s}秒",
+    "⏱️ 运行时间: {m}分{s}秒",
+    "⏱️ 运行时间: {h}小时{m}分{s}秒",
+    "⏱️ 运行时间: {h}小时{m}分{s}秒",
+)
+
+class UIManager:
+    """
+    用户界面管理器 - 负责界面创建和数据展示
+    
+    职责:
+    - 创建和管理Web界面组件
+    - 实时更新数据显示
+    - 处理界面样式和布局
+    - 管理界面状态和交互
+    """
+    
+    def __init__(self, data_analyzer, ws_client=None):
+        """
+        初始化UI管理器
+        
+        Args:
+            data_analyzer: 数据分析器实例，用于获取显示数据
+            ws_client: WebSocket客户端实例（可选）
+        """
+        # 获取模块专用logger
+        self.logger = get_logger(__name__)
+        
+        # ==================== 核心组件 ====================
+        self.data_analyzer = data_analyzer  # 数据分析器引用
+        self.ws_client = ws_client  # WebSocket客户端引用
+        
+        # ==================== UI组件引用 ====================
+        self.status_elements: Dict[str, Any] = {}  # 状态显示元素
+        self.top5_rows: List[tuple] = []  # TOP5数据行元素（定长元组，下标见_ROW_*）
+        self.update_timer: Optional[Any] = None  # 更新定时器
+        self._volume_rows_container: Optional[Any] = None  # 成交额行懒构建容器
+        self._volume_section_built: bool = False
+        self._watchlist_container: Optional[Any] = None    # 自选池懒构建容器
+        self._watchlist_built: bool = False
+        
+        # ==================== 界面状态 ====================
+        self.is_initialized: bool = False  # 界面是否已初始化
+        self.last_update_time: Optional[float] = None  # 最后更新时间
+        self.update_count: int = 0  # 更新次数
+        self.start_time: float = time.time()  # 启动时间
+
+        # ==================== 脏标记调度 ====================
+        # TOP5数据带版本号（data_analyzer.version），版本未变时整轮
+        # 重绘直接跳过；mark_dirty通过50ms合并窗口吸收数据突发，
+        # 每客户端刷新频率被压到≤20次/秒
+        self._last_rendered_version: int = -1  # 最后渲染的数据版本号
+        self._last_top5_hash: Optional[int] = None  # 最后渲染内容的哈希（无版本号时兜底）
+        self._flush_scheduled: bool = False    # 合并窗口是否已排期
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # NiceGUI事件循环
+
+        # 数据驱动刷新 - 分析器TOP5变化时回调mark_dirty（排名线程→
+        # 事件循环），界面只在数据真正变化时重绘，不再固定轮询
+        if hasattr(data_analyzer, 'add_listener'):
+            data_analyzer.add_listener(self.mark_dirty)
+        # 状态栏每个标签最后写入的文本/样式，值未变时跳过NiceGUI写入
+        self._status_cache: Dict[str, Any] = {}
+        self._last_uptime_int: int = -1             # 最后渲染的整秒运行时长
+        self._last_update_epoch: Optional[float] = None  # 最后渲染的数据更新时刻
+        self._ws_probe: Optional[str] = None        # ws连接对象形态（首次探测后缓存）
+        self._conn_state: Optional[bool] = None     # 连接标签状态机（has_data跳变才写入）
+
+        self.logger.info("UI管理器初始化完成")
+    
+    def create_interface(self) -> None:
+        """
+        创建完整的用户界面
+        
+        界面结构:
+        1. 页面标题和配置
+        2. 系统状态信息栏
+        3. TOP5数据展示区域
+        4. 页面底部说明信息
+        """
+        try:
+            # 设置页面基础配置
+            self._setup_page_config()
+            
+            # 创建主界面布局 - 充分利用屏幕宽度
+            with ui.column().classes('w-full mx-auto px-4 sm:px-6 lg:px-8 xl:px-12 2xl:px-16'):
+                # 创建各个界面区域 - 状态栏已移至底部
+                self._create_header()
+                self._create_top5_section()
+                self._create_footer()
+                self._create_status_section()
+            
+            # 启动数据更新定时器
+            self._start_update_timer()
+            
+            self.is_initialized = True
+            self.logger.info("用户界面创建完成")
+            
+        except Exception as e:
+            self.logger.error(f"创建用户界面时发生错误: {e}", exc_info=True)
+            raise
+    
+    def _setup_page_config(self) -> None:
+        """
+        设置页面基础配置
+        """
+        # 启用深色模式
+        ui.dark_mode().enable()
+        
+        # 设置页面标题
+        ui.page_title(config.UI_TITLE)
+        
+        # 添加最小化必要CSS - 仅包含动画效果
+        ui.add_head_html(self._get_minimal_css())
+    
+    def _get_minimal_css(self) -> str:
+        """
+        获取最小化的必要CSS - 基于Context7最佳实践
+        包含动画效果和全局字体加粗优化，适合金融数据阅读
+        """
+        return _MINIMAL_CSS
+    
+    def _create_header(self) -> None:
+        """
+        创建页面标题区域 - 简洁设计（无标题）
+        """
+        # 移除所有标题，让界面更简洁专业
+        pass
+    
+    def _create_status_section(self) -> None:
+        """
+        创建系统状态信息区域 - 使用Tailwind CSS毛玻璃效果
+        """
+        with ui.card().classes(_STATUS_CARD_CLS):
+            ui.label('📊 系统状态').classes('text-2xl font-semibold mb-4 text-green-400')
+            
+            with ui.row().classes('w-full justify-between items-center flex-wrap gap-6'):
+                # 连接状态
+                self.status_elements['connection'] = ui.label('🔗 连接状态: 初始化中...').classes(
+                    'text-lg font-medium status-pulse'
+                )
+                
+                # 数据统计
+                self.status_elements['data_count'] = ui.label('📈 监控交易对: 0').classes(
+                    'text-lg font-medium font-mono'
+                )
+                
+                # 更新时间
+                self.status_elements['last_update'] = ui.label('⏰ 最后更新: --').classes(
+                    'text-lg font-medium'
+                )
+                
+                # 系统运行时间
+                self.status_elements['uptime'] = ui.label('⏱️ 运行时间: 0秒').classes(
+                    'text-lg font-medium font-mono'
+                )
+    
+    def _create_top5_section(self) -> None:
+        """
+        创建TOP5数据展示区域 - 双列布局苹果风格
+        """
+        # 使用响应式双列布局 - 充分拉伸利用空间
+        with ui.row().classes('w-full gap-4 sm:gap-6 lg:gap-8 xl:gap-12 mb-8'):
+            # 左侧：资金费率波动TOP5排行榜 - 自适应宽度
+            with ui.card().classes(_PANEL_CARD_CLS):
+                # 区域标题
+                ui.label('资金费率波动TOP5排行榜').classes(
+                    'text-2xl md:text-3xl font-bold text-yellow-400 mb-6'
+                )
+                
+                # 创建表格头部
+                self._create_funding_rate_header()
+                
+                # 创建数据行
+                self._create_funding_rate_rows()
+            
+            # 右侧：成交额涨幅排行榜 - 自适应宽度
+            with ui.card().classes(_PANEL_CARD_CLS):
+                # 区域标题
+                ui.label('📈 成交额涨幅排行榜').classes(
+                    'text-2xl md:text-3xl font-bold text-green-400 mb-6'
+                )
+                
+                # 创建成交额涨幅表格
+                self._create_volume_change_section()
+    
+    def _create_funding_rate_header(self) -> None:
+        """
+        创建资金费率表格头部 - V8版: 合并交易对和费率列
+        """
+        with ui.row().classes('w-full mb-4 pb-3 border-b border-gray-600'):
+            ui.label('排名').classes('w-16 text-center font-semibold text-gray-300 text-base')
+            ui.label('交易对 / 费率').classes('w-48 text-center font-semibold text-gray-300 text-base') # 增加宽度
+            ui.label('波动率').classes('w-28 text-center font-semibold text-gray-300 text-base')
+            ui.label('波动时间').classes('flex-1 text-center font-semibold text-gray-300 text-base')
+    
+    def _create_funding_rate_rows(self) -> None:
+        """
+        创建资金费率TOP5数据行 - V8版: 合并交易对和费率列
+
+        行部件只在建界面时实例化这一次，引用存入top5_rows；此后
+        刷新路径仅改写既有label的text/classes（配合行内_state写缓存
+        去重），绝不重建部件——新建Vue组件注册是NiceGUI刷新循环中
+        最贵的操作，必须保持在热路径之外
+        """
+        for i in range(config.TOP_RANKING_COUNT):
+            with ui.row().classes(_DATA_ROW_CLS + ' items-center'): # 垂直居中
+                # 排名列
+                rank_label = ui.label(_RANK_STRINGS[i]).classes(
+                    'w-16 text-center text-2xl font-bold text-blue-400'
+                )
+                
+                # 交易对/费率组合列
+                with ui.column().classes('w-48 items-center gap-0'): # 增加宽度，移除间距，水平居中
+                    symbol_label = ui.label('等待数据...').classes('text-white leading-tight') # leading-tight 减少行高
+                    rate_label = ui.label('').classes(
+                        'text-base text-gray-400 font-mono breathing'
+                    )
+
+                # 波动率列
+                volatility_label = ui.label('').classes(
+                    'w-28 text-center'
+                )
+                
+                # 波动时间列
+                time_label = ui.label('').classes(
+                    'flex-1 text-center text-base text-cyan-400 font-medium'
+                )
+                
+                # 保存行元素引用 - 定长元组按_ROW_*下标访问；末位
+                # _state缓存每个元素最后写入的文本/样式，值未变时跳过
+                # NiceGUI写入（省掉整条JSON补丁编码与websocket推送）
+                self.top5_rows.append((
+                    rank_label,
+                    symbol_label,
+                    rate_label,
+                    volatility_label,
+                    time_label,
+                    {
+                        'rank': None, 'symbol': None, 'symbol_cls': None,
+                        'rate': None, 'vol': None, 'vol_cls': None,
+                        'time': None, 'time_cls': None,
+                    },
+                ))
+    
+    def _create_volume_change_section(self) -> None:
+        """
+        创建成交额涨幅排行榜区域 - 苹果风格
+
+        功能尚未上线（"待开发"），首屏只渲染表头和占位提示；完整的
+        数据行等到enable_volume_section()被调用时才懒构建，省下每个
+        客户端连接时约25个无内容部件的创建与首帧传输
+        """
+        # 创建成交额涨幅表格头部
+        with ui.row().classes('w-full mb-4 pb-3 border-b border-gray-600'):
+            ui.label('排名').classes('w-16 text-center font-semibold text-gray-300 text-base')
+            ui.label('交易对').classes('w-28 font-semibold text-gray-300 text-base')
+            ui.label('24h成交额').classes('w-32 font-semibold text-gray-300 text-base')
+            ui.label('涨幅').classes('w-28 font-semibold text-gray-300 text-base')
+            ui.label('更新时间').classes('flex-1 font-semibold text-gray-300 text-base')
+
+        # 数据行容器 - 行部件在数据通道真正产出时才构建
+        self._volume_rows_container = ui.column().classes('w-full')
+        self._volume_section_built = False
+
+        # 功能开发提示
+        with ui.row().classes('w-full mt-6 justify-center'):
+            with ui.row().classes('items-center gap-3 px-4 py-2 backdrop-blur-sm bg-white/10 border border-white/20 hover:bg-white/15 rounded-full transition-all duration-200'):
+                ui.icon('construction', size='sm').classes('text-amber-400')
+                ui.label('功能开发中').classes('text-base text-amber-400 font-medium')
+
+    def enable_volume_section(self) -> None:
+        """
+        懒构建成交额涨幅数据行 - 在成交额数据通道首次产出时调用
+        """
+        if self._volume_section_built:
+            return
+        self._volume_section_built = True
+
+        with self._volume_rows_container:
+            for i in range(config.TOP_RANKING_COUNT):
+                with ui.row().classes(_DATA_ROW_CLS):
+                    # 排名列
+                    ui.label(_RANK_STRINGS[i]).classes(
+                        'w-16 text-center text-2xl font-bold text-purple-400'
+                    )
+                    # 交易对列
+                    ui.label('等待数据...').classes(
+                        'w-28 text-lg font-semibold text-gray-500'
+                    )
+                    # 24h成交额列
+                    ui.label('').classes(
+                        'w-32 text-lg text-gray-500 font-mono'
+                    )
+                    # 涨幅列
+                    ui.label('').classes(
+                        'w-28 text-lg text-gray-500 font-mono'
+                    )
+                    # 更新时间列
+                    ui.label('').classes(
+                        'flex-1 text-base text-gray-500'
+                    )
+
+    def _create_footer(self) -> None:
+        """
+        创建自选池功能区域 - 苹果风格
+
+        功能尚未上线，首屏只渲染标题和占位提示；输入框/列表/快捷
+        按钮等重部件等enable_watchlist_section()被调用时才懒构建
+        """
+        with ui.card().classes(_FOOTER_CARD_CLS):
+            ui.label('⭐ 自选池').classes('text-2xl font-bold mb-6 text-blue-400')
+
+            # 自选池功能提示
+            with ui.row().classes('w-full mb-6'):
+                ui.icon('info').classes('text-cyan-400 mr-3')
+                ui.label('自选池功能正在开发中，敬请期待...').classes('text-lg text-gray-300 font-medium')
+
+            # 功能区域容器 - 内部部件在功能上线时才构建
+            self._watchlist_container = ui.column().classes('w-full gap-6')
+            self._watchlist_built = False
+
+    def enable_watchlist_section(self) -> None:
+        """
+        懒构建自选池交互区域 - 在自选池功能上线时调用
+        """
+        if self._watchlist_built:
+            return
+        self._watchlist_built = True
+
+        with self._watchlist_container:
+            # 添加交易对区域
+            with ui.row().classes('w-full items-center gap-4'):
+                ui.label('添加交易对:').classes('text-lg text-gray-300 w-24 font-medium')
+                ui.input(placeholder='输入交易对名称，如: BTCUSDT').classes('flex-1 text-lg').props('outlined dense')
+                ui.button('添加', icon='add').classes('backdrop-blur-sm bg-white/10 border border-white/20 hover:bg-white/15 text-lg px-6 py-2 rounded-lg transition-all duration-200').props('dense')
+
+            # 自选列表区域
+            with ui.column().classes('w-full'):
+                ui.label('我的自选:').classes('text-lg text-gray-300 mb-4 font-medium')
+
+                # 空状态提示
+                with ui.row().classes('w-full justify-center py-12'):
+                    with ui.column().classes('items-center gap-4'):
+                        ui.icon('star_border', size='4em').classes('text-gray-500')
+                        ui.label('暂无自选交易对').classes('text-xl text-gray-500 font-medium')
+                        ui.label('添加您关注的交易对到自选池').classes('text-base text-gray-600')
+
+            # 快捷操作区域
+            with ui.row().classes('w-full gap-4 mt-6'):
+                ui.label('快捷添加:').classes('text-lg text-gray-300 font-medium')
+                ui.button('热门币种', icon='trending_up').classes(_GLASS_BTN_CLS).props('dense')
+                ui.button('主流币', icon='currency_bitcoin').classes(_GLASS_BTN_CLS).props('dense')
+                ui.button('DeFi', icon='account_balance').classes(_GLASS_BTN_CLS).props('dense')
+    
+    def _start_update_timer(self) -> None:
+        """
+        启动数据更新定时器 - 优化更新频率
+        """
+        try:
+            # 界面构建发生在共享的auto-index页面上（run()只执行一次），
+            # 所有客户端复用同一棵元素树、同一个定时器和同一个数据
+            # 监听器，分析器读取成本与客户端数无关；这里短路保证即使
+            # create_interface被再次调用也不会叠加出第二条更新链路
+            if self.update_timer is not None:
+                return
+
+            # 捕获事件循环，供排名线程跨线程调度mark_dirty
+            app.on_startup(self._capture_loop)
+
+            if hasattr(self.data_analyzer, 'add_listener'):
+                # 推送驱动：数据变化经mark_dirty触发重绘，定时器退化
+                # 为10秒慢心跳，只负责运行时间等与数据无关的状态栏项
+                self.update_timer = ui.timer(10.0, self._tick_heartbeat)
+                self.logger.info("数据推送刷新已启用 - 心跳间隔: 10秒")
+            else:
+                # 分析器不支持变化通知时回退到固定间隔轮询
+                update_interval = max(config.UI_UPDATE_INTERVAL, 2.0)
+                self.update_timer = ui.timer(
+                    interval=update_interval,
+                    callback=self.update_display
+                )
+                self.logger.info(f"数据更新定时器已启动 - 间隔: {update_interval}秒")
+
+            # 注册WebSocket启动钩子 - 基于Context7最佳实践
+            if self.ws_client:
+                app.on_startup(self._startup_websocket_client)
+                self.logger.info("WebSocket启动钩子已注册")
+            
+        except Exception as e:
+            self.logger.error(f"启动更新定时器失败: {e}", exc_info=True)
+    
+    def _tick_heartbeat(self) -> None:
+        """
+        慢心跳 - 推送驱动模式下仅刷新状态栏（运行时间/连接状态），
+        经过memoization后未变化的标签不会产生任何NiceGUI写入
+        """
+        try:
+            self._update_status_display()
+        except Exception as e:
+            self.logger.error(f"心跳刷新状态栏时出错: {e}", exc_info=True)
+
+    async def _startup_websocket_client(self) -> None:
+        """
+        在NiceGUI启动时异步启动WebSocket客户端
+        基于Context7最佳实践的app.on_startup钩子实现
+        """
+        try:
+            if self.ws_client:
+                self.logger.info("🚀 在NiceGUI事件循环中启动WebSocket客户端...")
+                
+                # 异步启动WebSocket客户端
+                await self.ws_client.start()
+                self.logger.info("✅ WebSocket客户端启动完成")
+
+                # 等待连接建立事件 - 客户端在打开/断开时set/clear该
+                # 事件，直接await即可，无需2秒定时器反复轮询状态
+                connected_event = getattr(self.ws_client, 'connected_event', None)
+                if connected_event is not None:
+                    try:
+                        await asyncio.wait_for(connected_event.wait(), timeout=30)
+                        self.logger.info("✓ WebSocket连接验证成功")
+                    except asyncio.TimeoutError:
+                        self.logger.warning("⚠️ WebSocket 30秒内未建立连接，后台继续重连...")
+                else:
+                    # 旧客户端没有连接事件时保留渐进式轮询验证
+                    ui.timer(2.0, self._verify_websocket_connection, once=True)
+
+            else:
+                self.logger.warning("⚠️ WebSocket客户端实例未设置")
+        except Exception as e:
+            self.logger.error(f"❌ 启动WebSocket客户端时发生错误: {e}", exc_info=True)
+    
+    def _verify_websocket_connection(self) -> None:
+        """
+        验证WebSocket连接状态（渐进式检查）
+        基于Context7 websockets最佳实践实现
+        """
+        try:
+            if not self.ws_client:
+                return
+            
+            # 获取详细连接状态
+            connection_status = self._get_websocket_connection_status()
+            
+            if connection_status == "已连接":
+                self.logger.info("✓ WebSocket连接验证成功")
+            elif connection_status == "连接中":
+                self.logger.info("WebSocket正在连接中，继续等待...")
+                # 继续等待，再次检查
+                ui.timer(2.0, self._verify_websocket_connection, once=True)
+            elif connection_status == "已断开":
+                self.logger.warning("WebSocket连接已断开，但可能正在重连...")
+            else:
+                self.logger.info(f"WebSocket状态: {connection_status}")
+                
+        except Exception as e:
+            self.logger.error(f"验证WebSocket连接时发生错误: {e}", exc_info=True)
+    
+    def _get_websocket_connection_status(self) -> str:
+        """
+        获取详细的WebSocket连接状态
+        基于Context7 websockets.connection.Connection API实现
+        
+        Returns:
+            str: 连接状态描述
+        """
+        try:
+            ws_client = self.ws_client
+            if not ws_client:
+                return "未初始化"
+
+            ws = getattr(ws_client, 'websocket', None)
+            if ws is not None:
+                # 连接对象形态只探测一次并缓存，之后每次调用直接走
+                # 对应分支的属性访问，不再重复hasattr逐项试探
+                probe = self._ws_probe
+                if probe is None:
+                    if hasattr(ws, 'closed'):
+                        probe = 'closed_flag'
+                    elif hasattr(ws, 'state'):
+                        probe = 'state_enum'
+                    else:
+                        probe = 'opaque'
+                    self._ws_probe = probe
+
+                if probe == 'closed_flag':
+                    return "已断开" if ws.closed else "已连接"
+                if probe == 'state_enum':
+                    state = ws.state
+                    if _WS_STATE_MAP is not None:
+                        return _WS_STATE_MAP.get(state, f"状态: {state}")
+                    # 枚举不可用时回退到字符串匹配
+                    state_str = str(state)
+                    if 'OPEN' in state_str:
+                        return "已连接"
+                    if 'CONNECTING' in state_str:
+                        return "连接中"
+                    if 'CLOSING' in state_str:
+                        return "断开中"
+                    if 'CLOSED' in state_str:
+                        return "已断开"
+                    return f"状态: {state_str}"
+                return "已连接"  # 形态未知时假设连接正常
+
+            # 检查连接任务状态
+            if getattr(ws_client, '_connecting', False):
+                return "连接中"
+            task = getattr(ws_client, 'connection_task', None)
+            if task is not None:
+                if not task.done():
+                    return "连接中"
+                return "连接失败" if task.exception() else "已连接"
+
+            return "未启动"
+
+        except Exception as e:
+            self.logger.error(f"获取WebSocket状态时出错: {e}", exc_info=True)
+            return "状态未知"
+    
+    async def _capture_loop(self) -> None:
+        """在NiceGUI启动时捕获事件循环，供跨线程调度刷新使用"""
+        self._loop = asyncio.get_running_loop()
+
+    def mark_dirty(self) -> None:
+        """
+        标记数据已变化，请求一次界面刷新
+
+        可从任意线程调用（排名线程通过call_soon_threadsafe切换到
+        事件循环）；同一50ms合并窗口内的多次调用只排期一次刷新，
+        数据突发时把重绘频率限制在每客户端≤20次/秒
+        """
+        if not self._flush_scheduled:
+            loop = self._loop
+            if loop is None:
+                # 事件循环尚未启动，无法排期；保持标记为False，
+                # 循环就绪后的下一次数据变化会正常触发首次刷新
+                return
+            self._flush_scheduled = True
+            loop.call_soon_threadsafe(self._schedule_flush)
+
+    def _schedule_flush(self) -> None:
+        """在事件循环线程上开启50ms合并窗口"""
+        self._loop.call_later(0.05, self._flush)
+
+    def _flush(self) -> None:
+        """
+        合并窗口到期，执行一次真实刷新并清除排期标记
+
+        整个刷新（状态栏+TOP5全部行）在一次同步调用内完成，期间
+        产生的所有元素写入落在NiceGUI同一个outbox批次里，最终作为
+        单个WebSocket帧下发——等效于"批量更新"，无需逐元素send
+        """
+        self._flush_scheduled = False
+        self.update_display()
+
+    def update_display(self) -> None:
+        """
+        更新界面显示数据
+
+        更新内容:
+        1. 系统状态信息
+        2. TOP5排行数据
+        3. 运行时间统计
+
+        注意：本方法必须保持同步执行（内部不得await）。NiceGUI把
+        元素更新暂存在客户端outbox里、每个事件循环迭代合并冲刷
+        一次，整轮更新因此只产生一个websocket帧；一旦中途让出
+        事件循环，写入就会被拆散成多帧推送
+
+        get_statistics/get_top5_data直接内联调用：两者都只读无锁
+        快照（微秒级），经线程池/run_in_executor中转的话手续费比
+        活还贵，不要给它们套executor
+        """
+        try:
+            self.update_count += 1
+            self.last_update_time = time.time()
+
+            # 更新系统状态
+            self._update_status_display()
+
+            # 更新TOP5数据 - 版本号未变说明内容与上次渲染完全一致，
+            # 整轮行更新直接跳过（空闲行情下省掉全部NiceGUI元素diff）
+            version = getattr(self.data_analyzer, 'version', None)
+            if version is None or version != self._last_rendered_version:
+                self._update_top5_display()
+                if version is not None:
+                    self._last_rendered_version = version
+
+            # 定期输出更新统计
+            if self.update_count % config.STATS_PRINT_INTERVAL == 0:
+                self.logger.debug(f"界面更新统计 - 更新次数: {self.update_count}")
+
+        except Exception as e:
+            self.logger.error(f"更新界面显示时发生错误: {e}", exc_info=True)
+    
+    def _update_status_display(self) -> None:
+        """
+        更新系统状态显示
+        """
+        try:
+            # 获取分析器统计信息
+            stats = self.data_analyzer.get_statistics()
+            cache = self._status_cache
+
+            # 更新连接状态 - 显式状态机：只在has_data发生跳变时写入
+            new_state = bool(stats['has_data'])
+            if new_state != self._conn_state:
+                self._conn_state = new_state
+                connection = self.status_elements['connection']
+                if new_state:
+                    connection.text = _CONN_OK_TEXT
+                    connection.classes(replace=_CONN_OK_CLS)
+                else:
+                    connection.text = _CONN_WAIT_TEXT
+                    connection.classes(replace=_CONN_WAIT_CLS)
+
+            # 更新数据统计
+            count_text = f"📈 监控交易对: {stats['total_symbols']}"
+            if cache.get('data_count') != count_text:
+                self.status_elements['data_count'].text = count_text
+                cache['data_count'] = count_text
+
+            # 更新最后更新时间 - 仅当数据时间戳真的变化时才重新格式化
+            last_update = stats['last_update']
+            if last_update != self._last_update_epoch:
+                self._last_update_epoch = last_update
+                if last_update:
+                    # 手工拼HH:MM:SS - 避开strftime的locale感知C路径，
+                    # localtime+f-string即可覆盖这里的固定格式
+                    lt = time.localtime(last_update)
+                    update_text = (f"⏰ 最后更新: "
+                                   f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}")
+                else:
+                    update_text = "⏰ 最后更新: --"
+                if cache.get('last_update') != update_text:
+                    self.status_elements['last_update'].text = update_text
+                    cache['last_update'] = update_text
+
+            # 更新运行时间 - 仍停留在同一整秒内时跳过整段重建
+            uptime = int(time.time() - self.start_time)
+            if uptime != self._last_uptime_int:
+                self._last_uptime_int = uptime
+                hours, remainder = divmod(uptime, 3600)
+                minutes, seconds = divmod(remainder, 60)
+                uptime_text = _UPTIME_TEMPLATES[(hours > 0) * 2 + (minutes > 0)].format(
+                    h=hours, m=minutes, s=seconds
+                )
+                self.status_elements['uptime'].text = uptime_text
+                cache['uptime'] = uptime_text
+
+        except Exception as e:
+            self.logger.error(f"更新状态显示时出错: {e}", exc_info=True)
+    
+    def _update_top5_display(self) -> None:
+        """
+        更新TOP5数据显示 - V9版: 增强错误处理和数据验证
+        """
+        try:
+            # 获取TOP5数据
+            top5_data = self.data_analyzer.get_top5_data()
+            
+            # 验证数据有效性（生产端发布list快照，测试端允许只读元组）
+            if not isinstance(top5_data, (list, tuple)):
+                self.logger.warning(f"TOP5数据格式异常: {type(top5_data)}")
+                top5_data = ()
+
+            # 内容哈希短路：仅用于不带版本号的分析器（轮询回退路径）。
+            # 生产路径由版本号门+行内写缓存去重，不走这里——否则
+            # 每秒变化的champion_time_display等字段会被整轮跳过冻结
+            if getattr(self.data_analyzer, 'version', None) is None:
+                # 哈希必须覆盖全部被渲染的字段，漏掉的字段会在
+                # 哈希未变时停更
+                content_hash = hash(tuple(
+                    (d.get('symbol'), d.get('display_symbol'),
+                     d.get('current_rate'), d.get('z_score'),
+                     d.get('volatility_text'), d.get('color_idx'),
+                     d.get('color_class'), d.get('champion_time_display'))
+                    for d in top5_data if isinstance(d, dict)
+                ))
+                if content_hash == self._last_top5_hash:
+                    return
+                self._last_top5_hash = content_hash
+
+
+            # 更新每一行数据（热循环：方法/列表先绑定到局部变量，
+            # 省去每行一次的实例属性查找）
+            top5_rows = self.top5_rows
+            validate = self._validate_row_data
+            update_row = self._update_data_row
+            clear_row = self._clear_data_row
+            data_count = len(top5_data)
+            for i in range(len(top5_rows)):
+                row_elements = top5_rows[i]
+
+                if i < data_count:
+                    # 有数据的行
+                    data = top5_data[i]
+                    # 验证单行数据完整性
+                    if validate(data):
+                        update_row(row_elements, data, i + 1)
+                    else:
+                        self.logger.warning(f"第{i+1}行数据不完整: {data}")
+                        clear_row(row_elements, i + 1)
+                else:
+                    # 无数据的行
+                    clear_row(row_elements, i + 1)
+                    
+        except Exception as e:
+            self.logger.error(f"更新TOP5显示时出错: {e}", exc_info=True)
+            # 发生错误时清空所有行显示
+            for i, row_elements in enumerate(self.top5_rows):
+                self._clear_data_row(row_elements, i + 1)
+    
+    def _format_time_display(self, time_text: str) -> str:
+        """
+        格式化时间显示，去掉秒数部分
+        
+        Args:
+            time_text: 原始时间文本，格式如 "15分钟前 (14:32:05)"
+            
+        Returns:
+            str: 格式化后的时间文本，格式如 "15分钟前 (14:32)"
+        """
+        try:
+            return _format_time_cached(time_text)
+        except Exception as e:
+            self.logger.debug(f"格式化时间显示时出错: {e}")
+            # 如果格式化失败，返回原始文本
+            return time_text
+    
+    def _validate_row_data(self, data: Dict[str, Any]) -> bool:
+        """
+        验证单行数据的完整性
+        
+        Args:
+            data: 数据字典
+            
+        Returns:
+            bool: 数据是否有效
+        """
+        return isinstance(data, dict) and _REQUIRED_ROW_KEYS.issubset(data)
+    
+    def _update_data_row(self, row_elements: tuple, data: Dict[str, Any], rank: int) -> None:
+        """
+        更新单行数据显示 - V9版: 适配新的business_core.py数据结构
+
+        内部不设异常处理：输入已由_validate_row_data把关，意外异常
+        直接上抛到_update_top5_display的统一处理（回溯指向真实出错行）
+
+        Args:
+            row_elements: 行UI元素元组（下标见模块级_ROW_*常量）
+            data: 数据字典
+            rank: 排名
+        """
+        state = row_elements[_ROW_STATE]
+
+        # 更新排名 - 与上次写入相同时跳过
+        rank_text = _RANK_STRINGS[rank - 1]
+        if state['rank'] != rank_text:
+            row_elements[_ROW_RANK].text = rank_text
+            state['rank'] = rank_text
+
+        # 更新交易对名称并应用Tailwind样式 - 优先使用分析器
+        # 预先算好的展示名，热路径不再做字符串裁剪
+        symbol_display = data.get('display_symbol')
+        if symbol_display is None:
+            symbol = data['symbol']
+            symbol_display = symbol[:-4] if symbol.endswith('USDT') else symbol
+        if state['symbol'] != symbol_display:
+            row_elements[_ROW_SYMBOL].text = symbol_display
+            state['symbol'] = symbol_display
+
+        # 根据排名应用不同的Tailwind CSS类
+        symbol_cls = _SYMBOL_CLS.get(rank, _SYMBOL_CLS_DEFAULT)
+        if state['symbol_cls'] != symbol_cls:
+            row_elements[_ROW_SYMBOL].classes(replace=symbol_cls)
+            state['symbol_cls'] = symbol_cls
+
+        # 更新当前费率
+        rate_text = f"{data['current_rate']:.6f}%"
+        if state['rate'] != rate_text:
+            row_elements[_ROW_RATE].text = rate_text
+            state['rate'] = rate_text
+
+        # 更新波动率文本 - 优先使用分析器预先拼好的"符号+|Z|"文本
+        volatility_text = data.get('volatility_text')
+        if volatility_text is None:
+            # 回退路径：根据rate_change确定+/-符号，取Z-score绝对值
+            rate_change = data.get('rate_change', 0.0)
+            sign = '+' if rate_change > 0 else ('-' if rate_change < 0 else '')
+            volatility_text = f"{sign}{abs(data.get('z_score', 0.0)):.2f}"
+        if state['vol'] != volatility_text:
+            row_elements[_ROW_VOL].text = volatility_text
+            state['vol'] = volatility_text
+
+        # 应用波动率Tailwind样式 - 优先用分析器给出的color_idx直接
+        # 取下标；缺失时回退到按color_class字符串查表
+        color_idx = data.get('color_idx')
+        if color_idx is not None:
+            vol_cls = _COLOR_IDX_CLS[color_idx]
+        else:
+            vol_cls = _VOL_CLS.get(data.get('color_class'), _VOL_CLS_DEFAULT)
+        if state['vol_cls'] != vol_cls:
+            row_elements[_ROW_VOL].classes(replace=vol_cls)
+            state['vol_cls'] = vol_cls
+
+        # 更新波动时间，保持宽度和居中对齐
+        time_text = data.get('champion_time_display', '时间未知')
+        # 优化时间显示：去掉秒数，只保留时:分（模块级LRU缓存函数）
+        time_text = _format_time_cached(time_text)
+        if state['time'] != time_text:
+            row_elements[_ROW_TIME].text = time_text
+            state['time'] = time_text
+        time_cls = 'flex-1 text-center text-base text-cyan-400 font-medium'
+        if state['time_cls'] != time_cls:
+            row_elements[_ROW_TIME].classes(replace=time_cls)
+            state['time_cls'] = time_cls
+
+    def _clear_data_row(self, row_elements: tuple, rank: int) -> None:
+        """
+        清空数据行显示 - V8版: 适应合并后的UI结构
+
+        与_update_data_row相同，异常统一上抛给外层处理
+
+        Args:
+            row_elements: 行UI元素元组（下标见模块级_ROW_*常量）
+            rank: 排名
+        """
+        state = row_elements[_ROW_STATE]
+
+        rank_text = _RANK_STRINGS[rank - 1]
+        if state['rank'] != rank_text:
+            row_elements[_ROW_RANK].text = rank_text
+            state['rank'] = rank_text
+        if state['symbol'] != "等待数据...":
+            row_elements[_ROW_SYMBOL].text = "等待数据..."
+            state['symbol'] = "等待数据..."
+
+        # 应用默认的Tailwind样式
+        if state['symbol_cls'] != _SYMBOL_CLS_DEFAULT:
+            row_elements[_ROW_SYMBOL].classes(replace=_SYMBOL_CLS_DEFAULT)
+            state['symbol_cls'] = _SYMBOL_CLS_DEFAULT
+
+        if state['rate'] != "":
+            row_elements[_ROW_RATE].text = ""
+            state['rate'] = ""
+        if state['vol'] != "":
+            row_elements[_ROW_VOL].text = ""
+            state['vol'] = ""
+
+        # 应用默认的波动率样式，保持宽度和居中对齐
+        if state['vol_cls'] != _VOL_CLS_DEFAULT:
+            row_elements[_ROW_VOL].classes(replace=_VOL_CLS_DEFAULT)
+            state['vol_cls'] = _VOL_CLS_DEFAULT
+
+        if state['time'] != "":
+            row_elements[_ROW_TIME].text = ""
+            state['time'] = ""
+        # 应用默认的时间样式，保持宽度和居中对齐
+        time_cls = 'flex-1 text-center text-base text-cyan-400 font-medium'
+        if state['time_cls'] != time_cls:
+            row_elements[_ROW_TIME].classes(replace=time_cls)
+            state['time_cls'] = time_cls
+
+    def stop_updates(self) -> None:
+        """
+        停止界面更新
+        """
+        try:
+            if self.update_timer:
+                self.update_timer.cancel()
+                self.update_timer = None
+                self.logger.info("界面更新定时器已停止")
+                
+        except Exception as e:
+            self.logger.error(f"停止界面更新时出错: {e}", exc_info=True)
+    
+    def run(self, host: str = 'localhost', port: int = 8080, show: bool = True) -> None:
+        """
+        启动UI界面
+        
+        Args:
+            host: 服务器主机地址
+            port: 服务器端口
+            show: 是否自动打开浏览器
+        """
+        try:
+            self.logger.info(f"启动UI界面 - {host}:{port}")
+            
+            # 创建界面
+            self.create_interface()
+            
+            # 启动NiceGUI服务器
+            ui.run(
+                host=host,
+                port=port,
+                title=config.UI_TITLE,
+                dark=True,
+                show=show,
+                reload=False
+            )
+            
+        except Exception as e:
+            self.logger.error(f"启动UI界面失败: {e}", exc_info=True)
+            raise
+    
+    def get_status(self) -> Dict[str, Any]:
+        """
+        获取UI管理器状态
+        
+        Returns:
+            Dict: 状态信息
+        """
+        return {
+            'is_initialized': self.is_initialized,
+            'update_count': self.update_count,
+            'last_update_time': self.last_update_time,
+            'uptime': time.time() - self.start_time,
+            'timer_active': self.update_timer is not None,
+            'top5_rows_count': len(self.top5_rows),
+            'status_elements_count': len(self.status_elements)
+        }
+
+# 独立运行测试代码
+if __name__ == "__main__":
+    import os
+    import sys
+
+    import numpy as np
+
+    # 界面差分的JSON序列化无需手工接管：NiceGUI导入时检测orjson，
+    # 已安装（见requirements.txt）则自动切到C实现的编码器
+
+    # 可选启用uvloop事件循环（Linux/macOS下定时器与IO调度开销更低），
+    # 未安装时静默回退到标准asyncio循环
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+    # 方向派生字段查找表：以 rate >= 0 的布尔值直接当下标，
+    # 免去每行构造时的分支判断（红涨绿跌）
+    # intern方向文案：每次覆写行字典引用同一字符串对象，
+    # 下游比较可走指针相等快路径
+    _DIRECTIONS = (sys.intern('下跌'), sys.intern('上涨'))
+    _DIRSYM = ('-', '+')
+    _COLORS = ('text-green-400', 'text-red-400')
+
+    def _fill_mock_row(row: dict, symbol: str, rate: float, z_score: float) -> dict:
+        """按当前行情方向查表原地覆写一行模拟TOP5数据"""
+        up = rate >= 0.0
+        row['symbol'] = symbol
+        row['current_rate'] = rate
+        row['z_score'] = z_score
+        row['direction'] = _DIRECTIONS[up]
+        row['direction_symbol'] = _DIRSYM[up]
+        row['color_class'] = _COLORS[up]
+        return row
+
+    def _mock_row(symbol: str, rate: float, z_score: float) -> dict:
+        """生成一行模拟TOP5数据"""
+        return _fill_mock_row({}, symbol, rate, z_score)
+
+    # 创建模拟数据分析器
+    class MockAnalyzer:
+        def __init__(self):
+            # 相对计时一律用单调ns整数：免浮点装箱，且不受系统
+            # 时钟回拨影响；last_update保持epoch秒，界面要按墙钟
+            # 时刻（time.localtime）展示它
+            self.start_time = time.monotonic_ns()
+            # 统计字典只构建一次，轮询时原地刷新last_update，
+            # 且按100ms节流避免每次调用都取系统时间
+            self._stats = {
+                'total_symbols': 498,
+                'data_updates': 100,
+                'last_update': time.time(),
+                'has_data': True
+            }
+            self._last_stamp = self.start_time
+            # 与business_core对齐的推送接口：版本号+变化监听器，
+            # UIManager检测到add_listener后走事件推送而非定时轮询
+            self.version = 0
+            self._listeners = []
+            # 498个合成交易对的行情向量，tick()随机游走后用
+            # argpartition选TOP5，走与生产排名核相同的O(n)选取路径
+            self._rng = np.random.default_rng(42)
+            self._symbols = tuple(f"MOCK{i:03d}USDT" for i in range(498))
+            self._z_scores = self._rng.standard_normal(498)
+            self._rates = self._rng.standard_normal(498) * 0.001
+            # 行情向量本身即SoA列存；行字典只在此处分配5个，
+            # tick()原地覆写字段，刷新路径零字典分配
+            self._top5 = [
+                _mock_row(self._symbols[i],
+                          float(self._rates[i]),
+                          float(self._z_scores[i]))
+                for i in range(5)
+            ]
+
+        def add_listener(self, callback) -> None:
+            self._listeners.append(callback)
+
+        def tick(self) -> None:
+            """模拟一次行情更新：随机游走全市场行情并重算TOP5"""
+            self._z_scores += self._rng.standard_normal(498) * 0.1
+            self._rates += self._rng.standard_normal(498) * 0.0001
+            # argpartition只做O(n)分区取前5，再对这5个做完整排序
+            abs_z = np.abs(self._z_scores)
+            top_idx = np.argpartition(abs_z, -5)[-5:]
+            top_idx = top_idx[np.argsort(-abs_z[top_idx])]
+            for row, i in zip(self._top5, top_idx):
+                _fill_mock_row(row, self._symbols[i],
+                               float(self._rates[i]),
+                               float(self._z_scores[i]))
+            self._stats['data_updates'] += 1
+            self._stats['last_update'] = time.time()
+            self.version += 1
+            for callback in self._listeners:
+                callback()
+
+        def get_statistics(self):
+            now = time.monotonic_ns()
+            if now - self._last_stamp > 100_000_000:  # 100ms
+                self._last_stamp = now
+                self._stats['last_update'] = time.time()
+            return self._stats
+
+        def get_top5_data(self):
+            return self._top5
+    
+    # 创建UI管理器并测试
+    analyzer = MockAnalyzer()
+    ui_manager = UIManager(analyzer)
+    
+    # 创建界面
+    ui_manager.create_interface()
+
+    # 模拟行情推送：每秒触发一次数据变化事件，驱动事件推送链路
+    ui.timer(1.0, analyzer.tick)
+
+    # 关停清理统一挂到NiceGUI生命周期钩子，Ctrl+C由ui.run自身
+    # 的信号处理收敛到同一条关停路径，无需手工try/finally包裹
+    app.on_shutdown(ui_manager.stop_updates)
+
+    # 诊断输出走模块logger：%占位符延迟格式化，级别被过滤时
+    # 连消息字符串都不会构造（print无此短路）
+    log = get_logger(__name__)
+    host, port = 'localhost', 8080
+    log.info("UI管理器测试启动，访问 http://%s:%d", host, port)
+    log.info("按 Ctrl+C 停止测试")
+
+    # 启动NiceGUI
+    ui.run(
+        host=host,
+        port=port,
+        title='UI管理器测试',
+        dark=True,
+        # 默认不弹浏览器（无头/CI环境下省去启动开销），按需置UI_SHOW=1打开
+        show=os.environ.get('UI_SHOW', '0') == '1'
+    )